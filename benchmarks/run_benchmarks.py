@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark Suite
+Saviesa Framework
+
+Times the model, metric and diagnosis hot paths across data sizes, records
+wall time and peak memory to a JSON results file, and compares the run
+against a stored baseline to flag performance regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 65 2325 1e5 --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --tolerance 1.5
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from utils.models import (
+    AdditiveModel,
+    InteractionModel,
+    MultiplicativeModel,
+    identify_limiting_factor
+)
+from utils.metrics import (
+    loocv_validation,
+    calculate_all_metrics,
+    diagnostic_divergence_rate
+)
+from utils.simulation import simulate_replicates
+
+DEFAULT_SIZES = [65, 2325, 100_000, 1_000_000, 10_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+FACTOR_NAMES = ['O', 'L', 'M']
+
+# LOOCV refits the model n times, so it is only benchmarked on small data
+LOOCV_MAX_N = 2325
+
+def make_data(n, seed=0):
+    """
+    Build a benchmark dataset of size n
+
+    Args:
+        n: Number of rows
+        seed: Random seed
+
+    Returns:
+        dict: Factors X, target y, fitted models and their predictions
+    """
+    X, y = simulate_replicates(n, 1, noise=0.05, seed=seed)
+    X, y = X[0], y[0]
+
+    models = {
+        'additive': AdditiveModel().fit(X, y),
+        'interaction': InteractionModel().fit(X, y),
+        'multiplicative': MultiplicativeModel().fit(X, y)
+    }
+    coefs = models['additive'].get_coefficients()['coefficients']
+
+    return {
+        'X': X,
+        'y': y,
+        'models': models,
+        'y_pred': models['multiplicative'].predict(X),
+        'limiting_mult': identify_limiting_factor(X, FACTOR_NAMES),
+        'limiting_add': np.array(FACTOR_NAMES)[np.argmax(X * coefs, axis=1)]
+    }
+
+def build_cases(data):
+    """
+    List the benchmark cases for a dataset
+
+    Args:
+        data: Output of make_data()
+
+    Returns:
+        list: (name, callable) pairs
+    """
+    X, y = data['X'], data['y']
+    cases = []
+
+    for name, cls in [('additive', AdditiveModel),
+                      ('interaction', InteractionModel),
+                      ('multiplicative', MultiplicativeModel)]:
+        fitted = data['models'][name]
+        cases.append((f'{name}_fit', lambda cls=cls: cls().fit(X, y)))
+        cases.append((f'{name}_predict', lambda m=fitted: m.predict(X)))
+
+    if len(y) <= LOOCV_MAX_N:
+        cases.append(('loocv_multiplicative',
+                      lambda: loocv_validation(MultiplicativeModel(), X, y)))
+
+    cases.append(('calculate_all_metrics',
+                  lambda: calculate_all_metrics(y, data['y_pred'], n_params=4)))
+    cases.append(('identify_limiting_factor',
+                  lambda: identify_limiting_factor(X, FACTOR_NAMES)))
+    cases.append(('diagnostic_divergence_rate',
+                  lambda: diagnostic_divergence_rate(data['limiting_mult'], data['limiting_add'])))
+
+    return cases
+
+def measure(func, repeat=3, min_time=0.2):
+    """
+    Measure best wall time and peak traced memory of a callable
+
+    Timing runs without tracemalloc so its overhead does not distort the
+    result; peak memory comes from one extra traced call.
+
+    Args:
+        func: Zero-argument callable
+        repeat: Maximum number of timed calls
+        min_time: Stop repeating once this much time has been spent
+
+    Returns:
+        tuple: (best time in seconds, peak memory in MB)
+    """
+    times = []
+    spent = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+        if spent > min_time:
+            break
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(times), peak / 1024**2
+
+def run_benchmarks(sizes, repeat=3):
+    """
+    Run all benchmark cases for every size
+
+    Args:
+        sizes: Iterable of dataset sizes
+        repeat: Maximum timed calls per case
+
+    Returns:
+        list: One dict per (benchmark, n)
+    """
+    results = []
+    for n in sizes:
+        print(f"\n[n={n:,}] preparing data...")
+        data = make_data(n)
+        for name, func in build_cases(data):
+            elapsed, peak_mb = measure(func, repeat=repeat)
+            results.append({
+                'benchmark': name,
+                'n': n,
+                'time_s': elapsed,
+                'peak_mem_mb': peak_mb
+            })
+            print(f"  {name:<30} {elapsed * 1e3:>12.3f} ms  {peak_mb:>10.2f} MB")
+        del data
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=1.5, min_time=1e-3):
+    """
+    Compare results against a baseline run
+
+    Cases faster than ``min_time`` in both runs are skipped since their
+    timings are dominated by noise.
+
+    Args:
+        results: Current results (list of dicts)
+        baseline: Baseline results (list of dicts)
+        tolerance: Allowed slowdown / memory growth ratio
+        min_time: Minimum baseline time (s) for a timing comparison
+
+    Returns:
+        list: Regressions as dicts (benchmark, n, metric, baseline, current, ratio)
+    """
+    reference = {(r['benchmark'], r['n']): r for r in baseline}
+    regressions = []
+
+    for r in results:
+        ref = reference.get((r['benchmark'], r['n']))
+        if ref is None:
+            continue
+        for metric, floor in [('time_s', min_time), ('peak_mem_mb', 1.0)]:
+            if max(ref[metric], r[metric]) < floor:
+                continue
+            ratio = r[metric] / max(ref[metric], 1e-12)
+            if ratio > tolerance:
+                regressions.append({
+                    'benchmark': r['benchmark'],
+                    'n': r['n'],
+                    'metric': metric,
+                    'baseline': ref[metric],
+                    'current': r[metric],
+                    'ratio': ratio
+                })
+
+    return regressions
+
+def _metadata():
+    """Environment description stored alongside results"""
+    import sklearn
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def main(argv=None):
+    """Main benchmark script"""
+    parser = argparse.ArgumentParser(description='Saviesa benchmark suite')
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help='Dataset sizes (e.g. 65 2325 1e5)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Maximum timed calls per case')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='Path of the JSON results file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Allowed ratio to baseline before flagging a regression')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write this run as the new baseline')
+    args = parser.parse_args(argv)
+
+    sizes = [int(n) for n in args.sizes]
+
+    print("\n" + "="*70)
+    print("SAVIESA FRAMEWORK - BENCHMARKS")
+    print("="*70)
+
+    payload = {
+        'metadata': _metadata(),
+        'results': run_benchmarks(sizes, repeat=args.repeat)
+    }
+
+    output = args.baseline if args.save_baseline else args.output
+    with open(output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n✅ Results saved: {output}")
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(payload['results'], baseline['results'],
+                                      tolerance=args.tolerance)
+
+    print("\n" + "="*70)
+    print("BASELINE COMPARISON")
+    print("="*70)
+    if not regressions:
+        print(f"\n✅ No regression beyond {args.tolerance:.2f}× baseline")
+        return 0
+
+    for reg in regressions:
+        print(f"⚠️  {reg['benchmark']} (n={reg['n']:,}) {reg['metric']}: "
+              f"{reg['baseline']:.4g} → {reg['current']:.4g} ({reg['ratio']:.2f}×)")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
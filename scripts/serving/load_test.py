@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scoring Server Load Test
+Saviesa Framework
+
+Sends concurrent keep-alive requests to a running scoring server and reports
+throughput, client-side p50/p90/p99 latency and the server's own latency and
+batch statistics. With --in-process, a server is started in the same event
+loop first, so the harness runs on its own.
+
+Usage:
+    python scripts/serving/load_test.py --port 8765 --concurrency 64 --requests 5000
+    python scripts/serving/load_test.py --in-process --concurrency 1 32 128
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serving import load_test
+from scoring_server import DEFAULT_DATA, FACTOR_NAMES, build_server
+
+async def run(args):
+    X = pd.read_csv(args.data)[FACTOR_NAMES].values
+    server = None
+    host, port = args.host, args.port
+    if args.in_process:
+        server = await build_server(args.data, args.max_batch, args.max_delay_ms / 1000).start(
+            args.host, 0, args.socket)
+        if args.socket is None:
+            host, port = server.address
+
+    try:
+        for concurrency in args.concurrency:
+            result = await load_test(X, args.model, host, port, args.socket,
+                                     concurrency=concurrency, n_requests=args.requests,
+                                     rows_per_request=args.rows, seed=0)
+            latency = result['latency']
+            print(f"concurrency={concurrency:4d}  {result['requests_per_s']:8.0f} req/s  "
+                  f"p50={latency['p50_ms']:.2f} ms  p99={latency['p99_ms']:.2f} ms  "
+                  f"errors={result['errors']}")
+        print(json.dumps(result['server'], indent=2))
+    finally:
+        if server is not None:
+            await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test for the Saviesa scoring server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', default=None, help='Unix socket path (instead of TCP)')
+    parser.add_argument('--model', default='covid')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 32])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=1, help='Rows per request')
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--in-process', action='store_true', help='Start a server first')
+    parser.add_argument('--max-batch', type=int, default=1024)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
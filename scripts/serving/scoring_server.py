@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scoring Server
+Saviesa Framework
+
+Long-running local scoring service for dashboards. Fits the COVID-19 models
+once at startup (or loads saved ones) and serves predictions and limiting-factor diagnoses over
+HTTP (TCP or Unix socket), with concurrent requests coalesced into
+micro-batches.
+
+Usage:
+    python scripts/serving/scoring_server.py --port 8765
+    python scripts/serving/scoring_server.py --socket /tmp/saviesa.sock --max-delay-ms 1
+    python scripts/serving/scoring_server.py --models models/covid.sav
+
+    curl -s localhost:8765/predict -d '{"model": "covid", "X": [[0.76, 0.28]]}'
+    curl -s localhost:8765/stats
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.models import AdditiveModel, MultiplicativeModel
+from utils.persistence import load_model
+from utils.serving import ScoringServer
+
+DEFAULT_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                            'data', 'processed', 'Article2_Dataset_COVID.csv')
+FACTOR_NAMES = ['L', 'M']
+
+def build_server(filepath=DEFAULT_DATA, max_batch=1024, max_delay=0.002, model_files=None):
+    """
+    Fit the COVID-19 models and register them on a ScoringServer
+
+    Args:
+        filepath: COVID-19 dataset (columns L, M, F)
+        max_batch: Rows that trigger an immediate batch flush
+        max_delay: Maximum seconds a request waits to be batched
+        model_files: Optional saved models (SaviesaModel.save) served
+            instead, named after their file stem
+
+    Returns:
+        ScoringServer: With models 'covid' (multiplicative) and
+            'covid_additive', or the loaded models
+    """
+    if model_files:
+        server = ScoringServer(max_batch=max_batch, max_delay=max_delay)
+        for path in model_files:
+            model = load_model(path)
+            name = os.path.splitext(os.path.basename(path))[0]
+            server.add_model(name, model, model.metadata_.get('feature_names'))
+        return server
+
+    df = pd.read_csv(filepath)
+    X = df[FACTOR_NAMES].values
+    y = df['F'].values
+
+    server = ScoringServer(max_batch=max_batch, max_delay=max_delay)
+    server.add_model('covid', MultiplicativeModel().fit(X, y), FACTOR_NAMES)
+    server.add_model('covid_additive', AdditiveModel().fit(X, y), FACTOR_NAMES)
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Saviesa scoring server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', default=None, help='Unix socket path (instead of TCP)')
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--models', nargs='+', default=None,
+                        help='Saved model files to serve instead of fitting')
+    parser.add_argument('--max-batch', type=int, default=1024)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = build_server(args.data, args.max_batch, args.max_delay_ms / 1000, args.models)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"✅ Serving {sorted(server.models)} on {where}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,35 @@ from .models import (
     InteractionModel,
     MultiplicativeModel,
     identify_limiting_factor,
-    compare_models
+    compare_models,
+    FitCache,
+    FeatureSet
 )
 
+from .hierarchical import HierarchicalMultiplicativeModel
+
+from .frontier import FrontierModel, fit_frontier_by_group
+
+from .regularized import RegularizedMultiplicativeModel, ridge_path, elastic_net_path
+
+from .rolling import rolling_elasticities, RollingOLS
+
+from .robust import robust_fit_by_group, robust_bootstrap
+
+from .allocation import allocate_budget
+
+from .scenarios import ScenarioEngine
+
+from .serving import ScoringServer
+
+from .persistence import save_table, load_table, load_model
+
+from .peers import PeerIndex
+
+from .typology import ConstraintTypology
+
+from .factor_tree import FactorTree
+
 from .metrics import (
     calculate_r2,
     calculate_rmse,
@@ -21,7 +47,10 @@ from .metrics import (
     loocv_validation,
     calculate_all_metrics,
     compare_predictions,
-    diagnostic_divergence_rate
+    diagnostic_divergence_rate,
+    pointwise_loglik,
+    vuong_test,
+    j_test
 )
 
 from .visualization import (
@@ -29,7 +58,23 @@ from .visualization import (
     plot_distribution,
     plot_model_comparison,
     plot_residuals,
-    plot_heatmap
+    plot_heatmap,
+    render_figures
+)
+
+from .simex import simex_elasticities
+
+from .simulation import (
+    simulate_replicates,
+    fit_ols_batched,
+    evaluate_replicates,
+    power_study
+)
+
+from .profiling import (
+    Profiler,
+    instrument,
+    section
 )
 
 __all__ = [
@@ -39,6 +84,27 @@ __all__ = [
     'MultiplicativeModel',
     'identify_limiting_factor',
     'compare_models',
+    'FitCache',
+    'FeatureSet',
+    'HierarchicalMultiplicativeModel',
+    'FrontierModel',
+    'fit_frontier_by_group',
+    'RegularizedMultiplicativeModel',
+    'ridge_path',
+    'elastic_net_path',
+    'rolling_elasticities',
+    'RollingOLS',
+    'robust_fit_by_group',
+    'robust_bootstrap',
+    'allocate_budget',
+    'ScenarioEngine',
+    'ScoringServer',
+    'load_model',
+    'save_table',
+    'load_table',
+    'PeerIndex',
+    'ConstraintTypology',
+    'FactorTree',
     # Metrics
     'calculate_r2',
     'calculate_rmse',
@@ -49,10 +115,24 @@ __all__ = [
     'calculate_all_metrics',
     'compare_predictions',
     'diagnostic_divergence_rate',
+    'pointwise_loglik',
+    'vuong_test',
+    'j_test',
     # Visualization
     'plot_scatter',
     'plot_distribution',
     'plot_model_comparison',
     'plot_residuals',
-    'plot_heatmap'
+    'plot_heatmap',
+    'render_figures',
+    # Simulation
+    'simulate_replicates',
+    'fit_ols_batched',
+    'evaluate_replicates',
+    'power_study',
+    'simex_elasticities',
+    # Profiling
+    'Profiler',
+    'instrument',
+    'section'
 ]
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Budget Allocation
+Saviesa Framework
+
+This module provides an allocation engine that splits a fixed budget across
+units (communes, départements) and factors so as to maximize total predicted
+performance under a fitted multiplicative model,
+
+    F_i = A_i × Π_k X_ik^β_k,   spending s_ik raises X_ik by s_ik / c_ik
+
+with unit costs c_ik and a ceiling on each factor (e.g. 1.0 for rates).
+
+Two solvers are available:
+
+- 'waterfill': equalizes marginal returns β_k·F_i / (c_ik·X_ik) = λ across
+  all funded (unit, factor) pairs. For a given λ the optimality conditions
+  reduce to one piecewise-linear equation in log F_i per unit, solved
+  exactly for all units at once; λ is then found by a scalar root search
+  on the budget. Exact when Σβ < 1 (concave F).
+- 'greedy': spends the budget in small steps, each on the pair with the
+  highest marginal gain per euro, using a lazy max-heap. Works for any
+  elasticities (e.g. increasing returns), at step resolution.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from .models import identify_limiting_factor
+from .profiling import instrument
+
+METHODS = ('auto', 'waterfill', 'greedy')
+
+def _waterfill_response(lam, logA, beta, lo, hi, cost):
+    """
+    Optimal levels X(λ) for all units, solved exactly
+
+    With u = log F_i, each factor sits at log X_k = clip(log(β_k/(λc_k)) + u,
+    log lo, log hi), so u = log A_i + Σ β_k·log X_k(u) is a piecewise-linear
+    equation with slope Σβ < 1 and 2K breakpoints. It is solved by
+    evaluating the residual at the sorted breakpoints and interpolating
+    inside the bracketing segment.
+    """
+    log_lo, log_hi = np.log(lo), np.log(hi)
+    shift = np.log(np.where(beta > 0, beta, 1.0) / (lam * cost))
+
+    def residual(u):
+        # u: (n, m) candidate log F values -> g(u) - u, shape (n, m)
+        log_x = np.clip(shift[:, None, :] + u[:, :, None], log_lo[:, None, :], log_hi[:, None, :])
+        return logA[:, None] + log_x @ beta - u
+
+    points = np.sort(np.concatenate([log_lo - shift, log_hi - shift], axis=1), axis=1)
+    h = residual(points)
+    first = np.argmax(h <= 0, axis=1)
+    none = ~np.any(h <= 0, axis=1)
+
+    rows = np.arange(len(points))
+    u_left = points[rows, np.maximum(first - 1, 0)]
+    h_left = h[rows, np.maximum(first - 1, 0)]
+    u_right, h_right = points[rows, first], h[rows, first]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.where(h_left == h_right, u_right,
+                     u_left + h_left * (u_right - u_left) / (h_left - h_right))
+    # Below every breakpoint all factors sit at lo; above every one, at hi
+    u = np.where(first == 0, logA + log_lo @ beta, u)
+    u = np.where(none, logA + log_hi @ beta, u)
+    return np.exp(np.clip(shift + u[:, None], log_lo, log_hi))
+
+def _waterfill(A, beta, lo, hi, cost, budget):
+    """Water-filling allocation; returns new levels and the multiplier λ"""
+    from scipy.optimize import brentq
+
+    full_cost = np.sum(cost * (hi - lo))
+    if full_cost <= budget:
+        return hi.copy(), 0.0
+    logA = np.log(A)
+
+    def excess(log_lam):
+        X = _waterfill_response(np.exp(log_lam), logA, beta, lo, hi, cost)
+        return np.sum(cost * (X - lo)) - budget
+
+    # λ above every starting marginal return funds nothing
+    F0 = A * np.prod(lo ** beta, axis=1)
+    top = np.max(beta * F0[:, None] / (lo * cost))
+    log_hi = np.log(top) + 1e-9
+    log_lo = log_hi - 1.0
+    while excess(log_lo) < 0:
+        log_lo -= 2.0
+
+    log_lam = brentq(excess, log_lo, log_hi, xtol=1e-12, rtol=1e-12)
+    return _waterfill_response(np.exp(log_lam), logA, beta, lo, hi, cost), np.exp(log_lam)
+
+def _greedy(A, beta, lo, hi, cost, budget, n_steps):
+    """Heap-based greedy allocation in budget steps of size budget / n_steps"""
+    n, K = lo.shape
+    if budget <= 0:
+        return lo.copy(), math.nan
+    step = budget / n_steps
+    X = lo.tolist()
+    F = (A * np.prod(lo ** beta, axis=1)).tolist()
+    beta = beta.tolist()
+    hi = hi.tolist()
+    cost = cost.tolist()
+    version = [0] * n
+
+    def entry(i, k, amount):
+        x = X[i][k]
+        if beta[k] <= 0 or x >= hi[i][k]:
+            return None
+        new = min(x + amount / cost[i][k], hi[i][k])
+        spend = (new - x) * cost[i][k]
+        gain = F[i] * ((new / x) ** beta[k] - 1)
+        return (-gain / spend, i, k, version[i])
+
+    heap = [e for e in (entry(i, k, step) for i in range(n) for k in range(K)) if e]
+    heapq.heapify(heap)
+
+    remaining = budget
+    while heap and remaining > 1e-12 * budget:
+        rate, i, k, v = heapq.heappop(heap)
+        if v != version[i]:
+            continue
+        amount = min(step, remaining)
+        x = X[i][k]
+        new = min(x + amount / cost[i][k], hi[i][k])
+        remaining -= (new - x) * cost[i][k]
+        F[i] *= (new / x) ** beta[k]
+        X[i][k] = new
+        version[i] += 1
+        # Every factor of unit i changes its marginal gain (complementarity)
+        for kk in range(K):
+            e = entry(i, kk, step)
+            if e:
+                heapq.heappush(heap, e)
+
+    return np.array(X), math.nan
+
+@instrument
+def allocate_budget(model, X, budget, unit_cost, y=None, upper=1.0, weights=None,
+                    method='auto', n_steps=20_000, factor_names=None):
+    """
+    Split a budget across units and factors to maximize total predicted F
+
+    Args:
+        model: Fitted MultiplicativeModel (its get_elasticities are used,
+            SIMEX-corrected if attached)
+        X: Current factor levels (n_units, n_factors), positive
+        budget: Total budget to spend
+        unit_cost: Cost of raising a factor by one unit, per factor
+            (n_factors,) or per unit and factor (n_units, n_factors)
+        y: Optional observed performance; when given, each unit keeps its
+            own residual (A_i = y_i / Π X^β) instead of the model intercept
+        upper: Ceiling per factor (scalar, (n_factors,) or full array)
+        weights: Optional unit weights in the objective (e.g. enrolment)
+        method: 'waterfill', 'greedy' or 'auto' (waterfill when Σβ < 1)
+        n_steps: Budget steps for the greedy solver
+        factor_names: Factor names (default: ['F1', 'F2', ...])
+
+    Returns:
+        tuple: (pd.DataFrame with one row per unit: invest_<name>,
+            new_<name>, F_before, F_after, gain, limiting_factor,
+            main_investment; dict summary: method, spent, total_gain,
+            multiplier, match_rate between limiting factor and main
+            investment among funded units)
+
+    Example:
+        >>> model = MultiplicativeModel().fit(X, F)
+        >>> plan, summary = allocate_budget(model, X, 1e6, unit_cost=[2e3, 5e3, 1e3],
+        ...                                 factor_names=['O', 'L', 'M'])
+    """
+    import pandas as pd
+
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if budget < 0:
+        raise ValueError("Budget must be non-negative")
+
+    elast = model.get_elasticities()
+    beta = np.asarray(elast['elasticities'], dtype=float)
+    lo = np.asarray(X, dtype=float)
+    n, K = lo.shape
+    if len(beta) != K:
+        raise ValueError(f"Model has {len(beta)} elasticities, X has {K} factors")
+    if np.any(lo <= 0):
+        raise ValueError("Factor levels must be positive")
+
+    cost = np.broadcast_to(np.asarray(unit_cost, dtype=float), (n, K)).copy()
+    if np.any(cost <= 0):
+        raise ValueError("Unit costs must be positive")
+    if weights is not None:
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), (n,))
+        if np.any(weights <= 0):
+            raise ValueError("Weights must be positive")
+    hi = np.maximum(np.broadcast_to(np.asarray(upper, dtype=float), (n, K)), lo)
+    if factor_names is None:
+        factor_names = [f'F{k+1}' for k in range(K)]
+    factor_names = list(factor_names)
+
+    if y is not None:
+        A = np.asarray(y, dtype=float) / np.prod(lo ** beta, axis=1)
+    else:
+        A = np.full(n, np.exp(elast['intercept']))
+    if weights is not None:
+        A = A * weights
+
+    # Factors with non-positive elasticity never receive funds
+    hi = np.where(beta > 0, hi, lo)
+
+    concave = beta[beta > 0].sum() < 1
+    if method == 'auto':
+        method = 'waterfill' if concave else 'greedy'
+    if method == 'waterfill' and not concave:
+        raise ValueError("Water-filling needs decreasing returns (sum of positive "
+                         "elasticities < 1); use method='greedy'")
+    if method == 'waterfill':
+        new, multiplier = _waterfill(A, beta, lo, hi, cost, budget)
+    else:
+        new, multiplier = _greedy(A, beta, lo, hi, cost, budget, n_steps)
+
+    invest = cost * (new - lo)
+    unit_weights = 1.0 if weights is None else np.asarray(weights, dtype=float)
+    F_before = A * np.prod(lo ** beta, axis=1) / unit_weights
+    F_after = A * np.prod(new ** beta, axis=1) / unit_weights
+
+    plan = pd.DataFrame({f'invest_{name}': invest[:, k] for k, name in enumerate(factor_names)})
+    for k, name in enumerate(factor_names):
+        plan[f'new_{name}'] = new[:, k]
+    plan['F_before'] = F_before
+    plan['F_after'] = F_after
+    plan['gain'] = F_after - F_before
+    plan['limiting_factor'] = identify_limiting_factor(lo, factor_names)
+    funded = invest.sum(axis=1) > 0
+    plan['main_investment'] = np.where(funded, np.array(factor_names)[np.argmax(invest, axis=1)], '')
+
+    summary = {
+        'method': method,
+        'spent': invest.sum(),
+        'total_gain': np.sum((F_after - F_before) * unit_weights),
+        'multiplier': multiplier,
+        'match_rate': (np.mean(plan['limiting_factor'][funded] == plan['main_investment'][funded])
+                       if funded.any() else np.nan)
+    }
+    return plan, summary
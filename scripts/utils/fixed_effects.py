@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fixed-Effects Absorption
+Saviesa Framework
+
+This module provides high-dimensional fixed-effects absorption by iterative
+demeaning (alternating projections), clustered standard errors, and recovery
+of the absorbed effects, all without materializing dummy columns.
+
+Memory stays O(n·p): each sweep subtracts per-group means computed with
+np.bincount from the (n, p) data, one categorical at a time.
+"""
+
+import numpy as np
+
+def _effect_columns(fixed_effects):
+    """Split fixed-effect labels into one array per effect"""
+    import pandas as pd
+
+    if isinstance(fixed_effects, pd.DataFrame):
+        return [fixed_effects[c].to_numpy() for c in fixed_effects.columns]
+    if isinstance(fixed_effects, (list, tuple)):
+        return [np.asarray(c) for c in fixed_effects]
+    fixed_effects = np.asarray(fixed_effects)
+    if fixed_effects.ndim == 1:
+        return [fixed_effects]
+    return [fixed_effects[:, k] for k in range(fixed_effects.shape[1])]
+
+def factorize_effects(fixed_effects):
+    """
+    Turn categorical fixed effects into integer codes
+
+    Args:
+        fixed_effects: One label array (n,), a 2-D array (n, m), a list of
+            label arrays, or a DataFrame (one column per effect)
+
+    Returns:
+        tuple: (list of code arrays, list of pd.Index of levels)
+    """
+    import pandas as pd
+
+    codes, levels = [], []
+    for column in _effect_columns(fixed_effects):
+        c, uniques = pd.factorize(column)
+        if np.any(c < 0):
+            raise ValueError("Fixed effects must not contain missing values")
+        codes.append(c)
+        levels.append(pd.Index(uniques))
+    return codes, levels
+
+def _group_means(values, codes, n_groups, counts):
+    """Per-group column means of values (n, k)"""
+    means = np.empty((n_groups, values.shape[1]))
+    for j in range(values.shape[1]):
+        means[:, j] = np.bincount(codes, weights=values[:, j], minlength=n_groups)
+    return means / counts[:, None]
+
+def demean(values, codes, tol=1e-8, max_iter=1000):
+    """
+    Project out one or more categorical effects by alternating projections
+
+    With a single effect one sweep is exact. With several, sweeps repeat
+    until the largest change falls below ``tol`` times the data scale.
+
+    Args:
+        values: Array (n,) or (n, k) to demean
+        codes: List of integer code arrays (one per effect)
+        tol: Convergence tolerance
+        max_iter: Maximum number of sweeps
+
+    Returns:
+        np.ndarray: Demeaned copy with the same shape as values
+    """
+    values = np.asarray(values, dtype=float)
+    squeeze = values.ndim == 1
+    out = values.reshape(len(values), -1).copy()
+
+    groups = [(c, int(c.max()) + 1) for c in codes]
+    counts = [np.bincount(c, minlength=g).astype(float) for c, g in groups]
+    scale = max(np.max(np.abs(out)), 1.0)
+
+    for _ in range(max_iter if len(codes) > 1 else 1):
+        delta = 0.0
+        for (c, g), cnt in zip(groups, counts):
+            means = _group_means(out, c, g, cnt)
+            out -= means[c]
+            delta = max(delta, np.max(np.abs(means)))
+        if delta <= tol * scale:
+            break
+
+    return out[:, 0] if squeeze else out
+
+def recover_effects(residuals, codes, tol=1e-8, max_iter=1000):
+    """
+    Recover absorbed effect values from residuals y - Xβ
+
+    Solves residuals ≈ μ + Σ_k d_k[codes_k] by backfitting, with each d_k
+    centered so that μ carries the overall level.
+
+    Args:
+        residuals: Array (n,) of y - Xβ
+        codes: List of integer code arrays
+        tol: Convergence tolerance
+        max_iter: Maximum number of sweeps
+
+    Returns:
+        tuple: (μ, list of effect arrays, one value per level)
+    """
+    r = np.asarray(residuals, dtype=float)
+    mu = r.mean()
+    r = r - mu
+
+    groups = [(c, int(c.max()) + 1) for c in codes]
+    counts = [np.bincount(c, minlength=g).astype(float) for c, g in groups]
+    effects = [np.zeros(g) for _, g in groups]
+    scale = max(np.max(np.abs(r)), 1.0)
+
+    for _ in range(max_iter if len(codes) > 1 else 1):
+        delta = 0.0
+        for k, ((c, g), cnt) in enumerate(zip(groups, counts)):
+            step = np.bincount(c, weights=r, minlength=g) / cnt
+            effects[k] += step
+            r -= step[c]
+            delta = max(delta, np.max(np.abs(step)))
+        if delta <= tol * scale:
+            break
+
+    # Center each effect; the shifts move into μ
+    for k in range(len(effects)):
+        shift = np.average(effects[k], weights=counts[k])
+        effects[k] -= shift
+        mu += shift
+
+    return mu, effects
+
+def clustered_covariance(X, residuals, clusters, n_absorbed=0):
+    """
+    Cluster-robust (CR1) covariance of OLS coefficients
+
+    Args:
+        X: Design matrix (n, p), demeaned if effects were absorbed
+        residuals: Residuals (n,)
+        clusters: Cluster code array (n,), or None for heteroskedasticity-
+            robust (HC1) errors
+        n_absorbed: Absorbed degrees of freedom not nested in clusters
+
+    Returns:
+        np.ndarray: Covariance matrix (p, p)
+    """
+    X = np.asarray(X, dtype=float)
+    n, p = X.shape
+    bread = np.linalg.pinv(X.T @ X)
+    scores = X * np.asarray(residuals)[:, None]
+
+    if clusters is None:
+        meat = scores.T @ scores
+        factor = n / max(n - p - n_absorbed, 1)
+    else:
+        n_clusters = int(clusters.max()) + 1
+        summed = np.empty((n_clusters, p))
+        for j in range(p):
+            summed[:, j] = np.bincount(clusters, weights=scores[:, j], minlength=n_clusters)
+        meat = summed.T @ summed
+        factor = (n_clusters / max(n_clusters - 1, 1)) * ((n - 1) / max(n - p - n_absorbed, 1))
+
+    return factor * bread @ meat @ bread
+
+def absorbed_dof(codes, clusters=None):
+    """
+    Degrees of freedom used by absorbed effects, for small-sample corrections
+
+    Effects nested in the clusters cost nothing under CR1 (their dummies are
+    constant within clusters); every other effect costs its levels minus one,
+    plus one for the intercept when no effect is nested.
+
+    Args:
+        codes: List of integer code arrays (one per effect)
+        clusters: Cluster code array (n,), or None (nothing is nested)
+
+    Returns:
+        int: Absorbed degrees of freedom (n_absorbed of clustered_covariance)
+    """
+    n_absorbed, nested = 0, False
+    for c in codes:
+        n_levels = int(c.max()) + 1
+        if clusters is not None:
+            pairs = c.astype(np.int64) * (int(clusters.max()) + 1) + clusters
+            if len(np.unique(pairs)) == n_levels:
+                nested = True
+                continue
+        n_absorbed += n_levels - 1
+    return n_absorbed if nested else n_absorbed + 1
+
+def absorb_and_fit(X, y, fixed_effects, clusters=None, tol=1e-8, max_iter=1000):
+    """
+    OLS with absorbed fixed effects and clustered standard errors
+
+    Args:
+        X: Design matrix (n, p), without intercept column
+        y: Target (n,)
+        fixed_effects: Categorical effects (see factorize_effects)
+        clusters: Cluster labels (n,); defaults to the first fixed effect
+        tol: Demeaning tolerance
+        max_iter: Maximum demeaning sweeps
+
+    Returns:
+        dict: coef, intercept, coef_cov, std_errors, levels, effects
+    """
+    import pandas as pd
+
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    codes, levels = factorize_effects(fixed_effects)
+
+    demeaned = demean(np.column_stack([X, y]), codes, tol=tol, max_iter=max_iter)
+    X_dm, y_dm = demeaned[:, :-1], demeaned[:, -1]
+    coef = np.linalg.lstsq(X_dm, y_dm, rcond=None)[0]
+
+    resid = y - X @ coef
+    intercept, effects = recover_effects(resid, codes, tol=tol, max_iter=max_iter)
+
+    cluster_codes = codes[0] if clusters is None else pd.factorize(np.asarray(clusters))[0]
+    coef_cov = clustered_covariance(X_dm, y_dm - X_dm @ coef, cluster_codes,
+                                    n_absorbed=absorbed_dof(codes, cluster_codes))
+
+    return {
+        'coef': coef,
+        'intercept': intercept,
+        'coef_cov': coef_cov,
+        'std_errors': np.sqrt(np.diag(coef_cov)),
+        'levels': levels,
+        'effects': effects
+    }
+
+def lookup_effects(fixed_effects, levels, effects):
+    """
+    Sum absorbed effects for new observations (unseen levels count as 0)
+
+    Args:
+        fixed_effects: Categorical effects for the new observations
+        levels: List of pd.Index from the fit
+        effects: List of effect arrays from the fit
+
+    Returns:
+        np.ndarray: Total effect per observation
+    """
+    columns = _effect_columns(fixed_effects)
+    if len(columns) != len(levels):
+        raise ValueError(f"Expected {len(levels)} fixed effects, got {len(columns)}")
+
+    total = np.zeros(len(columns[0]))
+    for column, index, values in zip(columns, levels, effects):
+        idx = index.get_indexer(column)
+        total += np.where(idx >= 0, values[idx], 0.0)
+    return total
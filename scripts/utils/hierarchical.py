@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hierarchical Multiplicative Model
+Saviesa Framework
+
+This module provides a mixed-effects version of the multiplicative model for
+establishments nested in départements nested in académies:
+
+    log(F_i) = z_i·β + r_i·a_j + r_i·b_d + e_i
+
+where z_i = (1, log X_i), r_i are the columns with random effects (intercept
+and, by default, all elasticities), a_j ~ N(0, Σ_a) for académie j,
+b_d ~ N(0, Σ_b) for département d, and e_i ~ N(0, σ²).
+
+The model is fitted by maximum likelihood with EM. The data are reduced once
+to per-département sufficient statistics (ZᵀZ, Zᵀy, yᵀy); every EM iteration
+then only manipulates small (q × q) blocks per group through the Woodbury
+identity, so no n × n covariance matrix is ever formed.
+"""
+
+import warnings
+
+import numpy as np
+
+from .models import SaviesaModel
+from .profiling import instrument
+
+def _inv(A):
+    """Batched symmetric inverse"""
+    return np.linalg.inv(A)
+
+def _logdet(A):
+    """Batched log-determinant of positive definite matrices"""
+    return np.linalg.slogdet(A)[1]
+
+def _group_sums(values, codes, n_groups):
+    """Sum rows of values (n, ...) by integer group codes"""
+    out = np.zeros((n_groups,) + values.shape[1:])
+    np.add.at(out, codes, values)
+    return out
+
+def _cross_sums(A, B, codes, n_groups):
+    """Per-group cross-product matrices Σ a_iᵀ b_i, shape (n_groups, p, q)"""
+    out = np.empty((n_groups, A.shape[1], B.shape[1]))
+    for k in range(A.shape[1]):
+        for l in range(B.shape[1]):
+            out[:, k, l] = np.bincount(codes, weights=A[:, k] * B[:, l], minlength=n_groups)
+    return out
+
+def _mT(A):
+    """Swap the last two axes"""
+    return np.swapaxes(A, -1, -2)
+
+def _mv(A, v):
+    """Batched matrix-vector product"""
+    return np.matmul(A, v[..., None])[..., 0]
+
+class HierarchicalMultiplicativeModel(SaviesaModel):
+    """
+    Multiplicative model with random académie and département effects
+
+    log(F) = β₀ + Σ βₖ·log(Xₖ) + académie effect + département effect
+
+    Random intercepts and (optionally) random elasticities are estimated at
+    both levels; départements are nested within académies.
+
+    Example:
+        >>> model = HierarchicalMultiplicativeModel()
+        >>> model.fit(X, F, academie=df['academie'], departement=df['department'])
+        >>> model.get_elasticities()
+        >>> model.variance_components()['sigma2']
+    """
+
+    def __init__(self, epsilon=1e-10, random_slopes=True, max_iter=200, tol=1e-6):
+        """
+        Initialize hierarchical multiplicative model
+
+        Args:
+            epsilon: Small constant to avoid log(0)
+            random_slopes: Random elasticities in addition to random intercepts
+            max_iter: Maximum number of EM iterations
+            tol: Convergence tolerance on the relative log-likelihood change
+        """
+        super().__init__()
+        self.epsilon = epsilon
+        self.random_slopes = random_slopes
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def _design(self, X):
+        """Fixed-effect design (1, log X) and random-effect column indices"""
+        log_X = np.log(np.asarray(X, dtype=float) + self.epsilon)
+        Z = np.column_stack([np.ones(len(log_X)), log_X])
+        random_idx = np.arange(Z.shape[1]) if self.random_slopes else np.array([0])
+        return Z, random_idx
+
+    @staticmethod
+    def _group_keys(academie, departement):
+        """MultiIndex of (académie, département) pairs, enforcing nesting"""
+        import pandas as pd
+        return pd.MultiIndex.from_arrays([np.asarray(academie), np.asarray(departement)])
+
+    @staticmethod
+    def _e_step(stats, sigma2, Sigma_a, Sigma_b):
+        """
+        GLS estimate of β, log-likelihood and posterior moments of the effects
+
+        Args:
+            stats: Per-département sufficient statistics and group sizes
+            sigma2: Residual variance
+            Sigma_a: Académie effect covariance (r, r)
+            Sigma_b: Département effect covariance (r, r)
+
+        Returns:
+            dict: beta, H (information matrix of β), loglik and the posterior
+                moments used by the M-step
+        """
+        ZZ, ZR, RR, Zy, Ry, yy = (stats[k] for k in ('ZZ', 'ZR', 'RR', 'Zy', 'Ry', 'yy'))
+        acad_of_dept, n = stats['acad_of_dept'], stats['n']
+        n_acad, n_dept = stats['n_acad'], stats['n_dept']
+        jitter = np.eye(RR.shape[-1]) * 1e-12
+
+        # Département level: marginalize b_d (Woodbury on V_d = R Σ_b Rᵀ + σ² I)
+        M = _inv(RR / sigma2 + _inv(Sigma_b + jitter))
+        RR_s, ZR_s = RR / sigma2, ZR / sigma2
+        RVR = RR_s - RR_s @ M @ RR_s
+        ZVR = ZR_s - ZR_s @ M @ RR_s
+        ZVZ = ZZ / sigma2 - ZR_s @ M @ _mT(ZR_s)
+        ZVy = Zy / sigma2 - _mv(ZR_s @ M, Ry / sigma2)
+        RVy = Ry / sigma2 - _mv(RR_s @ M, Ry / sigma2)
+
+        # Académie level: marginalize a_j
+        S_RVR = _group_sums(RVR, acad_of_dept, n_acad)
+        S_ZVR = _group_sums(ZVR, acad_of_dept, n_acad)
+        S_ZVZ = _group_sums(ZVZ, acad_of_dept, n_acad)
+        S_ZVy = _group_sums(ZVy, acad_of_dept, n_acad)
+        S_RVy = _group_sums(RVy, acad_of_dept, n_acad)
+        C = _inv(_inv(Sigma_a + jitter) + S_RVR)
+
+        # Generalized least squares for β
+        H = (S_ZVZ - S_ZVR @ C @ _mT(S_ZVR)).sum(axis=0)
+        h = (S_ZVy - _mv(S_ZVR @ C, S_RVy)).sum(axis=0)
+        beta = np.linalg.solve(H, h)
+
+        # Residual statistics given β
+        Rr = Ry - _mv(_mT(ZR), beta)
+        rr = yy - 2 * Zy @ beta + np.einsum('i,dij,j->d', beta, ZZ, beta)
+        S_RVr = S_RVy - _mv(_mT(S_ZVR), beta)
+
+        # Marginal log-likelihood at (β, Σ_a, Σ_b, σ²)
+        quad = (np.sum(rr) / sigma2
+                - np.sum(Rr / sigma2 * _mv(M, Rr / sigma2))
+                - np.sum(S_RVr * _mv(C, S_RVr)))
+        logdet = (n * np.log(sigma2)
+                  + n_dept * _logdet(Sigma_b + jitter) - np.sum(_logdet(M))
+                  + n_acad * _logdet(Sigma_a + jitter) - np.sum(_logdet(C)))
+        loglik = -0.5 * (quad + logdet + n * np.log(2 * np.pi))
+
+        # Posterior moments of a_j and b_d
+        a_hat = _mv(C, S_RVr)
+        C_d = C[acad_of_dept]
+        K = M @ RR_s
+        b_hat = _mv(M, Rr / sigma2) - _mv(K, a_hat[acad_of_dept])
+        cov_b = M + K @ C_d @ _mT(K)
+        cross = C_d @ _mT(K)
+        return {'beta': beta, 'H': H, 'loglik': loglik, 'Rr': Rr, 'rr': rr,
+                'a_hat': a_hat, 'C': C, 'b_hat': b_hat, 'cov_b': cov_b,
+                'u_hat': a_hat[acad_of_dept] + b_hat,
+                'cov_u': C_d + cov_b - cross - _mT(cross)}
+
+    @staticmethod
+    def _m_step(stats, state):
+        """Updated (σ², Σ_a, Σ_b) from the posterior moments of an E-step"""
+        RR, u_hat, Rr = stats['RR'], state['u_hat'], state['Rr']
+        sse = (state['rr'] - 2 * np.sum(u_hat * Rr, axis=1)
+               + np.einsum('di,dij,dj->d', u_hat, RR, u_hat)
+               + np.einsum('dij,dji->d', RR, state['cov_u']))
+        sigma2 = np.sum(sse) / stats['n']
+        a_hat, b_hat = state['a_hat'], state['b_hat']
+        Sigma_a = (np.einsum('ji,jk->ik', a_hat, a_hat) + state['C'].sum(axis=0)) / stats['n_acad']
+        Sigma_b = (np.einsum('di,dk->ik', b_hat, b_hat) + state['cov_b'].sum(axis=0)) / stats['n_dept']
+        return sigma2, Sigma_a, Sigma_b
+
+    @instrument
+    def fit(self, X, y, academie, departement):
+        """
+        Fit hierarchical multiplicative model by EM
+
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            y: Target variable (n_samples,)
+            academie: Académie label per sample
+            departement: Département label per sample (nested in académie)
+        """
+        import pandas as pd
+
+        Z, random_idx = self._design(X)
+        log_y = np.log(np.asarray(y, dtype=float) + self.epsilon)
+        R = Z[:, random_idx]
+        n = Z.shape[0]
+        r = R.shape[1]
+
+        # Group codes: départements are identified within their académie
+        dept_keys = self._group_keys(academie, departement)
+        dept_codes, dept_index = pd.factorize(dept_keys)
+        acad_codes, acad_index = pd.factorize(np.asarray(academie))
+        acad_index = pd.Index(acad_index)
+        n_dept, n_acad = len(dept_index), len(acad_index)
+        acad_of_dept = np.zeros(n_dept, dtype=int)
+        acad_of_dept[dept_codes] = acad_codes
+
+        # One pass over the data: per-département sufficient statistics
+        ZZ = _cross_sums(Z, Z, dept_codes, n_dept)
+        ZR = ZZ[:, :, random_idx]
+        RR = ZZ[:, random_idx][:, :, random_idx]
+        Zy = _cross_sums(Z, log_y[:, None], dept_codes, n_dept)[..., 0]
+        Ry = Zy[:, random_idx]
+        yy = np.bincount(dept_codes, weights=log_y**2, minlength=n_dept)
+
+        # Start from pooled OLS
+        beta = np.linalg.solve(ZZ.sum(axis=0), Zy.sum(axis=0))
+        sigma2 = (yy.sum() - 2 * beta @ Zy.sum(axis=0) + beta @ ZZ.sum(axis=0) @ beta) / n
+        Sigma_a = np.eye(r) * 0.1 * sigma2
+        Sigma_b = np.eye(r) * 0.1 * sigma2
+
+        stats = {'ZZ': ZZ, 'ZR': ZR, 'RR': RR, 'Zy': Zy, 'Ry': Ry, 'yy': yy,
+                 'acad_of_dept': acad_of_dept, 'n': n, 'n_acad': n_acad, 'n_dept': n_dept}
+
+        # Alternate M- and E-steps so that the reported β, its covariance and
+        # the random effects all belong to the final variance parameters
+        state = self._e_step(stats, sigma2, Sigma_a, Sigma_b)
+        converged, iteration = False, 0
+        for iteration in range(1, self.max_iter + 1):
+            sigma2, Sigma_a, Sigma_b = self._m_step(stats, state)
+            loglik_prev = state['loglik']
+            state = self._e_step(stats, sigma2, Sigma_a, Sigma_b)
+            if abs(state['loglik'] - loglik_prev) <= self.tol * (abs(state['loglik']) + 1):
+                converged = True
+                break
+        if not converged:
+            warnings.warn(f"EM did not converge in {self.max_iter} iterations; "
+                          "increase max_iter or tol", RuntimeWarning)
+
+        self.coef_ = state['beta']
+        self.coef_cov_ = np.linalg.inv(state['H'])
+        self.sigma2_ = sigma2
+        self.Sigma_academie_ = Sigma_a
+        self.Sigma_departement_ = Sigma_b
+        self.loglik_ = state['loglik']
+        self.converged_ = converged
+        self.n_iter_ = iteration
+        self.random_idx_ = random_idx
+        self.academie_index_ = acad_index
+        self.departement_index_ = dept_index
+        self.academie_effects_ = state['a_hat']
+        self.departement_effects_ = state['b_hat']
+        self.is_fitted = True
+        return self
+
+    @property
+    def n_features_in_(self):
+        """Number of raw factors predict expects (coef_ holds the intercept first)"""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        return len(self.coef_) - 1
+
+    @instrument
+    def predict(self, X, academie=None, departement=None):
+        """
+        Predict using the hierarchical model
+
+        Known groups get their predicted (BLUP) random effects; unseen groups,
+        or calls without group labels, fall back to the population level.
+
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            academie: Optional académie label per sample
+            departement: Optional département label per sample
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before prediction")
+
+        Z, random_idx = self._design(X)
+        log_y_pred = Z @ self.coef_
+        R = Z[:, random_idx]
+
+        if academie is not None:
+            codes = self.academie_index_.get_indexer(np.asarray(academie))
+            effects = np.where((codes >= 0)[:, None], self.academie_effects_[codes], 0.0)
+            log_y_pred += np.sum(R * effects, axis=1)
+
+            if departement is not None:
+                codes = self.departement_index_.get_indexer(self._group_keys(academie, departement))
+                effects = np.where((codes >= 0)[:, None], self.departement_effects_[codes], 0.0)
+                log_y_pred += np.sum(R * effects, axis=1)
+
+        return np.exp(log_y_pred)
+
+    def get_elasticities(self):
+        """
+        Get population-level elasticities (fixed effects)
+
+        Returns:
+            dict: Intercept, elasticities and their standard errors
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        se = np.sqrt(np.diag(self.coef_cov_))
+        return {
+            'intercept': self.coef_[0],
+            'elasticities': self.coef_[1:],
+            'std_errors': se[1:]
+        }
+
+    def variance_components(self):
+        """
+        Get estimated variance components
+
+        Returns:
+            dict: Residual variance and random-effect covariance per level
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        return {
+            'sigma2': self.sigma2_,
+            'academie': self.Sigma_academie_,
+            'departement': self.Sigma_departement_
+        }
+
+    def group_elasticities(self, level='departement'):
+        """
+        Get group-specific intercepts and elasticities (β + random effects)
+
+        Args:
+            level: 'academie' or 'departement'
+
+        Returns:
+            pd.DataFrame: One row per group, columns intercept, beta_1, ...
+        """
+        import pandas as pd
+
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        if level not in ('academie', 'departement'):
+            raise ValueError(f"Unknown level: {level}")
+
+        columns = ['intercept'] + [f'beta_{k}' for k in range(1, len(self.coef_))]
+        if level == 'academie':
+            index = self.academie_index_
+            effects = self.academie_effects_
+        else:
+            index = self.departement_index_
+            acad_codes = self.academie_index_.get_indexer(index.get_level_values(0))
+            effects = self.departement_effects_ + self.academie_effects_[acad_codes]
+
+        values = np.tile(self.coef_, (len(index), 1))
+        values[:, self.random_idx_] += effects
+        return pd.DataFrame(values, index=index, columns=columns)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batched Linear Algebra
+Saviesa Framework
+
+This module provides the small linear-algebra primitives shared by the
+models, the robust and rolling fits, SIMEX and the Monte Carlo study:
+interaction designs, centered Gram matrices and solves of stacks of normal
+equations (with a pseudo-inverse fallback for singular systems), all
+batched over leading axes.
+"""
+
+import numpy as np
+
+def solve_batched(A, b):
+    """
+    Solve stacked linear systems A x = b, falling back to the pseudo-inverse
+
+    Args:
+        A: Matrices (..., p, p)
+        b: Right-hand sides (..., p)
+
+    Returns:
+        np.ndarray: Solutions (..., p)
+    """
+    try:
+        return np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.matmul(np.linalg.pinv(A), b[..., None])[..., 0]
+
+def add_interactions_batched(X):
+    """
+    Append pairwise interaction terms to a stack of feature matrices
+
+    Column order matches ``InteractionModel._add_interactions``.
+
+    Args:
+        X: Feature array (..., n_samples, n_features)
+
+    Returns:
+        np.ndarray: Array (..., n_samples, n_features + n_pairs)
+    """
+    n_features = X.shape[-1]
+    i, j = np.triu_indices(n_features, k=1)
+    return np.concatenate([X, X[..., i] * X[..., j]], axis=-1)
+
+def centered_gram(X, y):
+    """
+    Centered Gram matrices and cross-products for a stack of designs
+
+    Args:
+        X: Designs (..., n_samples, n_features), without intercept column
+        y: Targets (..., n_samples)
+
+    Returns:
+        tuple: XᵀX (..., p, p) and Xᵀy (..., p) of the centered data, and
+            the column and target means
+    """
+    X_mean = X.mean(axis=-2, keepdims=True)
+    y_mean = y.mean(axis=-1, keepdims=True)
+    Xc = X - X_mean
+    yc = y - y_mean
+    XtX = np.matmul(np.swapaxes(Xc, -1, -2), Xc)
+    Xty = np.matmul(np.swapaxes(Xc, -1, -2), yc[..., None])[..., 0]
+    return XtX, Xty, X_mean[..., 0, :], y_mean[..., 0]
@@ -11,6 +11,9 @@ import numpy as np
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 from sklearn.model_selection import LeaveOneOut
 
+from .profiling import instrument
+
+@instrument
 def calculate_r2(y_true, y_pred):
     """
     Calculate R² (coefficient of determination)
@@ -24,6 +27,7 @@ def calculate_r2(y_true, y_pred):
     """
     return r2_score(y_true, y_pred)
 
+@instrument
 def calculate_rmse(y_true, y_pred):
     """
     Calculate RMSE (Root Mean Squared Error)
@@ -37,6 +41,7 @@ def calculate_rmse(y_true, y_pred):
     """
     return np.sqrt(mean_squared_error(y_true, y_pred))
 
+@instrument
 def calculate_mae(y_true, y_pred):
     """
     Calculate MAE (Mean Absolute Error)
@@ -50,6 +55,7 @@ def calculate_mae(y_true, y_pred):
     """
     return mean_absolute_error(y_true, y_pred)
 
+@instrument
 def calculate_aic(y_true, y_pred, n_params):
     """
     Calculate AIC (Akaike Information Criterion)
@@ -67,6 +73,7 @@ def calculate_aic(y_true, y_pred, n_params):
     aic = n * np.log(rss / n) + 2 * n_params
     return aic
 
+@instrument
 def calculate_bic(y_true, y_pred, n_params):
     """
     Calculate BIC (Bayesian Information Criterion)
@@ -84,6 +91,7 @@ def calculate_bic(y_true, y_pred, n_params):
     bic = n * np.log(rss / n) + n_params * np.log(n)
     return bic
 
+@instrument
 def loocv_validation(model, X, y):
     """
     Perform Leave-One-Out Cross-Validation
@@ -128,6 +136,7 @@ def loocv_validation(model, X, y):
         'actuals': actuals
     }
 
+@instrument
 def calculate_all_metrics(y_true, y_pred, n_params=None):
     """
     Calculate all standard metrics
@@ -152,6 +161,7 @@ def calculate_all_metrics(y_true, y_pred, n_params=None):
     
     return metrics
 
+@instrument
 def compare_predictions(y_true, y_pred1, y_pred2, model1_name='Model 1', model2_name='Model 2'):
     """
     Compare predictions from two models
@@ -183,6 +193,7 @@ def compare_predictions(y_true, y_pred1, y_pred2, model1_name='Model 1', model2_
     
     return comparison
 
+@instrument
 def diagnostic_divergence_rate(limiting_factors1, limiting_factors2):
     """
     Calculate diagnostic divergence rate between two methods
@@ -213,3 +224,180 @@ def diagnostic_divergence_rate(limiting_factors1, limiting_factors2):
         'convergent_mask': convergent,
         'divergent_mask': divergent
     }
+
+def _batched_sums(values, weights=None, groups=None):
+    """
+    Sum values (..., n) over observations, per weight row and/or group
+
+    Args:
+        values: Array (..., n)
+        weights: Optional frequency weights (B, n), e.g. bootstrap counts
+        groups: Optional integer group codes (n,)
+
+    Returns:
+        np.ndarray: Sums of shape (...,), (..., B), (..., G) or (..., B, G)
+    """
+    values = np.asarray(values, dtype=float)
+    if weights is not None:
+        values = values[..., None, :] * weights
+    if groups is None:
+        return values.sum(axis=-1)
+
+    from scipy.sparse import csr_matrix
+
+    n = values.shape[-1]
+    n_groups = int(groups.max()) + 1
+    one_hot = csr_matrix((np.ones(n), (np.arange(n), groups)), shape=(n, n_groups))
+    flat = values.reshape(-1, n)
+    return (one_hot.T @ flat.T).T.reshape(values.shape[:-1] + (n_groups,))
+
+def _group_codes(groups):
+    """Integer codes and labels for group labels (or None)"""
+    import pandas as pd
+
+    if groups is None:
+        return None, None
+    codes, labels = pd.factorize(np.asarray(groups))
+    return codes, labels
+
+@instrument
+def pointwise_loglik(y_true, y_pred, log_scale=False, epsilon=1e-10):
+    """
+    Per-observation Gaussian log-likelihood contributions on the scale of F
+
+    For the additive model, residuals are normal in F. For the
+    multiplicative model (log_scale=True), residuals are normal in log F and
+    the Jacobian -log F puts the contributions on the same scale, so both
+    can be compared by vuong_test. The error variance is its ML estimate.
+
+    Args:
+        y_true: True values (..., n)
+        y_pred: Predicted values (..., n)
+        log_scale: Residuals are taken as log(y_true) - log(y_pred)
+        epsilon: Small constant to avoid log(0)
+
+    Returns:
+        np.ndarray: Log-likelihood contributions (..., n)
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    if log_scale:
+        log_y = np.log(y_true + epsilon)
+        resid = log_y - np.log(y_pred + epsilon)
+    else:
+        resid = y_true - y_pred
+    sigma2 = np.mean(resid**2, axis=-1, keepdims=True)
+    loglik = -0.5 * (np.log(2 * np.pi * sigma2) + resid**2 / sigma2)
+    return loglik - log_y if log_scale else loglik
+
+@instrument
+def vuong_test(loglik1, loglik2, n_params1=0, n_params2=0, correction='bic',
+               weights=None, groups=None, alpha=0.05):
+    """
+    Vuong test for non-nested models from per-observation log-likelihoods
+
+    The statistic is the (corrected) log-likelihood ratio divided by
+    √n·ω, with ω² the variance of the pointwise differences; it is
+    asymptotically N(0, 1) when both models are equally close to the truth.
+    Leading axes of the inputs, bootstrap weights and groups are all
+    evaluated at once.
+
+    Args:
+        loglik1: Contributions of model 1 (..., n)
+        loglik2: Contributions of model 2 (..., n)
+        n_params1: Parameters of model 1 (for the correction)
+        n_params2: Parameters of model 2
+        correction: 'bic' (Schwarz), 'aic' (Akaike) or None
+        weights: Optional frequency weights (B, n), e.g. bootstrap counts
+        groups: Optional group label per observation (e.g. académie)
+        alpha: Significance level for 'preferred'
+
+    Returns:
+        dict: statistic, p_value (two-sided), lr (corrected), n, preferred
+            (1, 2, or 0 when undecided), and groups (labels) when grouped;
+            arrays have shape (...,) extended by (B,) and/or (G,)
+
+    Example:
+        >>> ll_add = pointwise_loglik(y, add.predict(X))
+        >>> ll_mult = pointwise_loglik(y, mult.predict(X), log_scale=True)
+        >>> vuong_test(ll_mult, ll_add, 4, 4)['preferred']
+    """
+    from scipy.stats import norm
+
+    if correction not in ('bic', 'aic', None):
+        raise ValueError(f"Unknown correction: {correction}")
+    m = np.asarray(loglik1, dtype=float) - np.asarray(loglik2, dtype=float)
+    codes, labels = _group_codes(groups)
+
+    n = _batched_sums(np.ones(m.shape[-1]), weights, codes)
+    lr = _batched_sums(m, weights, codes)
+    omega2 = _batched_sums(m**2, weights, codes) / n - (lr / n)**2
+
+    if correction == 'bic':
+        lr = lr - (n_params1 - n_params2) / 2 * np.log(n)
+    elif correction == 'aic':
+        lr = lr - (n_params1 - n_params2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = lr / np.sqrt(n * omega2)
+    p_value = 2 * norm.sf(np.abs(statistic))
+    z = norm.isf(alpha / 2)
+    preferred = np.where(statistic > z, 1, np.where(statistic < -z, 2, 0))
+
+    result = {'statistic': statistic, 'p_value': p_value, 'lr': lr, 'n': n,
+              'preferred': preferred}
+    if labels is not None:
+        result['groups'] = labels
+    return result
+
+@instrument
+def j_test(y, X, y_pred_alt, weights=None, groups=None):
+    """
+    Davidson–MacKinnon J test of a linear model against a rival's fit
+
+    Regresses y on (1, X, ŷ_alt); a significant coefficient on ŷ_alt rejects
+    the model defined by X. Run it in both directions: in levels for the
+    additive model (y = F, ŷ_alt = multiplicative prediction) and in logs
+    for the multiplicative model (y = log F, X = log factors,
+    ŷ_alt = log of the additive prediction). Gram matrices for all weight
+    rows and groups come from one pass over the data.
+
+    Args:
+        y: Target on the tested model's scale (n,)
+        X: Tested model's design without intercept (n, p)
+        y_pred_alt: Rival model's fitted values on the same scale (n,)
+        weights: Optional frequency weights (B, n), e.g. bootstrap counts
+        groups: Optional group label per observation
+
+    Returns:
+        dict: coef (of ŷ_alt), statistic (t), p_value (two-sided), n, and
+            groups (labels) when grouped; arrays have shape (), (B,), (G,)
+            or (B, G)
+    """
+    from scipy.stats import t as student_t
+
+    y = np.asarray(y, dtype=float)
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    Z = np.column_stack([np.ones(len(y)), X, np.asarray(y_pred_alt, dtype=float)])
+    q = Z.shape[1]
+    codes, labels = _group_codes(groups)
+
+    ZZ = (Z[:, :, None] * Z[:, None, :]).reshape(len(y), q * q)
+    A = np.moveaxis(_batched_sums(ZZ.T, weights, codes), 0, -1)
+    A = A.reshape(A.shape[:-1] + (q, q))
+    b = np.moveaxis(_batched_sums((Z * y[:, None]).T, weights, codes), 0, -1)
+    yy = _batched_sums(y**2, weights, codes)
+    n = _batched_sums(np.ones(len(y)), weights, codes)
+
+    A_inv = np.linalg.pinv(A)
+    beta = np.matmul(A_inv, b[..., None])[..., 0]
+    df = n - q
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma2 = (yy - np.sum(beta * b, axis=-1)) / df
+        statistic = beta[..., -1] / np.sqrt(sigma2 * A_inv[..., -1, -1])
+    p_value = 2 * student_t.sf(np.abs(statistic), np.maximum(df, 1))
+
+    result = {'coef': beta[..., -1], 'statistic': statistic, 'p_value': p_value, 'n': n}
+    if labels is not None:
+        result['groups'] = labels
+    return result
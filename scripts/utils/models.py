@@ -7,16 +7,517 @@ Saviesa Framework
 This module provides implementations of additive, interaction, and multiplicative models.
 """
 
+import collections
+import functools
+import hashlib
+import inspect
+import os
+import threading
+
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 
+from .profiling import instrument, section
+from .fixed_effects import absorb_and_fit, lookup_effects
+from .censored import fit_tobit
+from .robust import robust_fit, LOSSES
+from .influence import influence_measures, influence_frame
+from .attribution import log_attribution, interaction_shapley, attribution_frame
+from .linalg import add_interactions_batched, centered_gram, solve_batched
+from .persistence import (save_model, load_model, data_fingerprint, model_header,
+                          decode_state, read_file, write_file)
+
+def _linear_regression(coef, intercept):
+    """LinearRegression carrying externally estimated coefficients"""
+    model = LinearRegression()
+    model.coef_ = np.asarray(coef, dtype=float)
+    model.intercept_ = float(intercept)
+    model.n_features_in_ = len(model.coef_)
+    return model
+
+def _check_censoring(censoring):
+    """Validate a (lower, upper) censoring pair; None disables censoring"""
+    if censoring is None:
+        return None
+    lower, upper = censoring
+    if lower is None and upper is None:
+        return None
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError("Censoring lower bound must be below upper bound")
+    return (lower, upper)
+
+def _check_robust(robust):
+    """Validate a robust loss name; None means ordinary least squares"""
+    if robust is not None and robust not in LOSSES:
+        raise ValueError(f"Unknown robust loss: {robust}")
+    return robust
+
+# Currently active fit cache (None when caching is disabled)
+_FIT_CACHE = None
+
+def _fingerprint_value(value):
+    """Hashable summary of a fit argument: content hash for data, repr otherwise"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    if isinstance(value, FeatureSet):
+        return value.fingerprint()
+    if hasattr(value, 'columns'):
+        return repr([list(map(str, value.columns))] +
+                    [data_fingerprint(value[c].to_numpy()) for c in value.columns])
+    if isinstance(value, (list, tuple)) and value and not np.isscalar(value[0]):
+        return repr([_fingerprint_value(v) for v in value])
+    return data_fingerprint(value)
+
+class FitCache:
+    """
+    Opt-in memo of fitted models keyed by a fingerprint of their inputs
+    
+    While active, a fit with the same model class, constructor parameters,
+    X, y and fit arguments (fixed effects, clusters) restores the stored
+    fitted state instead of refitting. States are kept as plain arrays (see
+    persistence.py) in an LRU bounded by max_bytes and, with a directory,
+    also on disk, which survives restarts. Restored arrays are read-only
+    copies shared with the cache.
+    
+    Args:
+        max_bytes: Memory budget of the in-memory tier
+        directory: Optional directory for the on-disk tier
+    
+    Example:
+        >>> with FitCache(max_bytes=64 * 2**20, directory='.fit_cache') as cache:
+        ...     compare_models(X, y)
+        ...     compare_models(X, y)
+        >>> cache.stats()['hits']
+        3
+    """
+    
+    def __init__(self, max_bytes=64 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._previous = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    def start(self):
+        """Activate this cache"""
+        global _FIT_CACHE
+        self._previous = _FIT_CACHE
+        _FIT_CACHE = self
+        return self
+    
+    def stop(self):
+        """Deactivate this cache (its entries are kept)"""
+        global _FIT_CACHE
+        _FIT_CACHE = self._previous
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+    
+    def key(self, model, arguments):
+        """
+        Cache key of a fit
+        
+        Args:
+            model: Model about to be fitted
+            arguments: Fit arguments by name (X, y, fixed_effects, ...)
+        
+        Returns:
+            str: Hexadecimal digest
+        """
+        names = list(inspect.signature(type(model).__init__).parameters)[1:]
+        params = {name: getattr(model, name, None) for name in names}
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((type(model).__name__, sorted(params.items()))).encode())
+        for name, value in arguments.items():
+            digest.update(f"{name}={_fingerprint_value(value)};".encode())
+        return digest.hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.sav")
+    
+    def _store(self, key, header, arrays):
+        """Insert into the memory tier and evict least recently used entries"""
+        size = sum(a.nbytes for a in arrays) + len(repr(header))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (header, arrays, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+    
+    def get(self, key):
+        """
+        Fitted state for a key, or None on a miss
+        
+        Returns:
+            dict: Attributes to set on the model
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+        if entry is None and self.directory is not None and os.path.exists(self._path(key)):
+            header, arrays = read_file(self._path(key))
+            self._store(key, header, arrays)
+            with self._lock:
+                self.disk_hits += 1
+            entry = (header, arrays, None)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return decode_state(entry[0]['state'], entry[1])
+    
+    def put(self, key, model):
+        """Store the fitted state of a model"""
+        try:
+            header, arrays = model_header(model)
+        except ValueError:
+            # State with values the file format does not support: not cached
+            return
+        arrays = [np.array(a) for a in arrays]
+        for a in arrays:
+            a.setflags(write=False)
+        self._store(key, header, arrays)
+        if self.directory is not None:
+            write_file(self._path(key), header, arrays)
+    
+    def stats(self):
+        """
+        Returns:
+            dict: hits (memory), disk_hits, misses, hit_rate, evictions,
+                entries, bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes
+            }
+    
+    def clear(self, disk=False):
+        """Drop the memory tier (and the on-disk files with disk=True)"""
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.sav'):
+                    os.remove(os.path.join(self.directory, name))
+
+def _cached_fit(fit):
+    """Route a fit method through the active FitCache, if any"""
+    signature = inspect.signature(fit)
+    
+    @functools.wraps(fit)
+    def wrapper(self, *args, **kwargs):
+        cache = _FIT_CACHE
+        if cache is None:
+            return fit(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = cache.key(self, dict(list(bound.arguments.items())[1:]))
+        state = cache.get(key)
+        if state is not None:
+            self.__dict__.update(state)
+            return self
+        fit(self, *args, **kwargs)
+        cache.put(key, self)
+        return self
+    return wrapper
+
+class FeatureSet:
+    """
+    Design blocks of one dataset, shared by the models of a comparison
+    
+    Builds the interaction design [X, X_i·X_j] and the log design once, each
+    with its centered Gram matrix. The additive design is the leading block
+    of the interaction design, so both models solve from one Gram matrix,
+    and in-sample predictions reuse the stored designs instead of
+    recomputing transforms in predict.
+    
+    Example:
+        >>> features = FeatureSet(X, y)
+        >>> model = MultiplicativeModel().fit_features(features)
+        >>> y_pred = model.predict_features(features)
+    """
+    
+    def __init__(self, X, y, epsilon=1e-10):
+        """
+        Initialize feature set
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            y: Target variable (n_samples,)
+            epsilon: Small constant to avoid log(0) in the log design
+        """
+        self.X = np.asarray(X, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.epsilon = epsilon
+        self._blocks = {}
+    
+    def _block(self, name, build):
+        if name not in self._blocks:
+            self._blocks[name] = build()
+        return self._blocks[name]
+    
+    def design(self, kind):
+        """Design without intercept: 'linear' [X, X_i·X_j] or 'log' log(X + ε)"""
+        if kind == 'linear':
+            return self._block('linear', lambda: add_interactions_batched(self.X))
+        return self._block('log', lambda: np.log(self.X + self.epsilon))
+    
+    def target(self, kind):
+        """Target of a design: y or log(y + ε)"""
+        if kind == 'linear':
+            return self.y
+        return self._block('log_y', lambda: np.log(self.y + self.epsilon))
+    
+    def gram(self, kind):
+        """Centered ZᵀZ, Zᵀy, column means and target mean of a design"""
+        return self._block(f'gram_{kind}',
+                           lambda: centered_gram(self.design(kind), self.target(kind)))
+    
+    def solve(self, kind, n_columns=None):
+        """
+        OLS on the leading columns of a design
+        
+        Args:
+            kind: 'linear' or 'log'
+            n_columns: Leading columns used (default: all)
+        
+        Returns:
+            tuple: (intercept, coef)
+        """
+        XtX, Xty, X_mean, y_mean = self.gram(kind)
+        k = len(Xty) if n_columns is None else n_columns
+        coef = solve_batched(XtX[:k, :k], Xty[:k])
+        return y_mean - X_mean[:k] @ coef, coef
+    
+    def fitted(self, kind, intercept, coef):
+        """Linear predictor of the leading design columns"""
+        return intercept + self.design(kind)[:, :len(coef)] @ coef
+    
+    def fingerprint(self):
+        """Content hash of X, y and epsilon (see FitCache)"""
+        return self._block('fingerprint',
+                           lambda: data_fingerprint(self.X, self.y, np.float64(self.epsilon)))
+
 class SaviesaModel:
     """Base class for Saviesa models"""
     
     def __init__(self):
         self.model = None
         self.is_fitted = False
+        self.fixed_effects_ = None
+        self.censored_ = None
+        self.robust_ = None
+    
+    @property
+    def n_features_in_(self):
+        """Number of raw factors predict expects, as seen in fit"""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        return self.model.n_features_in_
+    
+    def _fit_linear(self, X, y, fixed_effects=None, clusters=None, bounds=None,
+                    robust=None):
+        """
+        Fit the linear stage of the model
+        
+        Plain OLS by default; with fixed_effects, the categorical effects are
+        absorbed by iterative demeaning (no dummy columns) and clustered
+        standard errors are computed. With bounds (lower, upper), a Tobit
+        model is fitted by maximum likelihood instead; with robust ('huber'
+        or 'tukey'), an M-estimator is fitted by IRLS.
+        """
+        self.fixed_effects_ = None
+        self.censored_ = None
+        self.robust_ = None
+        
+        if bounds is not None and robust is not None:
+            raise ValueError("Censored and robust fitting cannot be combined")
+        
+        if robust is not None:
+            if fixed_effects is not None:
+                raise ValueError("Robust fitting does not support fixed effects")
+            result = robust_fit(X, y, loss=robust)
+            self.model = _linear_regression(result['coef'], result['intercept'])
+            self.robust_ = result
+            return
+        
+        if bounds is not None:
+            if fixed_effects is not None:
+                raise ValueError("Censored fitting does not support fixed effects")
+            result = fit_tobit(X, y, lower=bounds[0], upper=bounds[1])
+            self.model = _linear_regression(result['coef'], result['intercept'])
+            self.censored_ = result
+            return
+        
+        if fixed_effects is None:
+            self.model = LinearRegression()
+            self.model.fit(X, y)
+            return
+        
+        result = absorb_and_fit(X, y, fixed_effects, clusters=clusters)
+        self.model = _linear_regression(result['coef'], result['intercept'])
+        self.fixed_effects_ = result
+    
+    def _predict_linear(self, X, fixed_effects=None, bounds=None):
+        """
+        Linear-stage prediction, adding absorbed effects when given and
+        clipping to the censoring bounds (the median of a censored outcome)
+        """
+        y_pred = self.model.predict(X)
+        if fixed_effects is not None:
+            if self.fixed_effects_ is None:
+                raise ValueError("Model was fitted without fixed effects")
+            y_pred = y_pred + lookup_effects(fixed_effects,
+                                             self.fixed_effects_['levels'],
+                                             self.fixed_effects_['effects'])
+        if bounds is not None:
+            y_pred = np.clip(y_pred, bounds[0], bounds[1])
+        return y_pred
+    
+    def _inference(self):
+        """Standard errors of the linear stage, when available"""
+        if self.censored_ is not None:
+            return {'std_errors': self.censored_['std_errors'],
+                    'sigma': self.censored_['sigma']}
+        if self.robust_ is not None:
+            return {'std_errors': self.robust_['std_errors']}
+        if self.fixed_effects_ is None:
+            return {}
+        return {'std_errors': self.fixed_effects_['std_errors']}
+    
+    def _linear_inputs(self, X, y):
+        """Design and target of the linear stage"""
+        return np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+    
+    def influence(self, X, y, feature_names=None, index=None, chunk_size=100_000):
+        """
+        Per-observation influence of the fitted linear stage
+        
+        Leverage, studentized residuals, Cook's distance, DFFITS and DFBETAS
+        from one Cholesky factorization, without refits (see influence.py).
+        
+        Args:
+            X: Feature matrix used in fit (n_samples, n_features)
+            y: Target variable used in fit (n_samples,)
+            feature_names: Names for the dfbetas columns
+            index: Optional row index (e.g. département codes)
+            chunk_size: Rows processed at once
+        
+        Returns:
+            pd.DataFrame: One row per observation
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        if self.censored_ is not None or self.robust_ is not None or self.fixed_effects_ is not None:
+            raise ValueError("Influence diagnostics are only available for the OLS fit")
+        design, target = self._linear_inputs(X, y)
+        measures = influence_measures(design, target, self.model.coef_, self.model.intercept_,
+                                      chunk_size=chunk_size)
+        return influence_frame(measures, feature_names, index)
+    
+    def _set_linear(self, intercept, coef):
+        """Install OLS coefficients solved outside _fit_linear"""
+        self.model = _linear_regression(coef, intercept)
+        self.fixed_effects_ = None
+        self.censored_ = None
+        self.robust_ = None
+        self.is_fitted = True
+    
+    def _shares_features(self, features):
+        """Whether the fit reduces to OLS on a FeatureSet design"""
+        return False
+    
+    @instrument
+    def fit_features(self, features):
+        """
+        Fit from shared design blocks (see FeatureSet)
+        
+        Plain OLS fits are solved from the FeatureSet's Gram matrices;
+        others (censored, robust) fall back to fit.
+        
+        Args:
+            features: FeatureSet of the training data
+        """
+        if self._shares_features(features):
+            return self._fit_features(features)
+        return self.fit(features.X, features.y)
+    
+    def predict_features(self, features):
+        """
+        In-sample predictions from the FeatureSet's stored designs
+        
+        Args:
+            features: FeatureSet
+        
+        Returns:
+            np.ndarray: Predictions (n_samples,)
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before prediction")
+        if self._shares_features(features):
+            return self._predict_features(features)
+        return self.predict(features.X)
+    
+    def save(self, path, feature_names=None, X=None, y=None):
+        """
+        Save the fitted model to a compact binary file (no pickle)
+        
+        Args:
+            path: Output file
+            feature_names: Optional factor names stored with the model
+            X: Optional training features, stored as a fingerprint only
+            y: Optional training target, stored as a fingerprint only
+        
+        Returns:
+            int: File size in bytes
+        """
+        return save_model(self, path, feature_names=feature_names, X=X, y=y)
+    
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a model saved with save
+        
+        Args:
+            path: Model file
+            mmap: Map arrays from the file (read-only) instead of reading it
+        
+        Returns:
+            SaviesaModel: The fitted model, with feature names and
+                fingerprint in metadata_
+        """
+        model = load_model(path, mmap=mmap)
+        if not isinstance(model, cls):
+            raise ValueError(f"{path} contains a {type(model).__name__}, not a {cls.__name__}")
+        return model
     
     def fit(self, X, y):
         """Fit the model"""
@@ -40,24 +541,65 @@ class AdditiveModel(SaviesaModel):
     Assumes full compensability between factors.
     """
     
-    def fit(self, X, y):
+    def __init__(self, censoring=None, robust=None):
+        """
+        Initialize additive model
+        
+        Args:
+            censoring: Optional (lower, upper) bounds of F, either may be
+                None; observations at a bound are treated as censored and
+                the model is fitted as a Tobit regression
+            robust: Optional robust loss ('huber' or 'tukey') fitted by
+                IRLS to downweight outlying observations
+        """
+        super().__init__()
+        self.censoring = _check_censoring(censoring)
+        self.robust = _check_robust(robust)
+    
+    @instrument
+    @_cached_fit
+    def fit(self, X, y, fixed_effects=None, clusters=None):
         """
         Fit additive model
         
         Args:
             X: Feature matrix (n_samples, n_features)
             y: Target variable (n_samples,)
+            fixed_effects: Optional categorical effects to absorb, e.g.
+                département and/or académie labels (array, list of arrays
+                or DataFrame)
+            clusters: Cluster labels for standard errors (default: first
+                fixed effect)
         """
-        self.model = LinearRegression()
-        self.model.fit(X, y)
+        self._fit_linear(X, y, fixed_effects, clusters, bounds=self.censoring,
+                         robust=self.robust)
         self.is_fitted = True
         return self
     
-    def predict(self, X):
-        """Predict using additive model"""
+    def _shares_features(self, features):
+        return self.censoring is None and self.robust is None
+    
+    @_cached_fit
+    def _fit_features(self, features):
+        self._set_linear(*features.solve('linear', features.X.shape[1]))
+        return self
+    
+    def _predict_features(self, features):
+        return features.fitted('linear', self.model.intercept_, self.model.coef_)
+    
+    @instrument
+    def predict(self, X, fixed_effects=None):
+        """
+        Predict using additive model
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            fixed_effects: Optional labels to add the absorbed effects
+                (unseen levels contribute 0)
+        """
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
-        return self.model.predict(X)
+        return self._predict_linear(X, fixed_effects, bounds=self.censoring)
     
     def get_coefficients(self):
         """Get model coefficients"""
@@ -65,7 +607,8 @@ class AdditiveModel(SaviesaModel):
             raise ValueError("Model must be fitted first")
         return {
             'intercept': self.model.intercept_,
-            'coefficients': self.model.coef_
+            'coefficients': self.model.coef_,
+            **self._inference()
         }
 
 class InteractionModel(SaviesaModel):
@@ -75,6 +618,8 @@ class InteractionModel(SaviesaModel):
     Allows partial non-compensability through interaction terms.
     """
     
+    @instrument
+    @_cached_fit
     def fit(self, X, y):
         """
         Fit interaction model
@@ -91,6 +636,25 @@ class InteractionModel(SaviesaModel):
         self.n_features = X.shape[1]
         return self
     
+    @property
+    def n_features_in_(self):
+        """Number of raw factors (before the pairwise products)"""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        return self.n_features
+    
+    def _shares_features(self, features):
+        return True
+    
+    @_cached_fit
+    def _fit_features(self, features):
+        self._set_linear(*features.solve('linear'))
+        self.n_features = features.X.shape[1]
+        return self
+    
+    def _predict_features(self, features):
+        return features.fitted('linear', self.model.intercept_, self.model.coef_)
+    
     def _add_interactions(self, X):
         """Add pairwise interaction terms"""
         n_samples, n_features = X.shape
@@ -104,12 +668,44 @@ class InteractionModel(SaviesaModel):
             return np.column_stack([X] + interactions)
         return X
     
+    def _linear_inputs(self, X, y):
+        """Design with interaction terms, and the target"""
+        return self._add_interactions(np.asarray(X, dtype=float)), np.asarray(y, dtype=float)
+    
+    @instrument
     def predict(self, X):
         """Predict using interaction model"""
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         X_with_interactions = self._add_interactions(X)
         return self.model.predict(X_with_interactions)
+    
+    def attribute(self, X, y=None, groups=None, weights=None, feature_names=None, index=None):
+        """
+        Shapley split of each row's performance gap to a reference population
+        
+        The baseline is the rows of the same group (national by default);
+        pairwise terms are shared equally by their two factors, which is
+        exact for this model (see attribution.py).
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            y: Optional observed target, to add the residual's share
+            groups: Optional reference groups (e.g. académie labels)
+            weights: Optional row weights of the reference (e.g. enrolment)
+            feature_names: Factor names for the columns
+            index: Optional row index (e.g. UAI codes)
+        
+        Returns:
+            pd.DataFrame: Per-factor contributions and gap (F̂ − mean F̂ of
+                the reference, or F − mean F with y)
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        X = np.asarray(X, dtype=float)
+        residual = None if y is None else np.asarray(y, dtype=float) - self.predict(X)
+        terms = interaction_shapley(X, self.model.coef_, groups, weights, residual)
+        return attribution_frame(terms, feature_names, index)
 
 class MultiplicativeModel(SaviesaModel):
     """
@@ -120,64 +716,187 @@ class MultiplicativeModel(SaviesaModel):
     Assumes full non-compensability (Liebig's Law of the Minimum).
     """
     
-    def __init__(self, epsilon=1e-10):
+    def __init__(self, epsilon=1e-10, censoring=None, robust=None):
         """
         Initialize multiplicative model
         
         Args:
             epsilon: Small constant to avoid log(0)
+            censoring: Optional (lower, upper) bounds of F, either may be
+                None; the Tobit model is fitted on the log scale
+            robust: Optional robust loss ('huber' or 'tukey') fitted by
+                IRLS on the log scale
         """
         super().__init__()
         self.epsilon = epsilon
+        self.censoring = _check_censoring(censoring)
+        self.robust = _check_robust(robust)
+        self.simex_ = None
     
-    def fit(self, X, y):
+    def _linear_inputs(self, X, y):
+        """Log-transformed design and target"""
+        return (np.log(np.asarray(X, dtype=float) + self.epsilon),
+                np.log(np.asarray(y, dtype=float) + self.epsilon))
+    
+    def _log_bounds(self):
+        """Censoring bounds mapped to log space"""
+        if self.censoring is None:
+            return None
+        return tuple(None if b is None else np.log(b + self.epsilon)
+                     for b in self.censoring)
+    
+    @instrument
+    @_cached_fit
+    def fit(self, X, y, fixed_effects=None, clusters=None):
         """
         Fit multiplicative model using log-linear regression
         
         Args:
             X: Feature matrix (n_samples, n_features)
             y: Target variable (n_samples,)
+            fixed_effects: Optional categorical effects to absorb in log
+                space (array, list of arrays or DataFrame)
+            clusters: Cluster labels for standard errors (default: first
+                fixed effect)
         """
         # Log-transform inputs
-        log_X = np.log(X + self.epsilon)
-        log_y = np.log(y + self.epsilon)
+        with section('MultiplicativeModel.log_transform'):
+            log_X = np.log(X + self.epsilon)
+            log_y = np.log(y + self.epsilon)
         
         # Fit log-linear model
-        self.model = LinearRegression()
-        self.model.fit(log_X, log_y)
+        self._fit_linear(log_X, log_y, fixed_effects, clusters, bounds=self._log_bounds(),
+                         robust=self.robust)
+        self.simex_ = None
         self.is_fitted = True
         return self
     
-    def predict(self, X):
-        """Predict using multiplicative model"""
+    def _shares_features(self, features):
+        return (self.censoring is None and self.robust is None
+                and self.epsilon == features.epsilon)
+    
+    @_cached_fit
+    def _fit_features(self, features):
+        self._set_linear(*features.solve('log'))
+        self.simex_ = None
+        return self
+    
+    def _predict_features(self, features):
+        return np.exp(features.fitted('log', self.model.intercept_, self.model.coef_))
+    
+    def correct_measurement_error(self, X, y, measurement_sd, **kwargs):
+        """
+        Attach SIMEX-corrected elasticities for error-prone factor proxies
+        
+        After this call, get_elasticities returns the corrected values (the
+        OLS ones move to 'naive_elasticities'); predictions keep using the
+        naive fit, which is the right predictor from error-prone inputs.
+        
+        Args:
+            X: Feature matrix (n_samples, n_features), as used in fit
+            y: Target variable (n_samples,)
+            measurement_sd: Error standard deviation of log(X) per feature
+                (0 for error-free factors)
+            **kwargs: Options of simex_elasticities (lambdas, n_replicates,
+                extrapolation, seed, n_jobs)
+        """
+        from .simex import simex_elasticities
+        
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        if self.censored_ is not None or self.robust_ is not None or self.fixed_effects_ is not None:
+            raise ValueError("SIMEX correction is only available for the OLS fit")
+        self.simex_ = simex_elasticities(X, y, measurement_sd, epsilon=self.epsilon, **kwargs)
+        return self
+    
+    @instrument
+    def predict(self, X, fixed_effects=None):
+        """
+        Predict using multiplicative model
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            fixed_effects: Optional labels to add the absorbed effects
+                (unseen levels contribute 0)
+        """
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         
         # Log-transform inputs
-        log_X = np.log(X + self.epsilon)
+        with section('MultiplicativeModel.log_transform'):
+            log_X = np.log(X + self.epsilon)
         
         # Predict in log space
-        log_y_pred = self.model.predict(log_X)
+        log_y_pred = self._predict_linear(log_X, fixed_effects, bounds=self._log_bounds())
         
         # Transform back to original scale
         y_pred = np.exp(log_y_pred)
         
         return y_pred
     
+    def attribute(self, X, y=None, groups=None, weights=None, fixed_effects=None,
+                  feature_names=None, index=None):
+        """
+        Exact per-factor split of each row's log-performance gap to a reference
+        
+        β_k·(log X_ik − mean log X_k) over the reference (national, or the
+        row's group), for all rows at once; contributions sum to the gap in
+        log points (see attribution.py). Censoring bounds are not applied.
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+            y: Optional observed target, to add the residual's share
+            groups: Optional reference groups (e.g. académie labels)
+            weights: Optional row weights of the reference (e.g. enrolment)
+            fixed_effects: Optional labels, to add the absorbed effects' share
+            feature_names: Factor names for the columns
+            index: Optional row index (e.g. UAI codes)
+        
+        Returns:
+            pd.DataFrame: Per-factor contributions and gap (log F̂ − mean
+                log F̂ of the reference, or log F − mean log F with y)
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        log_X = np.log(np.asarray(X, dtype=float) + self.epsilon)
+        effects = None
+        if fixed_effects is not None:
+            if self.fixed_effects_ is None:
+                raise ValueError("Model was fitted without fixed effects")
+            effects = lookup_effects(fixed_effects, self.fixed_effects_['levels'],
+                                     self.fixed_effects_['effects'])
+        residual = None
+        if y is not None:
+            fitted = self.model.predict(log_X) + (0 if effects is None else effects)
+            residual = np.log(np.asarray(y, dtype=float) + self.epsilon) - fitted
+        terms = log_attribution(log_X, self.model.coef_, groups, weights, effects, residual)
+        return attribution_frame(terms, feature_names, index)
+    
     def get_elasticities(self):
         """
         Get elasticities (β coefficients)
         
         Returns:
-            dict: Intercept and elasticities
+            dict: Intercept and elasticities (SIMEX-corrected, with the naive
+                values alongside, after correct_measurement_error)
         """
         if not self.is_fitted:
             raise ValueError("Model must be fitted first")
+        if self.simex_ is not None:
+            return {
+                'intercept': self.simex_['intercept'],
+                'elasticities': self.simex_['elasticities'],
+                'std_errors': self.simex_['std_errors'],
+                'naive_intercept': self.model.intercept_,
+                'naive_elasticities': self.model.coef_
+            }
         return {
             'intercept': self.model.intercept_,
-            'elasticities': self.model.coef_
+            'elasticities': self.model.coef_,
+            **self._inference()
         }
 
+@instrument
 def identify_limiting_factor(factors, factor_names=None):
     """
     Identify limiting factor using Liebig's Law of the Minimum
@@ -211,6 +930,7 @@ def identify_limiting_factor(factors, factor_names=None):
         min_indices = np.argmin(factors, axis=1)
         return factor_names[min_indices]
 
+@instrument
 def compare_models(X, y, model_names=None):
     """
     Compare additive, interaction, and multiplicative models
@@ -235,10 +955,13 @@ def compare_models(X, y, model_names=None):
         MultiplicativeModel()
     ]
     
+    # Raw, interaction and log blocks are built once for all three models
+    features = FeatureSet(X, y)
+    
     results = []
     for model, name in zip(models, model_names):
-        model.fit(X, y)
-        y_pred = model.predict(X)
+        model.fit_features(features)
+        y_pred = model.predict_features(features)
         
         r2 = r2_score(y, y_pred)
         rmse = np.sqrt(mean_squared_error(y, y_pred))
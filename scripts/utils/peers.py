@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Peer Benchmarking
+Saviesa Framework
+
+This module provides a peer-search index: for each establishment, the most
+comparable establishments (similar O, L, M) that perform better.
+
+Establishments are points in log-factor space, log(X + ε), optionally
+standardized per factor and weighted (e.g. by elasticities), so distances
+compare relative rather than absolute gaps, as the multiplicative model
+does. A KD-tree (scipy cKDTree) answers k-nearest-neighbour queries for all
+establishments in one batched call; with filters (same académie, same
+secteur) one tree is built per group, lazily. When only better-performing
+peers are wanted, rows are queried for more candidates than k and only the
+rows still short of k peers are queried again, wider; the top performers,
+whose few better peers are all among the group's best, are compared with
+that small set directly instead.
+"""
+
+import numpy as np
+
+from .persistence import StateEncoder, decode_state, read_file, write_file
+
+SCALES = (None, 'std')
+
+class PeerIndex:
+    """
+    k-nearest comparable establishments in log-factor space
+
+    Example:
+        >>> index = PeerIndex(df[['O', 'L', 'M']].values, df['F'].values,
+        ...                   ids=df['UAI'].values,
+        ...                   groups=df[['academie', 'secteur']])
+        >>> peers = index.peer_frame(k=5, same=['academie'], better=True)
+    """
+
+    def __init__(self, X, y=None, ids=None, groups=None, epsilon=1e-10, scale='std',
+                 weights=None):
+        """
+        Build the index
+
+        Args:
+            X: Factor levels (n_samples, n_factors), positive
+            y: Optional performance F, needed for better=True queries
+            ids: Optional establishment identifiers (default: positions)
+            groups: Optional filter columns (DataFrame or dict name -> labels);
+                missing labels are treated as one more group
+            epsilon: Small constant to avoid log(0)
+            scale: 'std' to standardize each log factor, or None
+            weights: Optional per-factor weights applied after scaling
+        """
+        import pandas as pd
+
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale: {scale}")
+        X = np.asarray(X, dtype=float)
+        n, K = X.shape
+        log_X = np.log(X + epsilon)
+        factor_scale = log_X.std(axis=0) if scale == 'std' else np.ones(K)
+        factor_scale = np.where(factor_scale > 0, factor_scale, 1.0)
+        if weights is not None:
+            factor_scale = factor_scale / np.asarray(weights, dtype=float)
+
+        self.epsilon = epsilon
+        self.scale = scale
+        self.factor_scale = factor_scale
+        self.points = log_X / factor_scale
+        self.y = None if y is None else np.asarray(y, dtype=float)
+        self.ids = np.arange(n) if ids is None else np.asarray(ids)
+        if len(self.ids) != n:
+            raise ValueError("ids must have one entry per row")
+
+        self.codes = {}
+        self.levels = {}
+        columns = {} if groups is None else (
+            {name: groups[name].to_numpy() for name in groups.columns}
+            if hasattr(groups, 'columns') else dict(groups))
+        for name, labels in columns.items():
+            # Missing labels form their own group (a -1 code would collide)
+            codes, levels = pd.factorize(np.asarray(labels), use_na_sentinel=False)
+            if len(codes) != n:
+                raise ValueError(f"Group column {name} must have one entry per row")
+            self.codes[name] = codes
+            self.levels[name] = pd.Index(levels)
+        self._trees = {}
+
+    def _partition(self, same):
+        """Trees per combination of the `same` columns: list of (members, tree)"""
+        from scipy.spatial import cKDTree
+
+        key = tuple(same)
+        if key not in self._trees:
+            unknown = [name for name in same if name not in self.codes]
+            if unknown:
+                raise ValueError(f"Unknown group columns: {unknown}")
+            n = len(self.points)
+            if same:
+                combined = np.zeros(n, dtype=np.int64)
+                for name in same:
+                    combined = combined * len(self.levels[name]) + self.codes[name]
+                order = np.argsort(combined, kind='stable')
+                bounds = np.flatnonzero(np.diff(combined[order])) + 1
+                parts = np.split(order, bounds)
+            else:
+                parts = [np.arange(n)]
+            self._trees[key] = [(members, cKDTree(self.points[members])) for members in parts]
+        return self._trees[key]
+
+    def _tree_search(self, members, tree, rows, pending, n_candidates, k, better,
+                     max_distance, workers, distances, indices):
+        """Widening tree queries for rows[pending] until each has k peers"""
+        size = len(members)
+        while len(pending):
+            kq = min(n_candidates, size)
+            d, idx = tree.query(self.points[members[rows[pending]]], k=kq,
+                                distance_upper_bound=max_distance, workers=workers)
+            d, idx = d.reshape(len(pending), kq), idx.reshape(len(pending), kq)
+            found = idx < size
+            peer = members[np.where(found, idx, 0)]
+            own = members[rows[pending]]
+            valid = found & (peer != own[:, None])
+            if better:
+                valid &= self.y[peer] > self.y[own][:, None]
+
+            # Done: enough peers, group exhausted, or the search hit max_distance
+            done = (valid.sum(axis=1) >= k) | (kq == size) | ~found[:, -1]
+            self._keep_first(pending[done], valid[done], d[done], peer[done], k,
+                             distances, indices)
+            pending = pending[~done]
+            n_candidates *= 4
+
+    @staticmethod
+    def _keep_first(targets, valid, d, peer, k, distances, indices):
+        """Write the first k valid candidates (in distance order) of each row"""
+        first = np.argsort(~valid, axis=1, kind='stable')[:, :k]
+        keep = np.take_along_axis(valid, first, axis=1)
+        width = first.shape[1]
+        distances[targets, :width] = np.where(keep, np.take_along_axis(d, first, axis=1), np.inf)
+        indices[targets, :width] = np.where(keep, np.take_along_axis(peer, first, axis=1), -1)
+
+    def _query_group(self, members, tree, rows, k, better, max_distance, workers):
+        """Peers of rows (positions in members) within one group"""
+        size = len(members)
+        distances = np.full((len(rows), k), np.inf)
+        indices = np.full((len(rows), k), -1, dtype=np.int64)
+        if not better:
+            # Self is always among the candidates
+            self._tree_search(members, tree, rows, np.arange(len(rows)), k + 1, k, False,
+                              max_distance, workers, distances, indices)
+            return distances, indices
+
+        y = self.y[members]
+        n_better = size - np.searchsorted(np.sort(y), y[rows], side='right')
+
+        # Rows with few better peers: those peers are all among the top
+        # `limit` performers of the group, so compare against that set directly
+        limit = 16 * k
+        few = np.flatnonzero(n_better <= limit)
+        if len(few):
+            top = np.argsort(y, kind='stable')[-limit:]
+            diff = self.points[members[rows[few]]][:, None, :] - self.points[members[top]][None]
+            d = np.sqrt(np.sum(diff**2, axis=-1))
+            valid = (y[top][None] > y[rows[few]][:, None]) & (d <= max_distance)
+            order = np.argsort(np.where(valid, d, np.inf), axis=1, kind='stable')
+            self._keep_first(few, np.take_along_axis(valid, order, axis=1),
+                             np.take_along_axis(d, order, axis=1), members[top][order], k,
+                             distances, indices)
+
+        # Others: twice k candidates, widened for rows still short of k
+        many = np.flatnonzero(n_better > limit)
+        self._tree_search(members, tree, rows, many, 2 * (k + 1), k, True,
+                          max_distance, workers, distances, indices)
+        return distances, indices
+
+    def query(self, rows=None, k=5, same=None, better=False, max_distance=np.inf, workers=-1):
+        """
+        k nearest peers of establishments, in one batched query per group
+
+        Args:
+            rows: Positions to query (default: all)
+            k: Peers per establishment
+            same: Group columns peers must share (e.g. ['academie'])
+            better: Keep only peers with higher F
+            max_distance: Ignore peers farther than this
+            workers: Threads used by the tree queries (-1: all CPUs)
+
+        Returns:
+            tuple: distances (n_rows, k) and peer positions (n_rows, k),
+                padded with inf and -1 when fewer than k peers qualify
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if better and self.y is None:
+            raise ValueError("better=True needs the performance y")
+        same = [same] if isinstance(same, str) else list(same or [])
+        n = len(self.points)
+        rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+
+        # Position of every row inside its group, to route queries
+        partition = self._partition(same)
+        group_of = np.empty(n, dtype=np.int64)
+        local = np.empty(n, dtype=np.int64)
+        for g, (members, _) in enumerate(partition):
+            group_of[members] = g
+            local[members] = np.arange(len(members))
+
+        distances = np.full((len(rows), k), np.inf)
+        indices = np.full((len(rows), k), -1, dtype=np.int64)
+        order = np.argsort(group_of[rows], kind='stable')
+        bounds = np.flatnonzero(np.diff(group_of[rows][order])) + 1
+        for chunk in np.split(order, bounds):
+            if len(chunk) == 0:
+                continue
+            members, tree = partition[group_of[rows[chunk[0]]]]
+            d, idx = self._query_group(members, tree, local[rows[chunk]], k, better,
+                                       max_distance, workers)
+            distances[chunk] = d
+            indices[chunk] = idx
+        return distances, indices
+
+    def peer_frame(self, rows=None, k=5, same=None, better=False, max_distance=np.inf,
+                   workers=-1):
+        """
+        Peer lists as a long table, one row per (establishment, peer)
+
+        Args:
+            Same as query
+
+        Returns:
+            pd.DataFrame: id, rank, peer_id, distance and, when y is known,
+                F, peer_F and gap (peer_F - F)
+        """
+        import pandas as pd
+
+        distances, indices = self.query(rows, k, same, better, max_distance, workers)
+        rows = np.arange(len(self.points)) if rows is None else np.asarray(rows)
+        source, rank = np.nonzero(indices >= 0)
+        peer = indices[source, rank]
+        frame = pd.DataFrame({
+            'id': self.ids[rows[source]],
+            'rank': rank + 1,
+            'peer_id': self.ids[peer],
+            'distance': distances[source, rank]
+        })
+        if self.y is not None:
+            frame['F'] = self.y[rows[source]]
+            frame['peer_F'] = self.y[peer]
+            frame['gap'] = frame['peer_F'] - frame['F']
+        return frame
+
+    def save(self, path):
+        """
+        Save the index data (the trees are rebuilt on demand after load)
+
+        Args:
+            path: Output file
+
+        Returns:
+            int: File size in bytes
+        """
+        encoder = StateEncoder()
+        ids = self.ids if self.ids.dtype.kind in 'biufUS' else self.ids.astype(str)
+        state = encoder.encode({
+            'epsilon': self.epsilon,
+            'scale': self.scale,
+            'factor_scale': self.factor_scale,
+            'points': self.points,
+            'y': self.y,
+            'ids': ids,
+            'codes': self.codes,
+            'levels': self.levels
+        })
+        return write_file(path, {'kind': 'peer_index', 'metadata': {}, 'state': state},
+                      encoder.arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load an index saved with save
+
+        Args:
+            path: Index file
+            mmap: Map arrays from the file (read-only) instead of reading it
+
+        Returns:
+            PeerIndex
+        """
+        header, arrays = read_file(path, use_mmap=mmap)
+        if header.get('kind') != 'peer_index':
+            raise ValueError(f"{path} does not contain a peer index")
+        index = cls.__new__(cls)
+        index.__dict__.update(decode_state(header['state'], arrays))
+        index._trees = {}
+        return index
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Model Persistence
+Saviesa Framework
+
+This module provides a compact, versioned binary format for fitted models
+and grouped-model tables, without pickle.
+
+Layout of a file:
+
+    b'SAVIESA\\0' | format version (uint32) | header length (uint32)
+    | JSON header | raw arrays, each aligned to 64 bytes
+
+The header holds the model class, its parameters and fit statistics
+(scalars, labels) with placeholders for arrays, plus metadata (feature
+names, data fingerprint). Arrays, including fixed-width string arrays, are
+stored as raw little-endian buffers, so loading parses a few hundred bytes
+of JSON and maps the rest: arrays are read-only views on a memory map and
+nothing is copied until used. Only plain data types are decoded, so loading
+a file cannot run code.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b'SAVIESA\x00'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct('<II')
+
+def data_fingerprint(*arrays):
+    """
+    Fast content hash of arrays (dtype, shape and bytes)
+
+    Args:
+        *arrays: Array-likes (None entries are allowed)
+
+    Returns:
+        str: 32-character hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in arrays:
+        if value is None:
+            digest.update(b'none;')
+            continue
+        a = np.asarray(value)
+        if a.dtype == object:
+            a = a.astype(str)
+        a = np.ascontiguousarray(a)
+        digest.update(f"{a.dtype.str}{a.shape};".encode())
+        digest.update(memoryview(a).cast('B'))
+    return digest.hexdigest()
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+class StateEncoder:
+    """
+    Map Python/numpy/pandas values to JSON plus a list of arrays
+
+    Example:
+        >>> encoder = StateEncoder()
+        >>> state = encoder.encode({'coef': np.ones(3)})
+        >>> write_file(path, {'kind': 'custom', 'state': state}, encoder.arrays)
+    """
+
+    def __init__(self):
+        self.arrays = []
+
+    def encode(self, value):
+        import pandas as pd
+        from sklearn.linear_model import LinearRegression
+
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, (int, float, np.integer, np.floating, np.bool_)):
+            return value.item() if isinstance(value, np.generic) else value
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind not in 'biufcUS':
+                raise ValueError(f"Cannot save arrays of dtype {value.dtype}")
+            self.arrays.append(np.ascontiguousarray(value))
+            return {'__array__': len(self.arrays) - 1}
+        if isinstance(value, LinearRegression):
+            return {'__linear__': [self.encode(value.coef_), float(value.intercept_)]}
+        if isinstance(value, pd.MultiIndex):
+            return {'__multiindex__': [list(t) for t in value.tolist()],
+                    'names': list(value.names)}
+        if isinstance(value, pd.RangeIndex):
+            return {'__range__': [value.start, value.stop, value.step], 'name': value.name}
+        if isinstance(value, pd.Index):
+            return {'__index__': value.tolist(), 'name': value.name}
+        if isinstance(value, tuple):
+            return {'__tuple__': [self.encode(v) for v in value]}
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, dict):
+            if not all(isinstance(k, str) and not k.startswith('__') for k in value):
+                raise ValueError("Only dicts with plain string keys can be saved")
+            return {k: self.encode(v) for k, v in value.items()}
+        raise ValueError(f"Cannot save values of type {type(value).__name__}")
+
+def decode_state(value, arrays):
+    """
+    Rebuild values encoded by StateEncoder
+
+    Args:
+        value: Encoded JSON value
+        arrays: Arrays referenced by the encoding (e.g. from read_file)
+
+    Returns:
+        The decoded value
+    """
+    import pandas as pd
+
+    if isinstance(value, list):
+        return [decode_state(v, arrays) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if '__array__' in value:
+        return arrays[value['__array__']]
+    if '__linear__' in value:
+        from .models import _linear_regression
+        coef, intercept = value['__linear__']
+        return _linear_regression(decode_state(coef, arrays), intercept)
+    if '__multiindex__' in value:
+        return pd.MultiIndex.from_tuples([tuple(t) for t in value['__multiindex__']],
+                                         names=value['names'])
+    if '__range__' in value:
+        return pd.RangeIndex(*value['__range__'], name=value['name'])
+    if '__index__' in value:
+        return pd.Index(value['__index__'], name=value['name'])
+    if '__tuple__' in value:
+        return tuple(decode_state(v, arrays) for v in value['__tuple__'])
+    return {k: decode_state(v, arrays) for k, v in value.items()}
+
+def _file_mode(path):
+    """Permissions for a new file at path: the replaced file's, else 0o666 & ~umask"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_file(path, header, arrays):
+    """
+    Write a header and arrays in the Saviesa file format, atomically
+
+    Args:
+        path: Output file
+        header: JSON-serializable header (e.g. kind, metadata, state)
+        arrays: Arrays referenced by the header
+
+    Returns:
+        int: File size in bytes
+    """
+    layout = []
+    offset = 0
+    for a in arrays:
+        offset = _align(offset)
+        layout.append({'dtype': a.dtype.newbyteorder('<').str, 'shape': list(a.shape),
+                       'offset': offset})
+        offset += a.nbytes
+    header = dict(header, arrays=layout)
+    encoded = json.dumps(header, separators=(',', ':')).encode()
+
+    # Write next to the target and rename: the target may be memory-mapped by
+    # a loaded model (truncating it in place would invalidate those arrays)
+    start = _align(len(MAGIC) + _PREAMBLE.size + len(encoded))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, partial = tempfile.mkstemp(dir=directory, prefix='.', suffix='.partial')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + _PREAMBLE.pack(FORMAT_VERSION, len(encoded)) + encoded)
+            for a, entry in zip(arrays, layout):
+                f.write(b'\x00' * (start + entry['offset'] - f.tell()))
+                f.write(a.astype(entry['dtype'], copy=False).tobytes())
+            size = f.tell()
+        # mkstemp creates the file as 0600; give it the usual permissions
+        os.chmod(partial, _file_mode(path))
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return size
+
+def read_file(path, use_mmap=True):
+    """
+    Read a file written by write_file
+
+    Args:
+        path: Input file
+        use_mmap: Return arrays as views on a read-only memory map
+
+    Returns:
+        tuple: header (dict) and list of arrays
+    """
+    with open(path, 'rb') as f:
+        preamble = f.read(len(MAGIC) + _PREAMBLE.size)
+        if len(preamble) < len(MAGIC) + _PREAMBLE.size or preamble[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a Saviesa model file: {path}")
+        version, length = _PREAMBLE.unpack(preamble[len(MAGIC):])
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported format version {version} (max {FORMAT_VERSION})")
+        header = json.loads(f.read(length))
+        start = _align(len(MAGIC) + _PREAMBLE.size + length)
+        if not header['arrays']:
+            return header, []
+        if use_mmap:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            f.seek(0)
+            buffer = f.read()
+
+    arrays = []
+    for entry in header['arrays']:
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        count = int(np.prod(shape))
+        a = np.frombuffer(buffer, dtype=dtype, count=count, offset=start + entry['offset'])
+        arrays.append(a.reshape(shape))
+    return header, arrays
+
+def _model_classes():
+    """Saviesa model classes by name (the only classes load can create)"""
+    from .models import SaviesaModel
+    from . import hierarchical, frontier, regularized  # noqa: F401 (registers subclasses)
+
+    classes, stack = {}, [SaviesaModel]
+    while stack:
+        cls = stack.pop()
+        classes[cls.__name__] = cls
+        stack.extend(cls.__subclasses__())
+    return classes
+
+def model_header(model, metadata=None):
+    """
+    Header and arrays describing a fitted model
+
+    Args:
+        model: Fitted Saviesa model
+        metadata: Optional JSON-serializable metadata
+
+    Returns:
+        tuple: header (class, encoded state, metadata) and list of arrays
+    """
+    encoder = StateEncoder()
+    state = encoder.encode({k: v for k, v in vars(model).items() if k != 'metadata_'})
+    header = {'kind': 'model', 'class': type(model).__name__, 'metadata': metadata or {},
+              'state': state}
+    return header, encoder.arrays
+
+def save_model(model, path, feature_names=None, X=None, y=None, metadata=None):
+    """
+    Save a fitted model
+
+    Args:
+        model: Fitted Saviesa model
+        path: Output file
+        feature_names: Optional factor names stored with the model
+        X: Optional training features, fingerprinted (not stored)
+        y: Optional training target, fingerprinted (not stored)
+        metadata: Optional extra JSON-serializable metadata
+
+    Returns:
+        int: File size in bytes
+    """
+    if not model.is_fitted:
+        raise ValueError("Model must be fitted first")
+    info = dict(metadata or {})
+    info['feature_names'] = None if feature_names is None else list(feature_names)
+    if X is not None or y is not None:
+        info['fingerprint'] = data_fingerprint(X, y)
+        info['n_samples'] = len(X if X is not None else y)
+    header, arrays = model_header(model, info)
+    return write_file(path, header, arrays)
+
+def load_model(path, mmap=True):
+    """
+    Load a model saved by save_model
+
+    Args:
+        path: Model file
+        mmap: Map arrays from the file (read-only) instead of reading it
+
+    Returns:
+        SaviesaModel: The fitted model, with the saved metadata in metadata_
+    """
+    header, arrays = read_file(path, use_mmap=mmap)
+    if header.get('kind') != 'model':
+        raise ValueError(f"{path} does not contain a model")
+    classes = _model_classes()
+    if header['class'] not in classes:
+        raise ValueError(f"Unknown model class: {header['class']}")
+
+    model = classes[header['class']].__new__(classes[header['class']])
+    model.__dict__.update(decode_state(header['state'], arrays))
+    model.metadata_ = header['metadata']
+    return model
+
+def _label_values(column):
+    """Fixed-width string array when every label is a string, else a list"""
+    values = column.to_numpy()
+    if all(isinstance(v, str) for v in values):
+        return values.astype(str)
+    return values.tolist()
+
+def save_table(frame, path, metadata=None):
+    """
+    Save a grouped-model table (e.g. per-group elasticities)
+
+    Numeric columns are stored together as one float (n_columns, n_rows)
+    block; other columns and the index are stored as labels.
+
+    Args:
+        frame: pd.DataFrame, one row per group
+        path: Output file
+        metadata: Optional extra JSON-serializable metadata
+
+    Returns:
+        int: File size in bytes
+    """
+    numeric = [c for c in frame.columns if frame[c].dtype.kind in 'biuf']
+    labels = [c for c in frame.columns if c not in numeric]
+    block = np.vstack([frame[c].to_numpy(dtype=float) for c in numeric]) if numeric \
+        else np.empty((0, len(frame)))
+    encoder = StateEncoder()
+    state = {
+        'numeric': [str(c) for c in numeric],
+        'dtypes': {str(c): frame[c].dtype.str for c in numeric if frame[c].dtype.kind != 'f'},
+        'block': encoder.encode(block),
+        'labels': {str(c): encoder.encode(_label_values(frame[c])) for c in labels},
+        'columns': [str(c) for c in frame.columns],
+        'index': encoder.encode(frame.index)
+    }
+    header = {'kind': 'table', 'metadata': dict(metadata or {}), 'state': state}
+    return write_file(path, header, encoder.arrays)
+
+def load_table(path, mmap=True, as_frame=True):
+    """
+    Load a table saved by save_table
+
+    Args:
+        path: Table file
+        mmap: Map the numeric block from the file instead of reading it
+        as_frame: Return a DataFrame; otherwise a dict with the numeric
+            block (n_rows, n_columns), its column names, labels and index
+
+    Returns:
+        pd.DataFrame or dict
+    """
+    import pandas as pd
+
+    header, arrays = read_file(path, use_mmap=mmap)
+    if header.get('kind') != 'table':
+        raise ValueError(f"{path} does not contain a table")
+    state = decode_state(header['state'], arrays)
+    values = state['block'].T
+    if not as_frame:
+        return {'values': values, 'columns': state['numeric'], 'labels': state['labels'],
+                'index': state['index'], 'metadata': header['metadata']}
+
+    frame = pd.DataFrame(values, columns=state['numeric'], index=state['index'], copy=False)
+    frame = frame.astype(state['dtypes']) if state['dtypes'] else frame
+    for name, column in state['labels'].items():
+        frame[name] = column
+    return frame[state['columns']]
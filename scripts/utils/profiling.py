@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profiling Hooks
+Saviesa Framework
+
+This module provides opt-in timing instrumentation for the hot paths
+(model fit/predict, metrics, data loaders, plotting).
+
+Instrumented functions record call counts, wall and CPU time, peak bytes
+allocated and argument array shapes, but only while a Profiler is active.
+When profiling is off, an instrumented call costs one global lookup.
+
+Usage:
+    >>> from utils.profiling import Profiler
+    >>> with Profiler(output='trace.json', trace_format='chrome'):
+    ...     run_validation()
+
+Or, for a whole script run, set ``SAVIESA_PROFILE=trace.json`` (and
+optionally ``SAVIESA_PROFILE_FORMAT=chrome``) in the environment.
+"""
+
+import atexit
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Currently active profiler (None when profiling is disabled)
+_ACTIVE = None
+
+MAX_SHAPES_PER_FUNCTION = 10
+
+# Most recent trace events kept by a 'chrome' profiler
+MAX_EVENTS = 1_000_000
+
+def _shapes(args, kwargs):
+    """Shapes of array-like arguments, as a hashable signature"""
+    shapes = []
+    for value in list(args) + list(kwargs.values()):
+        shape = getattr(value, 'shape', None)
+        if shape is not None:
+            shapes.append(tuple(shape))
+    return tuple(shapes)
+
+class Profiler:
+    """
+    Collector for instrumented calls
+
+    Args:
+        output: Optional path written on exit
+        trace_format: 'json' (aggregated summary) or 'chrome' (trace events
+            viewable in chrome://tracing or Perfetto)
+        track_memory: Record peak bytes allocated per call with tracemalloc
+        max_events: Trace events kept in 'chrome' format (the most recent);
+            'json' profilers only aggregate and keep no events
+    """
+
+    def __init__(self, output=None, trace_format='json', track_memory=True,
+                 max_events=MAX_EVENTS):
+        if trace_format not in ('json', 'chrome'):
+            raise ValueError(f"Unknown trace format: {trace_format}")
+        self.output = output
+        self.trace_format = trace_format
+        self.track_memory = track_memory
+        self.stats = {}
+        self.events = collections.deque(maxlen=max_events)
+        self.dropped_events = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._previous = None
+        self._t0 = None
+
+    def start(self):
+        """Activate this profiler"""
+        global _ACTIVE
+        self._previous = _ACTIVE
+        self._t0 = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _ACTIVE = self
+        return self
+
+    def stop(self):
+        """Deactivate this profiler and write the output file if set"""
+        global _ACTIVE
+        _ACTIVE = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self.output:
+            self.save(self.output)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    @property
+    def _stack(self):
+        """Memory frames of the calls in progress on the current thread"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _begin(self):
+        """Start measuring one call; returns a token for _end"""
+        frame = None
+        if self.track_memory and tracemalloc.is_tracing():
+            stack = self._stack
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Keep the enclosing call's peak before resetting it
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            stack.append(frame)
+        return time.perf_counter(), time.process_time(), frame
+
+    def _end(self, name, token, shapes=()):
+        """Finish measuring the call started by _begin"""
+        wall0, cpu0, frame = token
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        allocated = 0
+        if frame is not None:
+            stack = self._stack
+            stack.pop()
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            allocated = peak - frame[0]
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+        self._record(name, wall0, wall, cpu, allocated, shapes)
+
+    def call(self, name, func, args, kwargs):
+        """Run func under measurement and record it as name"""
+        token = self._begin()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._end(name, token, _shapes(args, kwargs))
+
+    def _record(self, name, start, wall, cpu, allocated, shapes):
+        """Aggregate one call"""
+        with self._lock:
+            entry = self.stats.setdefault(name, {
+                'calls': 0,
+                'wall_s': 0.0,
+                'cpu_s': 0.0,
+                'max_wall_s': 0.0,
+                'bytes_allocated': 0,
+                'max_bytes_allocated': 0,
+                'shapes': []
+            })
+            entry['calls'] += 1
+            entry['wall_s'] += wall
+            entry['cpu_s'] += cpu
+            entry['max_wall_s'] = max(entry['max_wall_s'], wall)
+            entry['bytes_allocated'] += allocated
+            entry['max_bytes_allocated'] = max(entry['max_bytes_allocated'], allocated)
+            if shapes and shapes not in entry['shapes'] \
+                    and len(entry['shapes']) < MAX_SHAPES_PER_FUNCTION:
+                entry['shapes'].append(shapes)
+
+            if self.trace_format != 'chrome':
+                return
+            if len(self.events) == self.events.maxlen:
+                self.dropped_events += 1
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._t0) * 1e6,
+                'dur': wall * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': {'cpu_ms': cpu * 1e3, 'bytes': allocated,
+                         'shapes': [list(s) for s in shapes]}
+            })
+
+    def summary(self):
+        """
+        Aggregated statistics sorted by total wall time
+
+        Returns:
+            pd.DataFrame: One row per instrumented function
+        """
+        import pandas as pd
+
+        rows = [{'function': name, **{k: v for k, v in entry.items() if k != 'shapes'}}
+                for name, entry in self.stats.items()]
+        df = pd.DataFrame(rows)
+        if len(df):
+            df = df.sort_values('wall_s', ascending=False).reset_index(drop=True)
+        return df
+
+    def save(self, path, trace_format=None):
+        """
+        Write the profile to disk
+
+        Args:
+            path: Output file path
+            trace_format: 'json' or 'chrome' (default: the profiler's format;
+                a 'chrome' file from a 'json' profiler has no events)
+        """
+        trace_format = trace_format or self.trace_format
+        if trace_format == 'chrome':
+            payload = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': self.dropped_events}}
+        else:
+            payload = {name: {**entry, 'shapes': [[list(s) for s in sig] for sig in entry['shapes']]}
+                       for name, entry in self.stats.items()}
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+
+def instrument(func=None, name=None):
+    """
+    Decorator recording calls of func while a Profiler is active
+
+    Args:
+        func: Function to wrap
+        name: Record name (default: the function's qualified name)
+
+    Example:
+        >>> @instrument
+        ... def load_data(path):
+        ...     return pd.read_csv(path)
+    """
+    if func is None:
+        return functools.partial(instrument, name=name)
+
+    label = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _ACTIVE
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.call(label, func, args, kwargs)
+
+    return wrapper
+
+class section:
+    """
+    Time a code block as a named entry while a Profiler is active
+
+    Example:
+        >>> with section('log_transform'):
+        ...     log_X = np.log(X + epsilon)
+    """
+
+    __slots__ = ('name', '_profiler', '_token')
+
+    def __init__(self, name):
+        self.name = name
+        self._profiler = None
+
+    def __enter__(self):
+        profiler = _ACTIVE
+        if profiler is not None:
+            self._profiler = profiler
+            self._token = profiler._begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler._end(self.name, self._token)
+            self._profiler = None
+        return False
+
+def is_enabled():
+    """Whether a Profiler is currently active"""
+    return _ACTIVE is not None
+
+def _enable_from_env():
+    """Start a process-wide profiler when SAVIESA_PROFILE is set"""
+    path = os.environ.get('SAVIESA_PROFILE')
+    if not path or _ACTIVE is not None:
+        return
+    profiler = Profiler(output=path,
+                        trace_format=os.environ.get('SAVIESA_PROFILE_FORMAT', 'json'))
+    profiler.start()
+    atexit.register(profiler.stop)
+
+_enable_from_env()
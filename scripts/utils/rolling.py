@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Time-Varying Elasticities
+Saviesa Framework
+
+This module provides rolling- and expanding-window estimates of the
+multiplicative model, log(F_t) = β₀,t + Σ βₖ,t·log(Xₖ,t), over exam sessions
+or monthly panels.
+
+Windows advance by whole periods, so the data are reduced once to per-period
+Gram blocks (ZᵀZ, Zᵀy, yᵀy). A window's normal equations are the difference
+of two prefix sums, i.e. the block of the entering period is added and the
+block of the leaving period is removed, so each step costs O(p²) regardless
+of how many rows the window holds. ``RollingOLS`` offers the same update and
+downdate one row at a time on a Cholesky factor, for streaming use.
+"""
+
+import numpy as np
+
+from .linalg import solve_batched
+
+def _period_blocks(Z, log_y, codes, n_periods):
+    """Per-period ZᵀZ, Zᵀy and yᵀy"""
+    q = Z.shape[1]
+    ZZ = np.empty((n_periods, q, q))
+    for k in range(q):
+        for l in range(k, q):
+            ZZ[:, k, l] = ZZ[:, l, k] = np.bincount(codes, weights=Z[:, k] * Z[:, l],
+                                                    minlength=n_periods)
+    Zy = np.empty((n_periods, q))
+    for k in range(q):
+        Zy[:, k] = np.bincount(codes, weights=Z[:, k] * log_y, minlength=n_periods)
+    yy = np.bincount(codes, weights=log_y**2, minlength=n_periods)
+    return ZZ, Zy, yy
+
+def rolling_elasticities(X, y, periods, window=None, epsilon=1e-10,
+                         feature_names=None, min_obs=None):
+    """
+    Estimate elasticities and R² over rolling or expanding windows
+
+    Args:
+        X: Feature matrix (n_samples, n_features)
+        y: Target variable (n_samples,)
+        periods: Sortable period label per sample (e.g. Session, month)
+        window: Number of periods per window (None for expanding windows)
+        epsilon: Small constant to avoid log(0)
+        feature_names: Names used for the elasticity columns
+        min_obs: Minimum rows per window (default: n_features + 2)
+
+    Returns:
+        pd.DataFrame: One row per window end period with columns n,
+            intercept, elasticity_<name>..., r2_log (R² in log space)
+
+    Example:
+        >>> ts = rolling_elasticities(df[['L', 'M']].values, df['F'].values,
+        ...                           df['Session'].values, window=2,
+        ...                           feature_names=['L', 'M'])
+    """
+    import pandas as pd
+
+    log_X = np.log(np.asarray(X, dtype=float) + epsilon)
+    log_y = np.log(np.asarray(y, dtype=float) + epsilon)
+    n, p = log_X.shape
+    if feature_names is None:
+        feature_names = [f'X{k+1}' for k in range(p)]
+    feature_names = list(feature_names)
+    min_obs = min_obs or p + 2
+
+    labels, codes = np.unique(np.asarray(periods), return_inverse=True)
+    T = len(labels)
+
+    # Center on global means for numerical stability of the prefix differences
+    x_shift = log_X.mean(axis=0)
+    y_shift = log_y.mean()
+    Z = np.column_stack([np.ones(n), log_X - x_shift])
+    ZZ, Zy, yy = _period_blocks(Z, log_y - y_shift, codes, T)
+
+    # Prefix sums: window (s, t] statistics are cum[t] - cum[s]
+    cum_ZZ = np.concatenate([np.zeros((1, p + 1, p + 1)), np.cumsum(ZZ, axis=0)])
+    cum_Zy = np.concatenate([np.zeros((1, p + 1)), np.cumsum(Zy, axis=0)])
+    cum_yy = np.concatenate([[0.0], np.cumsum(yy)])
+
+    ends = np.arange(1, T + 1)
+    starts = np.zeros(T, dtype=int) if window is None else np.maximum(ends - window, 0)
+    W_ZZ = cum_ZZ[ends] - cum_ZZ[starts]
+    W_Zy = cum_Zy[ends] - cum_Zy[starts]
+    W_yy = cum_yy[ends] - cum_yy[starts]
+    W_n = W_ZZ[:, 0, 0]
+
+    valid = W_n >= min_obs
+    beta = np.full((T, p + 1), np.nan)
+    if valid.any():
+        beta[valid] = solve_batched(W_ZZ[valid], W_Zy[valid])
+
+    rss = (W_yy - 2 * np.einsum('ti,ti->t', beta, W_Zy)
+           + np.einsum('ti,tij,tj->t', beta, W_ZZ, beta))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tss = W_yy - W_Zy[:, 0]**2 / W_n
+        r2 = 1 - rss / tss
+
+    intercept = beta[:, 0] + y_shift - beta[:, 1:] @ x_shift
+    result = pd.DataFrame({'period': labels, 'n': W_n.astype(int), 'intercept': intercept})
+    for k, name in enumerate(feature_names):
+        result[f'elasticity_{name}'] = beta[:, k + 1]
+    result['r2_log'] = np.where(valid, r2, np.nan)
+    return result.set_index('period')
+
+def _cholesky_update(R, x, sign):
+    """
+    In-place rank-one update (sign=+1) or downdate (sign=-1) of an upper
+    Cholesky factor R so that RᵀR becomes RᵀR ± xxᵀ
+    """
+    x = x.copy()
+    for k in range(len(x)):
+        r2 = R[k, k]**2 + sign * x[k]**2
+        if r2 <= 0:
+            raise ValueError("Downdate would make the Gram matrix singular")
+        r = np.sqrt(r2)
+        c, s = r / R[k, k], x[k] / R[k, k]
+        R[k, k] = r
+        if k + 1 < len(x):
+            R[k, k+1:] = (R[k, k+1:] + sign * s * x[k+1:]) / c
+            x[k+1:] = c * x[k+1:] - s * R[k, k+1:]
+
+class RollingOLS:
+    """
+    Streaming log-linear OLS with O(p²) row updates and downdates
+
+    Keeps the upper Cholesky factor of the (ridge-seeded) Gram matrix of
+    z = (1, log X) together with Zᵀy, so rows can enter and leave a window
+    without refitting.
+
+    Example:
+        >>> ols = RollingOLS(n_features=2)
+        >>> for x, f in rows_entering:
+        ...     ols.add(x, f)
+        >>> for x, f in rows_leaving:
+        ...     ols.remove(x, f)
+        >>> ols.get_elasticities()
+    """
+
+    def __init__(self, n_features, epsilon=1e-10, ridge=1e-8):
+        """
+        Initialize streaming estimator
+
+        Args:
+            n_features: Number of factors
+            epsilon: Small constant to avoid log(0)
+            ridge: Diagonal seed keeping the factor defined while empty
+        """
+        q = n_features + 1
+        self.epsilon = epsilon
+        self.R = np.eye(q) * np.sqrt(ridge)
+        self.Zy = np.zeros(q)
+        self.yy = 0.0
+        self.sum_y = 0.0
+        self.n = 0
+
+    def _row(self, x, y):
+        """Log-transformed design row and target"""
+        z = np.concatenate([[1.0], np.log(np.asarray(x, dtype=float) + self.epsilon)])
+        return z, np.log(y + self.epsilon)
+
+    def add(self, x, y):
+        """Add one observation to the window"""
+        z, ly = self._row(x, y)
+        _cholesky_update(self.R, z, +1)
+        self.Zy += z * ly
+        self.yy += ly**2
+        self.sum_y += ly
+        self.n += 1
+        return self
+
+    def remove(self, x, y):
+        """Remove one observation from the window"""
+        z, ly = self._row(x, y)
+        _cholesky_update(self.R, z, -1)
+        self.Zy -= z * ly
+        self.yy -= ly**2
+        self.sum_y -= ly
+        self.n -= 1
+        return self
+
+    def coef(self):
+        """Current coefficients (intercept first) via two triangular solves"""
+        from scipy.linalg import solve_triangular
+        w = solve_triangular(self.R, self.Zy, trans='T')
+        return solve_triangular(self.R, w)
+
+    def get_elasticities(self):
+        """
+        Get current intercept, elasticities and log-space R²
+
+        Returns:
+            dict: Intercept, elasticities and r2_log
+        """
+        if self.n <= len(self.Zy):
+            raise ValueError("Window holds too few observations")
+        beta = self.coef()
+        rss = self.yy - 2 * beta @ self.Zy + np.sum((self.R @ beta)**2)
+        tss = self.yy - self.sum_y**2 / self.n
+        return {
+            'intercept': beta[0],
+            'elasticities': beta[1:],
+            'r2_log': 1 - rss / tss
+        }
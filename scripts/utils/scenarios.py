@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+What-If Scenarios
+Saviesa Framework
+
+This module provides a scenario engine on top of a fitted multiplicative
+model, for interactive exploration ("raise L by 10% in Aude").
+
+In log space the prediction is a sum of per-factor contributions,
+
+    log F_i = β₀ (+ fixed effects) + Σ_k β_k·log X_ik
+
+so the engine stores the contributions once. Changing some factors on some
+rows only touches those entries: a relative change of c on factor k adds
+β_k·log(1 + c) to log F_i, at O(changed rows) cost and with no refit, log
+transform of the full table or call to predict. Many scenarios are evaluated
+together as one array operation; when a scenario shifts every selected row
+by the same amount, aggregates reduce to exp(shift) × Σ F_i.
+"""
+
+import numpy as np
+
+from .models import MultiplicativeModel, identify_limiting_factor
+from .fixed_effects import lookup_effects
+
+AGGREGATES = (None, 'sum', 'mean')
+
+class ScenarioEngine:
+    """
+    Precomputed response surface of a fitted MultiplicativeModel
+
+    Predictions use the fitted (naive) coefficients, exactly as
+    MultiplicativeModel.predict does, including absorbed fixed effects and
+    censoring bounds.
+
+    Example:
+        >>> engine = ScenarioEngine(model, df[['O', 'L', 'M']].values,
+        ...                         factor_names=['O', 'L', 'M'])
+        >>> engine.what_if({'L': 0.10}, rows=df['Departement'] == 'Aude')
+        >>> totals = engine.evaluate(np.array([[0, 0.1, 0], [0, 0, 0.1]]),
+        ...                          aggregate='sum')
+    """
+
+    def __init__(self, model, X, factor_names=None, index=None, fixed_effects=None,
+                 weights=None):
+        """
+        Initialize engine from current factor levels
+
+        Args:
+            model: Fitted MultiplicativeModel
+            X: Current factor levels (n_samples, n_features)
+            factor_names: Factor names (default: ['F1', 'F2', ...])
+            index: Optional row labels (e.g. commune codes) usable in rows=
+            fixed_effects: Labels of the absorbed effects, if the model was
+                fitted with fixed effects
+            weights: Optional row weights for aggregates (e.g. enrolment)
+        """
+        import pandas as pd
+
+        if not isinstance(model, MultiplicativeModel):
+            raise ValueError("ScenarioEngine requires a MultiplicativeModel")
+        if not model.is_fitted:
+            raise ValueError("Model must be fitted first")
+
+        X = np.array(X, dtype=float)
+        n, K = X.shape
+        self.beta = np.asarray(model.model.coef_, dtype=float)
+        if len(self.beta) != K:
+            raise ValueError(f"Model has {len(self.beta)} factors, X has {K}")
+
+        self.epsilon = model.epsilon
+        self.bounds = model._log_bounds()
+        if factor_names is None:
+            factor_names = [f'F{k+1}' for k in range(K)]
+        self.factor_names = list(factor_names)
+        self.index = None if index is None else pd.Index(index)
+        self.weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+
+        offset = np.full(n, float(model.model.intercept_))
+        if fixed_effects is not None:
+            if model.fixed_effects_ is None:
+                raise ValueError("Model was fitted without fixed effects")
+            offset += lookup_effects(fixed_effects, model.fixed_effects_['levels'],
+                                     model.fixed_effects_['effects'])
+        self.offset = offset
+        self._initial = X.copy()
+        self._load(X)
+
+    def _load(self, X):
+        """(Re)compute the stored contributions from factor levels"""
+        self.X = X
+        self.contributions = self.beta * np.log(X + self.epsilon)
+        self.log_F = self.offset + self.contributions.sum(axis=1)
+
+    def _positions(self, rows):
+        """Row positions from None (all), a boolean mask, labels or positions"""
+        if rows is None:
+            return np.arange(len(self.X))
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            if len(rows) != len(self.X):
+                raise ValueError("Boolean rows mask must have one entry per row")
+            return np.flatnonzero(rows)
+        rows = np.atleast_1d(rows)
+        if self.index is not None:
+            positions = self.index.get_indexer(rows)
+            if np.any(positions < 0):
+                raise ValueError(f"Unknown rows: {list(rows[positions < 0])}")
+            return positions
+        return rows.astype(int)
+
+    def _factor(self, name):
+        if name not in self.factor_names:
+            raise ValueError(f"Unknown factor: {name}")
+        return self.factor_names.index(name)
+
+    def _to_F(self, log_F):
+        """Back-transform, clipping to the censoring bounds in log space"""
+        if self.bounds is not None:
+            log_F = np.clip(log_F, self.bounds[0], self.bounds[1])
+        return np.exp(log_F)
+
+    def _changed(self, changes, positions, relative):
+        """New levels, contributions and log F of the selected rows"""
+        X = self.X[positions].copy()
+        contributions = self.contributions[positions].copy()
+        log_F = self.log_F[positions].copy()
+        for name, value in changes.items():
+            k = self._factor(name)
+            new = X[:, k] * (1 + value) if relative else np.broadcast_to(value, len(X)).astype(float)
+            if np.any(new <= 0):
+                raise ValueError(f"Factor {name} must stay positive")
+            new_contribution = self.beta[k] * np.log(new + self.epsilon)
+            log_F += new_contribution - contributions[:, k]
+            X[:, k] = new
+            contributions[:, k] = new_contribution
+        return X, contributions, log_F
+
+    def predict(self, rows=None):
+        """
+        Current predicted F
+
+        Args:
+            rows: Optional rows (mask, labels or positions)
+
+        Returns:
+            np.ndarray: Predicted F of the selected rows
+        """
+        return self._to_F(self.log_F[self._positions(rows)])
+
+    def what_if(self, changes, rows=None, relative=True):
+        """
+        Effect of changing some factors on some rows, without applying it
+
+        Args:
+            changes: Dict factor name -> relative change (0.10 for +10%) or,
+                with relative=False, new level (scalar or one per row)
+            rows: Rows affected (mask, labels or positions; default all)
+            relative: Whether changes are relative or absolute levels
+
+        Returns:
+            pd.DataFrame: One row per affected row with F_before, F_after,
+                change_pct, limiting_before, limiting_after
+        """
+        import pandas as pd
+
+        positions = self._positions(rows)
+        X, _, log_F = self._changed(changes, positions, relative)
+        F_before = self._to_F(self.log_F[positions])
+        F_after = self._to_F(log_F)
+        index = self.index[positions] if self.index is not None else positions
+        return pd.DataFrame({
+            'F_before': F_before,
+            'F_after': F_after,
+            'change_pct': 100 * (F_after / F_before - 1),
+            'limiting_before': identify_limiting_factor(self.X[positions], self.factor_names),
+            'limiting_after': identify_limiting_factor(X, self.factor_names)
+        }, index=index)
+
+    def apply(self, changes, rows=None, relative=True):
+        """
+        Apply a change to the engine state (e.g. after a slider move)
+
+        Args:
+            changes: As in what_if
+            rows: As in what_if
+            relative: As in what_if
+
+        Returns:
+            pd.DataFrame: The what_if frame of the applied change
+        """
+        frame = self.what_if(changes, rows, relative)
+        positions = self._positions(rows)
+        X, contributions, log_F = self._changed(changes, positions, relative)
+        self.X[positions] = X
+        self.contributions[positions] = contributions
+        self.log_F[positions] = log_F
+        return frame
+
+    def reset(self):
+        """Return to the factor levels given at construction"""
+        self._load(self._initial.copy())
+        return self
+
+    def evaluate(self, scenarios, rows=None, aggregate=None, batch_size=256):
+        """
+        Evaluate many relative-change scenarios at once
+
+        Args:
+            scenarios: Relative changes per factor, (n_scenarios, n_features)
+                applied to every selected row, or
+                (n_scenarios, n_rows, n_features) per row
+            rows: Rows affected (mask, labels or positions; default all)
+            aggregate: None for F per scenario and row, or 'sum' / 'mean'
+                (weighted by the engine weights) per scenario
+            batch_size: Scenarios evaluated per block when the full
+                (scenarios × rows) matrix is needed
+
+        Returns:
+            np.ndarray: (n_scenarios, n_rows) or (n_scenarios,) with aggregate
+        """
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        scenarios = np.asarray(scenarios, dtype=float)
+        if scenarios.shape[-1] != len(self.beta):
+            raise ValueError(f"Scenarios must have {len(self.beta)} factors")
+        if np.any(scenarios <= -1):
+            raise ValueError("Relative changes must be above -100%")
+
+        positions = self._positions(rows)
+        base = self.log_F[positions]
+        w = self.weights[positions]
+        shift = np.log1p(scenarios) @ self.beta
+
+        if aggregate is not None and scenarios.ndim == 2 and self.bounds is None:
+            # Uniform shifts factor out of the sum
+            total = np.exp(shift) * np.sum(w * np.exp(base))
+            return total / w.sum() if aggregate == 'mean' else total
+
+        if scenarios.ndim == 3 and scenarios.shape[1] != len(positions):
+            raise ValueError("Per-row scenarios must have one entry per selected row")
+        if aggregate is None:
+            shift = shift[:, None] if shift.ndim == 1 else shift
+            return self._to_F(base + shift)
+
+        out = np.empty(len(scenarios))
+        for start in range(0, len(scenarios), batch_size):
+            block = shift[start:start + batch_size]
+            block = block[:, None] if block.ndim == 1 else block
+            out[start:start + batch_size] = self._to_F(base + block) @ w
+        return out / w.sum() if aggregate == 'mean' else out
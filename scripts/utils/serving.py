@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scoring Service
+Saviesa Framework
+
+This module provides a long-running local scoring service for dashboards:
+fitted models stay in memory and concurrent requests are coalesced into
+micro-batches for predict and identify_limiting_factor.
+
+Requests wait at most max_delay (or until max_batch rows are pending), then
+the whole batch is scored with one vectorized call in a worker thread while
+the event loop keeps accepting connections. The protocol is plain HTTP/1.1
+with keep-alive and JSON bodies, over TCP or a Unix socket:
+
+    POST /predict   {"model": "covid", "X": [[0.76, 0.28], ...]}
+                    -> {"prediction": [...], "limiting_factor": [...]}
+    GET  /stats     -> request counts, p50/p90/p99/max latency (ms), batches
+    GET  /health    -> {"status": "ok", "models": [...]}
+
+Usage:
+    >>> server = ScoringServer(max_batch=1024, max_delay=0.002)
+    >>> server.add_model('covid', model, factor_names=['L', 'M'])
+    >>> asyncio.run(server.serve_forever(port=8765))
+"""
+
+import asyncio
+import collections
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .models import SaviesaModel, identify_limiting_factor
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class _MessageError(ValueError):
+    """Malformed request framing; the connection cannot be reused"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _percentiles(values):
+    """Latency summary in milliseconds"""
+    if len(values) == 0:
+        return {'count': 0, 'p50_ms': None, 'p90_ms': None, 'p99_ms': None, 'max_ms': None}
+    ms = 1000 * np.asarray(values, dtype=float)
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {'count': len(ms), 'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99, 'max_ms': ms.max()}
+
+class LatencyTracker:
+    """Latencies of the most recent calls, for percentile reporting"""
+
+    def __init__(self, window=100_000):
+        self.samples = collections.deque(maxlen=window)
+        self.total = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.total += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: count (in window), total, p50_ms, p90_ms, p99_ms, max_ms
+        """
+        return {**_percentiles(self.samples), 'total': self.total}
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring calls into one vectorized call
+
+    Args:
+        fn: Function of a stacked (n_rows, n_features) array returning a
+            dict of per-row arrays
+        max_batch: Rows that trigger an immediate flush
+        max_delay: Seconds the first pending request waits for company
+        executor: Executor running fn (default: one worker thread, created
+            by start and shut down by stop)
+    """
+
+    def __init__(self, fn, max_batch=1024, max_delay=0.002, executor=None):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        self._own_executor = executor is None
+        self.batch_sizes = collections.deque(maxlen=100_000)
+        self._pending = []
+        self._rows = 0
+        self._wakeup = None
+        self._full = None
+        self._task = None
+
+    def start(self):
+        """Start the batching loop on the running event loop"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def stop(self):
+        """Cancel the batching loop and shut down the default executor"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def submit(self, X):
+        """
+        Score rows as part of the next batch
+
+        Args:
+            X: Rows (n_rows, n_features)
+
+        Returns:
+            dict: The fn outputs restricted to these rows
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((X, future))
+        self._rows += len(X)
+        self._wakeup.set()
+        if self._rows >= self.max_batch:
+            self._full.set()
+        return await future
+
+    def _call(self, X):
+        """
+        Run fn, returning (outputs, error) instead of raising
+
+        Keeps the error's traceback free of the batching loop's frame.
+        """
+        try:
+            return self.fn(X), None
+        except Exception as exc:
+            return None, exc
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if self._rows < self.max_batch and self.max_delay > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending, self._rows = self._pending, [], 0
+            self._wakeup.clear()
+            self._full.clear()
+
+            sizes = [len(X) for X, _ in batch]
+            self.batch_sizes.append(sum(sizes))
+            outputs, error = await loop.run_in_executor(self.executor, self._call,
+                                                        np.vstack([X for X, _ in batch]))
+            if error is not None:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            start = 0
+            for size, (_, future) in zip(sizes, batch):
+                if not future.done():
+                    future.set_result({key: value[start:start + size]
+                                       for key, value in outputs.items()})
+                start += size
+
+    def summary(self):
+        """
+        Returns:
+            dict: n_batches, mean_rows and max_rows per batch (recent window)
+        """
+        sizes = np.asarray(self.batch_sizes)
+        return {
+            'n_batches': len(sizes),
+            'mean_rows': float(sizes.mean()) if len(sizes) else None,
+            'max_rows': int(sizes.max()) if len(sizes) else None
+        }
+
+async def _read_message(reader, max_body=None):
+    """
+    Read one HTTP/1.1 message
+
+    Args:
+        reader: asyncio.StreamReader
+        max_body: Optional largest accepted body in bytes
+
+    Returns:
+        tuple: (start line, headers, body), or None at EOF
+
+    Raises:
+        ValueError: Invalid Content-Length (status 400) or body larger than
+            max_body (status 413); the body is left unread
+    """
+    start = await reader.readline()
+    if not start:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise _MessageError(400, f"Invalid Content-Length: {headers['content-length']}") from None
+    if length < 0:
+        raise _MessageError(400, f"Invalid Content-Length: {length}")
+    if max_body is not None and length > max_body:
+        raise _MessageError(413, f"Body of {length} bytes exceeds {max_body}")
+    body = await reader.readexactly(length)
+    return start.decode('latin-1').strip(), headers, body
+
+def _encode(start, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    head = (f"{start}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+class ScoringServer:
+    """
+    Asyncio HTTP scoring service with per-model micro-batching
+
+    Args:
+        max_batch: Rows that trigger an immediate batch flush
+        max_delay: Maximum seconds a request waits to be batched
+        max_body: Largest request body in bytes (larger ones get 413)
+    """
+
+    def __init__(self, max_batch=1024, max_delay=0.002, max_body=16 * 2**20):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_body = max_body
+        self.models = {}
+        self.batchers = {}
+        self.latency = collections.defaultdict(LatencyTracker)
+        self.address = None
+        self._server = None
+
+    def add_model(self, name, model, factor_names=None):
+        """
+        Register a fitted model
+
+        Args:
+            name: Name used in requests
+            model: Fitted Saviesa model (predict(X) on raw factors)
+            factor_names: Names returned as limiting factors
+        """
+        if not isinstance(model, SaviesaModel):
+            raise ValueError(f"Cannot serve a {type(model).__name__}: expected a Saviesa model")
+        n_features = model.n_features_in_
+        if factor_names is None:
+            factor_names = [f'F{k+1}' for k in range(n_features)]
+        factor_names = list(factor_names)
+        if len(factor_names) != n_features:
+            raise ValueError(f"Model has {n_features} factors, got {len(factor_names)} names")
+
+        def score(X):
+            return {'prediction': model.predict(X),
+                    'limiting_factor': identify_limiting_factor(X, factor_names)}
+
+        self.models[name] = (model, n_features)
+        self.batchers[name] = MicroBatcher(score, self.max_batch, self.max_delay)
+        return self
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """
+        Start listening on TCP host:port, or on a Unix socket when path is given
+
+        Returns:
+            ScoringServer: self, with address set to (host, port) or path
+        """
+        for batcher in self.batchers.values():
+            batcher.start()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+            self.address = path
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, path=None):
+        """Start and serve until cancelled"""
+        await self.start(host, port, path)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening, stop the batching loops and their worker threads"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Latency summary per route and batch summary per model
+        """
+        return {
+            'latency': {route: tracker.summary() for route, tracker in self.latency.items()},
+            'batches': {name: batcher.summary() for name, batcher in self.batchers.items()}
+        }
+
+    async def _predict(self, body):
+        request = json.loads(body or b'{}')
+        if not isinstance(request, dict):
+            return 400, {'error': "Body must be a JSON object"}
+        name = request.get('model')
+        if name not in self.models:
+            return 404, {'error': f"Unknown model: {name}"}
+        X = np.asarray(request.get('X'), dtype=float)
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        n_features = self.models[name][1]
+        if X.ndim != 2 or X.shape[1] != n_features or len(X) == 0:
+            return 400, {'error': f"X must have shape (n_rows, {n_features})"}
+        result = await self.batchers[name].submit(X)
+        return 200, {'prediction': result['prediction'].tolist(),
+                     'limiting_factor': result['limiting_factor'].tolist()}
+
+    async def _dispatch(self, method, target, body):
+        """Route one request; returns (status, payload)"""
+        routes = {'/predict': 'POST', '/stats': 'GET', '/health': 'GET'}
+        if target not in routes:
+            return 404, {'error': f"Unknown path: {target}"}
+        if method != routes[target]:
+            return 405, {'error': f"{target} expects {routes[target]}"}
+        if target == '/predict':
+            return await self._predict(body)
+        if target == '/stats':
+            return 200, self.stats()
+        return 200, {'status': 'ok', 'models': sorted(self.models)}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    message = await _read_message(reader, self.max_body)
+                except _MessageError as exc:
+                    # The body framing is unknown: answer and close
+                    writer.write(_encode(f"HTTP/1.1 {exc.status} {REASONS[exc.status]}",
+                                         {'error': str(exc)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if message is None:
+                    break
+                start, headers, body = message
+                t0 = time.perf_counter()
+                method, target, version = (start.split() + ['', '', ''])[:3]
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except (ValueError, TypeError) as exc:
+                    status, payload = 400, {'error': str(exc)}
+                except Exception as exc:
+                    status, payload = 500, {'error': str(exc)}
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(_encode(f"HTTP/1.1 {status} {REASONS[status]}", payload, keep_alive))
+                await writer.drain()
+                self.latency[f"{method} {target}"].record(time.perf_counter() - t0)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def request(reader, writer, method, target, payload=None):
+    """
+    Send one request on an open keep-alive connection
+
+    Returns:
+        tuple: (status code, decoded JSON body)
+    """
+    body = b'' if payload is None else json.dumps(payload).encode()
+    writer.write((f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                  ).encode('latin-1') + body)
+    await writer.drain()
+    start, _, response = await _read_message(reader)
+    return int(start.split()[1]), json.loads(response)
+
+async def _connect(host, port, path):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+async def load_test(X, model, host='127.0.0.1', port=8765, path=None, concurrency=32,
+                    n_requests=2000, rows_per_request=1, seed=None):
+    """
+    Measure client-side latency and throughput of a running ScoringServer
+
+    Each of `concurrency` clients keeps one connection open and sends
+    requests back to back, each with rows sampled from X.
+
+    Args:
+        X: Candidate rows (n_samples, n_features)
+        model: Registered model name
+        host: Server host
+        port: Server port
+        path: Unix socket path (instead of host/port)
+        concurrency: Concurrent connections
+        n_requests: Total requests
+        rows_per_request: Rows per request
+        seed: Random seed for row sampling
+
+    Returns:
+        dict: n_requests, errors, seconds, requests_per_s, rows_per_s,
+            latency (p50_ms, p90_ms, p99_ms, max_ms) and the server stats
+    """
+    X = np.asarray(X, dtype=float)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(X), (n_requests, rows_per_request))
+    latencies = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def client():
+        nonlocal errors
+        reader, writer = await _connect(host, port, path)
+        try:
+            for i in counter:
+                t0 = time.perf_counter()
+                status, _ = await request(reader, writer, 'POST', '/predict',
+                                          {'model': model, 'X': X[picks[i]].tolist()})
+                latencies.append(time.perf_counter() - t0)
+                errors += status != 200
+            status, server_stats = await request(reader, writer, 'GET', '/stats')
+            return server_stats
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*[client() for _ in range(concurrency)])
+    seconds = time.perf_counter() - t0
+
+    return {
+        'n_requests': n_requests,
+        'errors': errors,
+        'seconds': seconds,
+        'requests_per_s': n_requests / seconds,
+        'rows_per_s': n_requests * rows_per_request / seconds,
+        'latency': _percentiles(latencies),
+        'server': results[-1]
+    }
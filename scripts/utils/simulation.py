@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo Simulation
+Saviesa Framework
+
+This module provides a vectorized power study comparing additive, interaction,
+and multiplicative models over many replicate datasets.
+
+Replicates are stored as 3-D arrays (n_replicates, n_samples, n_features) and
+all three models are fitted on every replicate at once with batched normal
+equations, so no per-replicate sklearn loop is needed.
+"""
+
+import numpy as np
+
+from .linalg import add_interactions_batched, centered_gram, solve_batched
+
+def simulate_replicates(n, n_replicates, noise=0.05, seed=None, clip=(0.1, 1.0)):
+    """
+    Generate replicate education-like datasets
+
+    Follows the data-generating process of ``generate_synthetic_education_data``
+    in ``validation_education.py``: F = O × L × M + N(0, noise²), clipped.
+
+    Args:
+        n: Sample size per replicate
+        n_replicates: Number of replicate datasets
+        noise: Standard deviation of the additive Gaussian noise
+        seed: Random seed or np.random.Generator
+        clip: (low, high) bounds applied to F, or None
+
+    Returns:
+        tuple: X of shape (n_replicates, n, 3) holding (O, L, M),
+            y of shape (n_replicates, n)
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_replicates, n)
+
+    O = np.where(rng.random(shape) < 0.75, 0.75, 0.55)
+    L = rng.beta(2, 2, size=shape)
+    M = rng.beta(2, 2, size=shape) * 0.9 + 0.05
+
+    y = O * L * M + rng.normal(0, noise, size=shape)
+    if clip is not None:
+        np.clip(y, clip[0], clip[1], out=y)
+
+    X = np.stack([O, L, M], axis=-1)
+    return X, y
+
+def fit_ols_batched(X, y):
+    """
+    Fit ordinary least squares with intercept on every replicate at once
+
+    Equivalent to fitting ``LinearRegression`` on each ``(X[r], y[r])``.
+
+    Args:
+        X: Feature array (n_replicates, n_samples, n_features)
+        y: Target array (n_replicates, n_samples)
+
+    Returns:
+        tuple: intercepts (n_replicates,), coefficients (n_replicates, n_features)
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    XtX, Xty, X_mean, y_mean = centered_gram(X, y)
+    coef = solve_batched(XtX, Xty)
+    intercept = y_mean - np.sum(X_mean * coef, axis=-1)
+    return intercept, coef
+
+def _predict_batched(X, intercept, coef):
+    """Batched linear prediction"""
+    return np.matmul(X, coef[..., None])[..., 0] + intercept[..., None]
+
+def _r2_batched(y, y_pred):
+    """Row-wise R²"""
+    ss_res = np.sum((y - y_pred)**2, axis=-1)
+    ss_tot = np.sum((y - y.mean(axis=-1, keepdims=True))**2, axis=-1)
+    return 1 - ss_res / ss_tot
+
+def _aic_batched(y, y_pred, n_params):
+    """Row-wise AIC, same formula as ``calculate_aic``"""
+    n = y.shape[-1]
+    rss = np.sum((y - y_pred)**2, axis=-1)
+    return n * np.log(rss / n) + 2 * n_params
+
+def evaluate_replicates(X, y, epsilon=1e-10):
+    """
+    Fit the three Saviesa models on every replicate and score them
+
+    The interaction Gram matrix is computed once; the additive fit reuses its
+    leading block since the additive design is nested in the interaction one.
+    Multiplicative predictions are scored on the original F scale, as in the
+    validation scripts.
+
+    Args:
+        X: Factor array (n_replicates, n_samples, n_factors)
+        y: Performance array (n_replicates, n_samples)
+        epsilon: Small constant to avoid log(0)
+
+    Returns:
+        dict: Per-replicate arrays (r2_*, aic_*, divergence_rate)
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_features = X.shape[-1]
+
+    # Additive and interaction share one Gram matrix
+    X_int = add_interactions_batched(X)
+    XtX, Xty, X_mean, y_mean = centered_gram(X_int, y)
+
+    coef_int = solve_batched(XtX, Xty)
+    intercept_int = y_mean - np.sum(X_mean * coef_int, axis=-1)
+    y_pred_int = _predict_batched(X_int, intercept_int, coef_int)
+
+    coef_add = solve_batched(XtX[..., :n_features, :n_features], Xty[..., :n_features])
+    intercept_add = y_mean - np.sum(X_mean[..., :n_features] * coef_add, axis=-1)
+    y_pred_add = _predict_batched(X, intercept_add, coef_add)
+
+    # Multiplicative: log-linear fit, back-transformed
+    log_X = np.log(X + epsilon)
+    intercept_mult, coef_mult = fit_ols_batched(log_X, np.log(y + epsilon))
+    y_pred_mult = np.exp(_predict_batched(log_X, intercept_mult, coef_mult))
+
+    # Diagnostic divergence: min(X_i) vs max(α_i·X_i), as in diagnostic_differentiel.py
+    limiting_mult = np.argmin(X, axis=-1)
+    limiting_add = np.argmax(X * coef_add[:, None, :], axis=-1)
+    divergence_rate = np.mean(limiting_mult != limiting_add, axis=-1) * 100
+
+    return {
+        'r2_add': _r2_batched(y, y_pred_add),
+        'r2_int': _r2_batched(y, y_pred_int),
+        'r2_mult': _r2_batched(y, y_pred_mult),
+        'aic_add': _aic_batched(y, y_pred_add, n_features + 1),
+        'aic_int': _aic_batched(y, y_pred_int, X_int.shape[-1] + 1),
+        'aic_mult': _aic_batched(y, y_pred_mult, n_features + 1),
+        'divergence_rate': divergence_rate
+    }
+
+def power_study(n_grid, noise_grid, n_replicates=1000, seed=42,
+                max_elements=5_000_000, aic_threshold=2.0):
+    """
+    Tabulate when the multiplicative model beats the additive one
+
+    For every (n, noise) cell, ``n_replicates`` datasets are simulated and
+    evaluated in chunks of at most ``max_elements`` rows × replicates, so
+    memory stays bounded for large grids.
+
+    Args:
+        n_grid: Iterable of sample sizes
+        noise_grid: Iterable of noise standard deviations
+        n_replicates: Replicates per cell
+        seed: Random seed
+        max_elements: Maximum replicates × n simulated at once
+        aic_threshold: ΔAIC below -aic_threshold counts as decisive support
+
+    Returns:
+        pd.DataFrame: One row per (n, noise) cell
+
+    Example:
+        >>> table = power_study([65, 2325], [0.02, 0.05], n_replicates=500)
+        >>> table[['n', 'noise', 'win_rate_mult_vs_add']]
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for n in n_grid:
+        chunk = max(1, min(n_replicates, max_elements // n))
+        for noise in noise_grid:
+            parts = []
+            for start in range(0, n_replicates, chunk):
+                size = min(chunk, n_replicates - start)
+                X, y = simulate_replicates(n, size, noise=noise, seed=rng)
+                parts.append(evaluate_replicates(X, y))
+            res = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+            delta_aic = res['aic_mult'] - res['aic_add']
+            rows.append({
+                'n': n,
+                'noise': noise,
+                'n_replicates': n_replicates,
+                'mean_r2_add': np.mean(res['r2_add']),
+                'mean_r2_int': np.mean(res['r2_int']),
+                'mean_r2_mult': np.mean(res['r2_mult']),
+                'win_rate_mult_vs_add': np.mean(res['r2_mult'] > res['r2_add']),
+                'win_rate_mult_vs_int': np.mean(res['r2_mult'] > res['r2_int']),
+                'mean_delta_aic': np.mean(delta_aic),
+                'decisive_aic_rate': np.mean(delta_aic < -aic_threshold),
+                'mean_divergence_rate': np.mean(res['divergence_rate'])
+            })
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Constraint Typologies
+Saviesa Framework
+
+This module provides a typology of constraint profiles: clusters of
+establishments or communes whose (O, L, M) vectors and gaps to the limiting
+factor look alike, beyond the single argmin label of
+identify_limiting_factor.
+
+Clustering is a streaming mini-batch k-means (Sculley, 2010) that reads the
+factor matrix chunk by chunk (CSV, .npy or an array), so tens of millions
+of rows are segmented without being loaded at once:
+
+- each chunk is shuffled and split into mini-batches; every batch is
+  assigned to its nearest centroid and each centroid moves towards the mean
+  of its batch points with step n_batch / n_seen (a running mean);
+- assignment drops ||x||² and uses one matrix product,
+  argmin_j (||c_j||² − 2 x·c_j), so labelling a chunk is a GEMM and an
+  argmin;
+- labels, centroids and per-cluster limiting-factor counts are accumulated
+  in one pass over the data.
+"""
+
+import os
+
+import numpy as np
+
+from .profiling import instrument
+
+def constraint_profile(X, gaps=True, shares=False):
+    """
+    Profile vectors used for clustering
+
+    Args:
+        X: Factor levels (n_samples, n_factors), normalized to [0, 1]
+        gaps: Append the gaps to the limiting factor, X_k - min(X)
+        shares: Use X / ΣX (the shape of the profile) instead of the levels
+
+    Returns:
+        np.ndarray: (n_samples, n_factors) or (n_samples, 2·n_factors)
+    """
+    X = np.asarray(X, dtype=float)
+    levels = X / np.maximum(X.sum(axis=1, keepdims=True), 1e-12) if shares else X
+    if not gaps:
+        return levels
+    return np.hstack([levels, levels - levels.min(axis=1, keepdims=True)])
+
+def iter_chunks(source, columns=None, chunksize=1_000_000):
+    """
+    Factor matrix of an on-disk dataset, chunk by chunk
+
+    Args:
+        source: Array (or memmap), path (str or pathlib.Path) to a .npy
+            file (memory-mapped) or a CSV file
+        columns: Factor columns to read from a CSV file (e.g. ['O', 'L', 'M'])
+        chunksize: Rows per chunk
+
+    Yields:
+        np.ndarray: (n_rows, n_factors) float chunk
+    """
+    import pandas as pd
+
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    if isinstance(source, str) and source.endswith('.npy'):
+        source = np.load(source, mmap_mode='r')
+    if not isinstance(source, str):
+        source = np.asarray(source) if not isinstance(source, np.ndarray) else source
+        for start in range(0, len(source), chunksize):
+            yield np.asarray(source[start:start + chunksize], dtype=float)
+        return
+
+    if columns is None:
+        raise ValueError("columns are required to read a CSV file")
+    columns = list(columns)
+    for frame in pd.read_csv(source, usecols=columns, chunksize=chunksize,
+                             dtype={c: float for c in columns}):
+        yield frame[columns].to_numpy()
+
+class ConstraintTypology:
+    """
+    Streaming mini-batch k-means on constraint profiles
+
+    Example:
+        >>> typology = ConstraintTypology(n_clusters=6, factor_names=['O', 'L', 'M'])
+        >>> typology.fit('establishments.csv', columns=['O', 'L', 'M'])
+        >>> labels, summary = typology.assign('establishments.csv', columns=['O', 'L', 'M'])
+    """
+
+    def __init__(self, n_clusters=6, factor_names=None, gaps=True, shares=False,
+                 batch_size=4096, n_epochs=3, tol=1e-4, init_size=None, n_init=3, seed=0):
+        """
+        Initialize typology
+
+        Args:
+            n_clusters: Number of profile clusters
+            factor_names: Factor names (default: ['F1', 'F2', ...])
+            gaps: Cluster on levels and gaps to the limiting factor
+            shares: Cluster on X / ΣX instead of levels
+            batch_size: Rows per mini-batch update
+            n_epochs: Maximum passes over the data in fit
+            tol: Stop when no centroid moved more than tol (RMS) in an epoch
+            init_size: Rows of the first chunk used for k-means++
+                (default: 3 × batch_size)
+            n_init: Seedings tried on that sample; the one with the lowest
+                inertia after a few Lloyd steps is kept
+            seed: Random seed
+        """
+        if n_clusters < 1:
+            raise ValueError("n_clusters must be at least 1")
+        self.n_clusters = n_clusters
+        self.factor_names = None if factor_names is None else list(factor_names)
+        self.gaps = gaps
+        self.shares = shares
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.tol = tol
+        self.init_size = init_size or 3 * batch_size
+        self.n_init = n_init
+        self.rng = np.random.default_rng(seed)
+        self.cluster_centers_ = None
+        self.counts_ = None
+        self.n_epochs_ = 0
+        self.is_fitted = False
+
+    def _profile(self, X):
+        return constraint_profile(X, gaps=self.gaps, shares=self.shares)
+
+    def _seed(self, sample):
+        """Greedy k-means++: best of a few candidates for each new centroid"""
+        n_trials = 2 + int(np.log(self.n_clusters))
+        centers = [sample[self.rng.integers(len(sample))]]
+        closest = np.sum((sample - centers[0])**2, axis=1)
+        for _ in range(1, self.n_clusters):
+            total = closest.sum()
+            candidates = self.rng.choice(len(sample), n_trials, p=closest / total) \
+                if total > 0 else self.rng.integers(len(sample), size=n_trials)
+            d2 = np.sum((sample[None] - sample[candidates][:, None])**2, axis=2)
+            pot = np.minimum(closest, d2)
+            best = np.argmin(pot.sum(axis=1))
+            centers.append(sample[candidates[best]])
+            closest = pot[best]
+        return np.array(centers)
+
+    def _init_centers(self, P):
+        """Best of n_init seedings of a sample of the first chunk, refined by Lloyd steps"""
+        if len(P) < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} rows to initialize")
+        sample = P[self.rng.choice(len(P), min(len(P), self.init_size), replace=False)]
+        best, best_inertia = None, np.inf
+        for _ in range(self.n_init):
+            self.cluster_centers_ = self._seed(sample)
+            for _ in range(10):
+                labels, d2 = self._nearest(sample)
+                n = np.bincount(labels, minlength=self.n_clusters)
+                for j in np.flatnonzero(n):
+                    self.cluster_centers_[j] = sample[labels == j].mean(axis=0)
+            inertia = self._nearest(sample)[1].sum()
+            if inertia < best_inertia:
+                best, best_inertia = self.cluster_centers_, inertia
+        self.cluster_centers_ = best
+        self.counts_ = np.zeros(self.n_clusters)
+
+    def _nearest(self, P):
+        """Labels and squared distances to the nearest centroid"""
+        C = self.cluster_centers_
+        scores = np.sum(C**2, axis=1) - 2 * P @ C.T
+        labels = np.argmin(scores, axis=1)
+        d2 = np.maximum(scores[np.arange(len(P)), labels] + np.sum(P**2, axis=1), 0)
+        return labels, d2
+
+    def _update(self, P):
+        """One mini-batch step: move centroids to the running mean"""
+        k = self.n_clusters
+        labels, d2 = self._nearest(P)
+        n = np.bincount(labels, minlength=k).astype(float)
+        sums = np.stack([np.bincount(labels, weights=P[:, c], minlength=k)
+                         for c in range(P.shape[1])], axis=1)
+        seen = self.counts_ + n
+        hit = n > 0
+        self.cluster_centers_[hit] += (sums[hit] - n[hit, None] * self.cluster_centers_[hit]) \
+            / seen[hit, None]
+        self.counts_ = seen
+
+        # Centroids never reached yet: restart them on the worst-fitted points
+        empty = np.flatnonzero(self.counts_ == 0)
+        if len(empty):
+            far = np.argsort(d2)[-len(empty):]
+            self.cluster_centers_[empty[:len(far)]] = P[far]
+        return d2.sum()
+
+    def partial_fit(self, X):
+        """
+        Update the centroids with one chunk of rows
+
+        Args:
+            X: Factor levels (n_rows, n_factors)
+
+        Returns:
+            self
+        """
+        P = self._profile(X)
+        if self.cluster_centers_ is None:
+            self._init_centers(P)
+        if P.shape[1] != self.cluster_centers_.shape[1]:
+            raise ValueError(f"Expected {self.cluster_centers_.shape[1]} profile columns, "
+                             f"got {P.shape[1]}")
+
+        # Shuffle within the chunk: files are often sorted (e.g. by département)
+        order = self.rng.permutation(len(P))
+        inertia = 0.0
+        for start in range(0, len(P), self.batch_size):
+            inertia += self._update(P[order[start:start + self.batch_size]])
+        self.inertia_ = inertia / max(len(P), 1)
+        self.is_fitted = True
+        return self
+
+    @instrument
+    def fit(self, source, columns=None, chunksize=1_000_000):
+        """
+        Fit centroids over an array or on-disk dataset
+
+        Args:
+            source: Array, .npy path or CSV path (see iter_chunks)
+            columns: Factor columns of a CSV file
+            chunksize: Rows read per chunk
+
+        Returns:
+            self
+        """
+        for epoch in range(self.n_epochs):
+            before = None if self.cluster_centers_ is None else self.cluster_centers_.copy()
+            for chunk in iter_chunks(source, columns, chunksize):
+                self.partial_fit(chunk)
+            self.n_epochs_ = epoch + 1
+            if self.cluster_centers_ is None:
+                raise ValueError("No data in source")
+            if before is not None:
+                shift = np.sqrt(np.mean((self.cluster_centers_ - before)**2, axis=1))
+                if shift.max() <= self.tol:
+                    break
+        return self
+
+    def predict(self, X, block_size=65536):
+        """
+        Assign rows to their nearest centroid
+
+        Args:
+            X: Factor levels (n_samples, n_factors)
+            block_size: Rows per assignment block
+
+        Returns:
+            np.ndarray: Cluster labels
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        X = np.asarray(X, dtype=float)
+        labels = np.empty(len(X), dtype=np.int32)
+        for start in range(0, len(X), block_size):
+            labels[start:start + block_size] = self._nearest(
+                self._profile(X[start:start + block_size]))[0]
+        return labels
+
+    @instrument
+    def assign(self, source, columns=None, chunksize=1_000_000):
+        """
+        Label a dataset and summarize the clusters, in one pass
+
+        Args:
+            source: Array, .npy path or CSV path (see iter_chunks)
+            columns: Factor columns of a CSV file
+            chunksize: Rows read per chunk
+
+        Returns:
+            tuple: labels (np.ndarray) and per-cluster summary (pd.DataFrame)
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        k = self.n_clusters
+        labels = []
+        count = np.zeros(k)
+        sums = None
+        limiting = None
+        inertia = 0.0
+        for chunk in iter_chunks(source, columns, chunksize):
+            chunk_labels, d2 = self._nearest(self._profile(chunk))
+            K = chunk.shape[1]
+            if sums is None:
+                sums = np.zeros((k, K))
+                limiting = np.zeros(k * K)
+            count += np.bincount(chunk_labels, minlength=k)
+            for c in range(K):
+                sums[:, c] += np.bincount(chunk_labels, weights=chunk[:, c], minlength=k)
+            # Same tie-breaking (first minimum) as identify_limiting_factor
+            limiting += np.bincount(chunk_labels * K + np.argmin(chunk, axis=1), minlength=k * K)
+            inertia += d2.sum()
+            labels.append(chunk_labels.astype(np.int32))
+        if sums is None:
+            raise ValueError("No data in source")
+
+        self.inertia_ = inertia / max(count.sum(), 1)
+        self.summary_ = self._summary(count, sums, limiting.reshape(k, -1))
+        return np.concatenate(labels), self.summary_
+
+    def _summary(self, count, sums, limiting):
+        """Per-cluster size, mean levels and limiting-factor distribution"""
+        import pandas as pd
+
+        K = sums.shape[1]
+        names = self.factor_names
+        if names is None:
+            names = [f'F{k+1}' for k in range(K)]
+        n = np.maximum(count, 1)[:, None]
+        summary = pd.DataFrame({'n': count.astype(np.int64), 'share': count / count.sum()},
+                               index=pd.RangeIndex(self.n_clusters, name='cluster'))
+        for c, name in enumerate(names):
+            summary[f'mean_{name}'] = sums[:, c] / n[:, 0]
+        for c, name in enumerate(names):
+            summary[f'pct_limiting_{name}'] = 100 * limiting[:, c] / n[:, 0]
+        summary['limiting'] = np.array(names)[np.argmax(limiting, axis=1)]
+        return summary
+
+    def centroids(self):
+        """
+        Centroids as a table, in profile coordinates
+
+        Returns:
+            pd.DataFrame: One row per cluster (levels, then gaps if used)
+        """
+        import pandas as pd
+
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted first")
+        K = self.cluster_centers_.shape[1] // (2 if self.gaps else 1)
+        names = self.factor_names
+        if names is None:
+            names = [f'F{k+1}' for k in range(K)]
+        columns = [f'share_{n}' if self.shares else n for n in names]
+        if self.gaps:
+            columns += [f'gap_{n}' for n in names]
+        return pd.DataFrame(self.cluster_centers_, columns=columns,
+                            index=pd.RangeIndex(self.n_clusters, name='cluster'))
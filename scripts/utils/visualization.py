@@ -9,16 +9,76 @@ This module provides plotting functions for Saviesa framework visualizations.
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 import seaborn as sns
 
+from .profiling import instrument
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (10, 6)
 plt.rcParams['font.size'] = 11
 
+# Above this many points, plot_scatter and plot_residuals switch to density mode
+DENSITY_THRESHOLD = 50_000
+
+def _use_density(n_points, mode):
+    """Resolve the 'auto' / 'scatter' / 'density' rendering mode"""
+    if mode not in ('auto', 'scatter', 'density'):
+        raise ValueError(f"Unknown mode: {mode}")
+    if mode == 'auto':
+        return n_points > DENSITY_THRESHOLD
+    return mode == 'density'
+
+def _plot_density(ax, x, y, bins=200, overlay_size=2000, sparse_count=2, seed=0):
+    """
+    Draw a 2-D histogram of (x, y) with a subsample of sparse points on top
+
+    Bin counts are aggregated with NumPy and drawn as a single image, so
+    render time and file size do not grow with the number of points. Points
+    falling in bins with at most ``sparse_count`` members (outliers) are
+    overlaid as markers, randomly subsampled to ``overlay_size``.
+
+    Args:
+        ax: Matplotlib axes
+        x: X values
+        y: Y values
+        bins: Bins per axis, as in np.histogram2d (a count, a pair of
+            counts, or bin edges)
+        overlay_size: Maximum number of overlaid sparse points (0 disables)
+        sparse_count: Bin count at or below which points are overlaid
+        seed: Random seed for the overlay subsample
+
+    Returns:
+        AxesImage: The density image
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+
+    im = ax.imshow(np.ma.masked_equal(counts.T, 0), origin='lower', aspect='auto',
+                   extent=[x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]],
+                   cmap='viridis', norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)),
+                   interpolation='nearest')
+    plt.colorbar(im, ax=ax, label='Count')
+
+    if overlay_size:
+        ix = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, counts.shape[0] - 1)
+        iy = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, counts.shape[1] - 1)
+        sparse = np.flatnonzero(counts[ix, iy] <= sparse_count)
+        if len(sparse) > overlay_size:
+            rng = np.random.default_rng(seed)
+            sparse = rng.choice(sparse, size=overlay_size, replace=False)
+        ax.scatter(x[sparse], y[sparse], s=6, c='k', alpha=0.6,
+                   linewidths=0, rasterized=True)
+
+    return im
+
+@instrument
 def plot_scatter(y_true, y_pred, title='Observed vs Predicted', 
                  xlabel='Observed', ylabel='Predicted', 
-                 save_path=None, show=True):
+                 save_path=None, show=True, mode='auto',
+                 bins=200, overlay_size=2000):
     """
     Plot scatter plot of observed vs predicted values
     
@@ -30,11 +90,19 @@ def plot_scatter(y_true, y_pred, title='Observed vs Predicted',
         ylabel: Y-axis label
         save_path: Path to save figure (optional)
         show: Whether to display plot
+        mode: 'scatter', 'density', or 'auto' (density above DENSITY_THRESHOLD points)
+        bins: Bins per axis in density mode
+        overlay_size: Maximum sparse points overlaid in density mode (0 disables)
     """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
     fig, ax = plt.subplots(figsize=(8, 8))
     
-    # Scatter plot
-    ax.scatter(y_true, y_pred, alpha=0.6, edgecolors='k', linewidth=0.5)
+    # Scatter plot, or binned density for large n
+    if _use_density(len(y_true), mode):
+        _plot_density(ax, y_true, y_pred, bins=bins, overlay_size=overlay_size)
+    else:
+        ax.scatter(y_true, y_pred, alpha=0.6, edgecolors='k', linewidth=0.5)
     
     # Perfect prediction line
     min_val = min(y_true.min(), y_pred.min())
@@ -67,6 +135,7 @@ def plot_scatter(y_true, y_pred, title='Observed vs Predicted',
     else:
         plt.close()
 
+@instrument
 def plot_distribution(data, labels, title='Distribution', 
                       xlabel='Category', ylabel='Count',
                       save_path=None, show=True):
@@ -110,6 +179,7 @@ def plot_distribution(data, labels, title='Distribution',
     else:
         plt.close()
 
+@instrument
 def plot_model_comparison(models_results, metric='r2',
                           title='Model Comparison',
                           save_path=None, show=True):
@@ -160,8 +230,10 @@ def plot_model_comparison(models_results, metric='r2',
     else:
         plt.close()
 
+@instrument
 def plot_residuals(y_true, y_pred, title='Residual Plot',
-                   save_path=None, show=True):
+                   save_path=None, show=True, mode='auto',
+                   bins=200, overlay_size=2000):
     """
     Plot residuals (y_true - y_pred) vs predicted values
     
@@ -171,12 +243,20 @@ def plot_residuals(y_true, y_pred, title='Residual Plot',
         title: Plot title
         save_path: Path to save figure
         show: Whether to display plot
+        mode: 'scatter', 'density', or 'auto' (density above DENSITY_THRESHOLD points)
+        bins: Bins per axis in density mode
+        overlay_size: Maximum sparse points overlaid in density mode (0 disables)
     """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
     residuals = y_true - y_pred
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    ax.scatter(y_pred, residuals, alpha=0.6, edgecolors='k', linewidth=0.5)
+    if _use_density(len(y_true), mode):
+        _plot_density(ax, y_pred, residuals, bins=bins, overlay_size=overlay_size)
+    else:
+        ax.scatter(y_pred, residuals, alpha=0.6, edgecolors='k', linewidth=0.5)
     ax.axhline(y=0, color='r', linestyle='--', lw=2)
     
     ax.set_xlabel('Predicted values', fontsize=12)
@@ -195,6 +275,7 @@ def plot_residuals(y_true, y_pred, title='Residual Plot',
     else:
         plt.close()
 
+@instrument
 def plot_heatmap(data, row_labels, col_labels, title='Heatmap',
                  cmap='YlOrRd', save_path=None, show=True):
     """
@@ -238,3 +319,150 @@ def plot_heatmap(data, row_labels, col_labels, title='Heatmap',
         plt.show()
     else:
         plt.close()
+
+PLOT_FUNCTIONS = {
+    'scatter': plot_scatter,
+    'distribution': plot_distribution,
+    'model_comparison': plot_model_comparison,
+    'residuals': plot_residuals,
+    'heatmap': plot_heatmap
+}
+
+def _update_hash(h, value):
+    """Feed a plot argument into a hash object"""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            # Object arrays hold pointers; hash the values (e.g. string labels)
+            value = value.astype(str)
+        h.update(str((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            h.update(repr(key).encode())
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _update_hash(h, item)
+    elif hasattr(value, 'to_numpy'):
+        _update_hash(h, value.to_numpy())
+    else:
+        h.update(repr(value).encode())
+
+def figure_hash(spec):
+    """
+    Hash of a figure spec's plot type and inputs
+
+    Args:
+        spec: Figure spec (see render_figures)
+
+    Returns:
+        str: Hex digest
+    """
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=16)
+    for key in sorted(spec):
+        if key in ('save_path', 'show'):
+            continue
+        h.update(key.encode())
+        _update_hash(h, spec[key])
+    return h.hexdigest()
+
+def _hash_path(save_path):
+    """Sidecar file storing the inputs hash of a rendered figure"""
+    return f'{save_path}.hash'
+
+def _is_up_to_date(save_path, digest):
+    """Whether save_path exists and was rendered from the same inputs"""
+    import os
+
+    hash_path = _hash_path(save_path)
+    if not (os.path.exists(save_path) and os.path.exists(hash_path)):
+        return False
+    with open(hash_path) as f:
+        return f.read().strip() == digest
+
+def _init_headless():
+    """Process pool initializer: switch pyplot to the Agg backend"""
+    plt.switch_backend('Agg')
+
+def _render_one(spec, digest):
+    """Render one figure spec and record its inputs hash"""
+    kwargs = {k: v for k, v in spec.items() if k != 'plot'}
+    kwargs['show'] = False
+    try:
+        PLOT_FUNCTIONS[spec['plot']](**kwargs)
+    except Exception as exc:
+        plt.close('all')
+        return {'save_path': spec['save_path'], 'status': 'failed', 'error': repr(exc)}
+
+    with open(_hash_path(spec['save_path']), 'w') as f:
+        f.write(digest)
+    return {'save_path': spec['save_path'], 'status': 'rendered', 'error': None}
+
+def render_figures(specs, n_jobs=None, skip_unchanged=True):
+    """
+    Render many figures in parallel under the headless Agg backend
+
+    Each spec is a dict with a 'plot' key naming the plot function
+    ('scatter', 'distribution', 'model_comparison', 'residuals', 'heatmap'),
+    a required 'save_path', and the remaining keyword arguments of that
+    function. A figure whose file exists and whose inputs hash matches the
+    one recorded next to it (``<save_path>.hash``) is skipped.
+
+    Args:
+        specs: List of figure specs
+        n_jobs: Worker processes (default: CPU count; 1 renders in-process,
+            also under Agg)
+        skip_unchanged: Skip figures whose inputs have not changed
+
+    Returns:
+        list: One dict per spec (save_path, status, error), status being
+            'rendered', 'skipped' or 'failed'
+
+    Example:
+        >>> render_figures([
+        ...     {'plot': 'scatter', 'y_true': y, 'y_pred': y_mult,
+        ...      'title': 'Multiplicative', 'save_path': 'figures/mult.png'},
+        ...     {'plot': 'residuals', 'y_true': y, 'y_pred': y_mult,
+        ...      'save_path': 'figures/mult_residuals.png'}
+        ... ])
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = [None] * len(specs)
+    pending = []
+
+    for i, spec in enumerate(specs):
+        if spec.get('plot') not in PLOT_FUNCTIONS:
+            raise ValueError(f"Unknown plot type: {spec.get('plot')}")
+        if not spec.get('save_path'):
+            raise ValueError("Each figure spec needs a save_path")
+        digest = figure_hash(spec)
+        if skip_unchanged and _is_up_to_date(spec['save_path'], digest):
+            results[i] = {'save_path': spec['save_path'], 'status': 'skipped', 'error': None}
+        else:
+            pending.append((i, spec, digest))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(pending))
+
+    if n_jobs <= 1:
+        # Same backend as the workers, then back to the caller's
+        backend = plt.get_backend()
+        _init_headless()
+        try:
+            for i, spec, digest in pending:
+                results[i] = _render_one(spec, digest)
+        finally:
+            plt.switch_backend(backend)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_headless) as pool:
+            futures = [(i, pool.submit(_render_one, spec, digest))
+                       for i, spec, digest in pending]
+            for i, future in futures:
+                results[i] = future.result()
+
+    return results
@@ -18,6 +18,9 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.profiling import instrument
+
+@instrument
 def load_covid_data(filepath='../../data/processed/Article2_Dataset_COVID.csv'):
     """Load COVID-19 dataset"""
     df = pd.read_csv(filepath)
@@ -18,6 +18,9 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.profiling import instrument
+
+@instrument
 def generate_synthetic_education_data(n=2325, seed=42):
     """
     Generate synthetic education dataset consistent with Article 2 statistics
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Budget Allocation
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from scipy.optimize import minimize
+from utils.allocation import allocate_budget
+from utils.models import MultiplicativeModel
+
+class TestAllocateBudget(unittest.TestCase):
+    """Test allocate_budget function"""
+
+    def setUp(self):
+        """Set up communes and a fitted multiplicative model"""
+        rng = np.random.default_rng(42)
+        self.n = 500
+        self.X = rng.uniform(0.2, 0.95, (self.n, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4])
+                        + rng.normal(0, 0.05, self.n))
+        self.model = MultiplicativeModel().fit(self.X, self.y)
+        self.cost = np.array([2.0, 5.0, 1.0])
+
+    def test_waterfill_is_optimal(self):
+        """Test water-filling against a generic constrained optimizer"""
+        X, y = self.X[:4], self.y[:4]
+        budget = 0.4
+        _, summary = allocate_budget(self.model, X, budget, self.cost, y=y, method='waterfill')
+
+        beta = self.model.get_elasticities()['elasticities']
+        A = y / np.prod(X ** beta, axis=1)
+        cost = np.broadcast_to(self.cost, X.shape)
+
+        def objective(spend):
+            return -np.sum(A * np.prod((X + spend.reshape(X.shape) / cost) ** beta, axis=1))
+
+        reference = minimize(objective, np.full(12, budget / 12), method='SLSQP',
+                             bounds=[(0, (1 - x) * c) for x, c in zip(X.ravel(), cost.ravel())],
+                             constraints=[{'type': 'eq', 'fun': lambda s: s.sum() - budget}],
+                             options={'ftol': 1e-14, 'maxiter': 1000})
+        self.assertAlmostEqual(summary['total_gain'], -reference.fun - y.sum(), places=7)
+
+    def test_budget_and_bounds(self):
+        """Test the budget is spent exactly and ceilings are respected"""
+        for method in ['waterfill', 'greedy']:
+            plan, summary = allocate_budget(self.model, self.X, 50.0, self.cost, y=self.y,
+                                            method=method, factor_names=np.array(['O', 'L', 'M']))
+            self.assertAlmostEqual(summary['spent'], 50.0, places=6)
+            self.assertTrue(np.all(plan[['new_O', 'new_L', 'new_M']].values <= 1.0 + 1e-12))
+            self.assertTrue(np.all(plan['gain'] >= -1e-12))
+            self.assertIn(set(plan['main_investment']) - {''}, [{'O', 'L', 'M'}, {'O', 'M'},
+                                                              {'L', 'M'}, {'O', 'L'}, {'M'}])
+
+    def test_greedy_close_to_waterfill(self):
+        """Test the greedy solver reaches nearly the optimal gain"""
+        _, exact = allocate_budget(self.model, self.X, 50.0, self.cost, y=self.y,
+                                   method='waterfill')
+        _, greedy = allocate_budget(self.model, self.X, 50.0, self.cost, y=self.y,
+                                    method='greedy', n_steps=5000)
+        self.assertAlmostEqual(greedy['total_gain'], exact['total_gain'],
+                               delta=0.01 * exact['total_gain'])
+
+    def test_everything_funded(self):
+        """Test a budget above the cost of reaching every ceiling"""
+        plan, summary = allocate_budget(self.model, self.X, 1e9, self.cost)
+        np.testing.assert_allclose(plan[['new_F1', 'new_F2', 'new_F3']].values, 1.0)
+        self.assertLess(summary['spent'], 1e9)
+
+    def test_validation(self):
+        """Test input validation"""
+        with self.assertRaises(ValueError):
+            allocate_budget(self.model, self.X, 10.0, self.cost, method='lp')
+        with self.assertRaises(ValueError):
+            allocate_budget(self.model, self.X[:, :2], 10.0, self.cost[:2])
+        with self.assertRaises(ValueError):
+            allocate_budget(self.model, self.X, 10.0, -self.cost)
+        with self.assertRaises(ValueError):
+            allocate_budget(self.model, self.X, 10.0, self.cost, weights=np.zeros(len(self.X)))
+
+if __name__ == '__main__':
+    unittest.main()
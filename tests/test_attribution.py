@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Gap Attribution
+Saviesa Framework
+"""
+
+import unittest
+import itertools
+import math
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import InteractionModel, MultiplicativeModel
+from utils.attribution import reference_means
+
+class TestReferenceMeans(unittest.TestCase):
+    """Test reference_means function"""
+
+    def test_group_means(self):
+        """Test weighted means per group, aligned with rows"""
+        values = np.array([[1.0], [3.0], [10.0], [20.0]])
+        means = reference_means(values, groups=['a', 'a', 'b', 'b'], weights=[1, 3, 1, 1])
+        np.testing.assert_allclose(means[:, 0], [2.5, 2.5, 15.0, 15.0])
+        np.testing.assert_allclose(reference_means(values)[:, 0], 8.5)
+
+    def test_invalid(self):
+        """Test mismatched lengths"""
+        with self.assertRaises(ValueError):
+            reference_means(np.ones((3, 1)), groups=['a', 'b'])
+
+class TestModelAttribution(unittest.TestCase):
+    """Test attribute method on the models"""
+
+    def setUp(self):
+        """Set up data with académie groups"""
+        rng = np.random.default_rng(42)
+        self.n = 300
+        self.X = rng.uniform(0.2, 0.95, (self.n, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4])
+                        + rng.normal(0, 0.05, self.n))
+        self.groups = rng.choice(['Aix', 'Lille', 'Lyon'], self.n)
+
+    def group_gap(self, values):
+        """Deviation of each row from its group mean"""
+        means = {g: values[self.groups == g].mean() for g in np.unique(self.groups)}
+        return values - np.array([means[g] for g in self.groups])
+
+    def test_multiplicative_exact(self):
+        """Test log contributions sum to the log-performance gap"""
+        model = MultiplicativeModel().fit(self.X, self.y)
+        frame = model.attribute(self.X, groups=self.groups, feature_names=np.array(['O', 'L', 'M']))
+        self.assertEqual(list(frame.columns), ['O', 'L', 'M', 'gap'])
+        log_pred = np.log(model.predict(self.X))
+        np.testing.assert_allclose(frame['gap'], self.group_gap(log_pred), atol=1e-12)
+        np.testing.assert_allclose(frame[['O', 'L', 'M']].sum(axis=1), frame['gap'])
+
+        with_y = model.attribute(self.X, y=self.y, groups=self.groups)
+        np.testing.assert_allclose(with_y['gap'], self.group_gap(np.log(self.y)), atol=1e-9)
+
+    def test_multiplicative_fixed_effects(self):
+        """Test the absorbed effects get their own share"""
+        model = MultiplicativeModel().fit(self.X, self.y, fixed_effects=self.groups)
+        frame = model.attribute(self.X, y=self.y, fixed_effects=self.groups)
+        self.assertIn('fixed_effects', frame.columns)
+        log_y = np.log(self.y)
+        np.testing.assert_allclose(frame['gap'], log_y - log_y.mean(), atol=1e-9)
+        with self.assertRaises(ValueError):
+            MultiplicativeModel().fit(self.X, self.y).attribute(self.X, fixed_effects=self.groups)
+
+    def test_interaction_shapley(self):
+        """Test closed-form Shapley values against explicit coalitions"""
+        model = InteractionModel().fit(self.X, self.y)
+        frame = model.attribute(self.X, groups=self.groups)
+        np.testing.assert_allclose(frame['gap'], self.group_gap(model.predict(self.X)),
+                                   atol=1e-12)
+
+        reference = self.X[self.groups == self.groups[0]]
+        def value(x, coalition):
+            Z = reference.copy()
+            Z[:, list(coalition)] = x[list(coalition)]
+            return model.predict(Z).mean()
+
+        K = 3
+        shapley = np.zeros(K)
+        for k in range(K):
+            others = [j for j in range(K) if j != k]
+            for size in range(K):
+                for coalition in itertools.combinations(others, size):
+                    weight = (math.factorial(size) * math.factorial(K - size - 1)
+                              / math.factorial(K))
+                    shapley[k] += weight * (value(self.X[0], coalition + (k,))
+                                            - value(self.X[0], coalition))
+        np.testing.assert_allclose(frame.iloc[0, :K], shapley)
+
+    def test_not_fitted(self):
+        """Test attribution requires a fitted model"""
+        with self.assertRaises(ValueError):
+            MultiplicativeModel().attribute(self.X)
+        with self.assertRaises(ValueError):
+            InteractionModel().attribute(self.X)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Censored Regression
+Saviesa Framework
+"""
+
+import unittest
+import warnings
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from scipy.optimize import minimize
+from scipy.stats import norm
+from utils.censored import fit_tobit
+from utils.models import AdditiveModel, MultiplicativeModel
+
+class TestFitTobit(unittest.TestCase):
+    """Test fit_tobit function"""
+
+    def setUp(self):
+        """Set up data censored at both ends"""
+        rng = np.random.default_rng(42)
+        self.n = 3000
+        self.X = rng.uniform(0.0, 1.0, (self.n, 2))
+        latent = 0.2 + 0.5 * self.X[:, 0] + 0.4 * self.X[:, 1] + rng.normal(0, 0.15, self.n)
+        self.y = np.clip(latent, 0.1, 1.0)
+
+    def test_matches_direct_maximization(self):
+        """Test estimates against a generic optimizer on the Tobit likelihood"""
+        X, y = self.X, self.y
+        lo, hi = y <= 0.1, y >= 1.0
+        free = ~(lo | hi)
+
+        def nll(theta):
+            mu = theta[0] + X @ theta[1:3]
+            s = np.exp(theta[3])
+            return -(norm.logpdf(y[free], mu[free], s).sum()
+                     + norm.logcdf((0.1 - mu[lo]) / s).sum()
+                     + norm.logsf((1.0 - mu[hi]) / s).sum())
+
+        reference = minimize(nll, [0.2, 0.5, 0.4, np.log(0.15)], method='BFGS',
+                             options={'gtol': 1e-8})
+        result = fit_tobit(X, y, lower=0.1, upper=1.0)
+
+        self.assertAlmostEqual(result['loglik'], -reference.fun, places=5)
+        np.testing.assert_allclose(result['coef'], reference.x[1:3], atol=1e-5)
+        self.assertAlmostEqual(result['sigma'], np.exp(reference.x[3]), places=5)
+        self.assertGreater(result['n_upper'], 0)
+        self.assertGreater(result['n_lower'], 0)
+
+    def test_recovers_latent_coefficients(self):
+        """Test Tobit undoes the attenuation that OLS suffers under censoring"""
+        result = fit_tobit(self.X, self.y, lower=0.1, upper=1.0)
+        ols = np.linalg.lstsq(np.column_stack([np.ones(self.n), self.X]), self.y, rcond=None)[0]
+
+        np.testing.assert_allclose(result['coef'], [0.5, 0.4], atol=0.03)
+        self.assertTrue(np.all(np.abs(result['coef'] - [0.5, 0.4]) < np.abs(ols[1:] - [0.5, 0.4])))
+
+    def test_uncensored_equals_ols(self):
+        """Test that without censored rows the fit reduces to OLS"""
+        result = fit_tobit(self.X, self.y, lower=-10.0)
+        ols = np.linalg.lstsq(np.column_stack([np.ones(self.n), self.X]), self.y, rcond=None)[0]
+        np.testing.assert_allclose(result['coef'], ols[1:], atol=1e-8)
+
+    def test_convergence(self):
+        """Test the convergence flag and the warning when Newton stops at max_iter"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            result = fit_tobit(self.X, self.y, lower=0.1, upper=1.0)
+        self.assertTrue(result['converged'])
+        self.assertLess(result['n_iter'], 100)
+
+        with self.assertWarns(RuntimeWarning):
+            result = fit_tobit(self.X, self.y, lower=0.1, upper=1.0, max_iter=1)
+        self.assertFalse(result['converged'])
+        self.assertEqual(result['n_iter'], 1)
+        self.assertTrue(np.all(np.isfinite(result['std_errors'])))
+
+    def test_all_censored(self):
+        """Test error when every observation is censored"""
+        with self.assertRaises(ValueError):
+            fit_tobit(self.X, np.full(self.n, 1.0), upper=1.0)
+
+class TestCensoredModels(unittest.TestCase):
+    """Test censoring option of the additive and multiplicative models"""
+
+    def setUp(self):
+        """Set up data like generate_synthetic_education_data (F in [0.1, 1])"""
+        rng = np.random.default_rng(0)
+        self.n = 5000
+        self.X = rng.uniform(0.2, 1.0, (self.n, 3))
+        log_F = 0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4]) + rng.normal(0, 0.2, self.n)
+        self.y = np.clip(np.exp(log_F), 0.1, 1.0)
+
+    def test_multiplicative(self):
+        """Test censored multiplicative model elasticities and predictions"""
+        model = MultiplicativeModel(censoring=(0.1, 1.0)).fit(self.X, self.y)
+        elast = model.get_elasticities()
+
+        np.testing.assert_allclose(elast['elasticities'], [0.3, 0.2, 0.4], atol=0.03)
+        self.assertEqual(len(elast['std_errors']), 3)
+        self.assertAlmostEqual(elast['sigma'], 0.2, delta=0.01)
+        self.assertLessEqual(model.predict(self.X).max(), 1.0 + 1e-8)
+
+    def test_additive(self):
+        """Test censored additive model"""
+        model = AdditiveModel(censoring=(None, 1.0)).fit(self.X, self.y)
+        coef = model.get_coefficients()
+
+        self.assertEqual(len(coef['coefficients']), 3)
+        self.assertIn('std_errors', coef)
+        self.assertLessEqual(model.predict(self.X).max(), 1.0)
+
+    def test_invalid_censoring(self):
+        """Test validation of censoring bounds and fixed effects"""
+        with self.assertRaises(ValueError):
+            AdditiveModel(censoring=(1.0, 0.1))
+        with self.assertRaises(ValueError):
+            MultiplicativeModel(censoring=(0.1, 1.0)).fit(
+                self.X, self.y, fixed_effects=np.arange(self.n) % 5)
+        self.assertIsNone(AdditiveModel(censoring=(None, None)).censoring)
+
+if __name__ == '__main__':
+    unittest.main()
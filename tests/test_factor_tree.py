@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Composite Factor Trees
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.factor_tree import FactorTree
+from utils.models import identify_limiting_factor
+
+class TestFactorTree(unittest.TestCase):
+    """Test FactorTree class"""
+
+    def setUp(self):
+        """Set up a COVID-like tree and data"""
+        rng = np.random.default_rng(42)
+        self.n = 500
+        self.df = pd.DataFrame({
+            'L': rng.uniform(0.6, 0.9, self.n),
+            'revenu_norm': rng.uniform(0, 1, self.n),
+            'ips_norm': rng.uniform(0, 1, self.n),
+            'bac_norm': rng.uniform(0, 1, self.n)
+        })
+        self.tree = FactorTree({
+            'L': None,
+            'M': {'revenu_norm': None, 'ips_norm': None, 'bac_norm': None}
+        })
+
+    def reference(self, tree, row):
+        """Per-row recursive diagnosis"""
+        values = dict(zip(tree.leaves, row))
+
+        def children(v):
+            x = np.array([value(c) for c in tree.children[v]])
+            w = np.array([tree.weights[c] for c in tree.children[v]])
+            return x, w / w.sum(), tree.aggregates[v]
+
+        def value(v):
+            if not tree.children[v]:
+                return values[tree.names[v]]
+            x, w, aggregate = children(v)
+            if aggregate == 'min':
+                return x.min()
+            return w @ x if aggregate == 'mean' else np.exp(w @ np.log(x + 1e-10))
+
+        v = 0
+        while tree.children[v]:
+            x, w, aggregate = children(v)
+            loss = {'min': -x, 'mean': w * (1 - x),
+                    'geometric': -w * np.log(x + 1e-10)}[aggregate]
+            v = tree.children[v][int(np.argmax(loss))]
+        return tree.names[v]
+
+    def test_composite_values(self):
+        """Test composite M is the mean of its sub-factors"""
+        values = self.tree.evaluate(self.df)
+        M = self.df[['revenu_norm', 'ips_norm', 'bac_norm']].mean(axis=1)
+        np.testing.assert_allclose(values['M'], M)
+        np.testing.assert_allclose(values['root'], np.minimum(self.df['L'], M))
+
+    def test_top_level_matches_identify_limiting_factor(self):
+        """Test the top-level diagnosis equals the flattened argmin"""
+        diagnosis = self.tree.diagnose(self.df)
+        values = self.tree.evaluate(self.df)
+        expected = identify_limiting_factor(values[['L', 'M']].values, ['L', 'M'])
+        np.testing.assert_array_equal(diagnosis['limiting_factor'].astype(str), expected)
+        M_rows = diagnosis['limiting_factor'] == 'M'
+        self.assertTrue(np.all(diagnosis.loc[M_rows, 'path'].astype(str).str.startswith('M > ')))
+        np.testing.assert_array_equal(diagnosis.loc[~M_rows, 'limiting_leaf'].astype(str), 'L')
+
+    def test_weighted_nested_tree(self):
+        """Test a deeper weighted tree against per-row recursion"""
+        tree = FactorTree({
+            'O': (2.0, {'O1': 1.0, 'O2': 3.0}),
+            'L': None,
+            'M': {'_aggregate': 'geometric',
+                  'M1': {'_aggregate': 'min', 'M11': None, 'M12': None},
+                  'M2': 0.5}
+        })
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0.05, 1, (400, len(tree.leaves)))
+        diagnosis = tree.diagnose(X, chunk_size=64)
+        expected = [self.reference(tree, row) for row in X]
+        np.testing.assert_array_equal(diagnosis['limiting_leaf'].astype(str), expected)
+        leaf = np.array([tree.leaves.index(name) for name in expected])
+        np.testing.assert_allclose(diagnosis['leaf_value'], X[np.arange(400), leaf])
+        self.assertIn('M > M1 > M11', tree.paths)
+
+    def test_root_aggregate(self):
+        """Test the top-level aggregation from the spec or the argument"""
+        spec = {'_aggregate': 'mean', 'L': None, 'M': None}
+        X = np.array([[0.2, 0.6]])
+        for tree in (FactorTree(spec), FactorTree(spec, aggregate='mean'),
+                     FactorTree({'L': None, 'M': None}, aggregate='mean')):
+            self.assertEqual(tree.aggregates[0], 'mean')
+            self.assertAlmostEqual(tree.evaluate(X)['root'][0], 0.4)
+        self.assertEqual(FactorTree({'L': None, 'M': None}).aggregates[0], 'min')
+        with self.assertRaises(ValueError):
+            FactorTree(spec, aggregate='min')
+
+    def test_invalid(self):
+        """Test validation errors"""
+        with self.assertRaises(ValueError):
+            FactorTree({'M': {}})
+        with self.assertRaises(ValueError):
+            FactorTree({'L': None}, aggregate='max')
+        with self.assertRaises(ValueError):
+            FactorTree({'L': None, 'M': {'L': None}})
+        with self.assertRaises(ValueError):
+            FactorTree({'L': -1.0})
+        with self.assertRaisesRegex(ValueError, 'reserved'):
+            FactorTree({'root': None, 'L': None})
+        with self.assertRaises(ValueError):
+            self.tree.diagnose(self.df[['L', 'ips_norm']])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Fixed-Effects Absorption
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sklearn.linear_model import LinearRegression
+from utils.models import AdditiveModel, MultiplicativeModel
+from utils.fixed_effects import (demean, factorize_effects, clustered_covariance,
+                                 absorbed_dof, absorb_and_fit)
+
+class TestFixedEffects(unittest.TestCase):
+    """Test fixed-effects options on the models"""
+
+    def setUp(self):
+        """Set up test data with two crossed effects"""
+        rng = np.random.default_rng(42)
+        self.n = 3000
+        self.dept = rng.integers(0, 40, self.n)
+        self.year = rng.integers(0, 5, self.n)
+        self.X = rng.uniform(0.2, 1.0, (self.n, 2))
+        log_F = (0.7 * np.log(self.X[:, 0]) + 1.1 * np.log(self.X[:, 1])
+                 + rng.normal(0, 0.3, 40)[self.dept]
+                 + rng.normal(0, 0.3, 5)[self.year]
+                 + rng.normal(0, 0.05, self.n))
+        self.y = np.exp(log_F)
+
+        # Reference fit with explicit dummy columns
+        dummies = np.column_stack([self.dept == k for k in range(1, 40)] +
+                                  [self.year == k for k in range(1, 5)]).astype(float)
+        self.design = np.column_stack([np.log(self.X), dummies])
+        self.reference = LinearRegression().fit(self.design, np.log(self.y))
+
+    def test_matches_dummy_regression(self):
+        """Test absorbed elasticities equal the dummy-variable fit"""
+        model = MultiplicativeModel().fit(self.X, self.y, fixed_effects=[self.dept, self.year])
+        elast = model.get_elasticities()
+
+        np.testing.assert_allclose(elast['elasticities'], self.reference.coef_[:2], rtol=1e-6)
+        self.assertEqual(len(elast['std_errors']), 2)
+
+    def test_predict_with_effects(self):
+        """Test predictions including absorbed effects"""
+        model = MultiplicativeModel().fit(self.X, self.y, fixed_effects=[self.dept, self.year])
+        y_pred = model.predict(self.X, fixed_effects=[self.dept, self.year])
+
+        np.testing.assert_allclose(y_pred, np.exp(self.reference.predict(self.design)), rtol=1e-5)
+
+    def test_additive_single_effect(self):
+        """Test additive model with one absorbed effect"""
+        model = AdditiveModel().fit(self.X, self.y, fixed_effects=self.dept)
+        coefs = model.get_coefficients()
+
+        self.assertIn('std_errors', coefs)
+        with self.assertRaises(ValueError):
+            AdditiveModel().fit(self.X, self.y).predict(self.X, fixed_effects=self.dept)
+
+    def test_demean_single_effect(self):
+        """Test that one-way demeaning zeroes group means"""
+        codes, _ = factorize_effects(self.dept)
+        out = demean(self.X, codes)
+        means = np.array([out[self.dept == k].mean(axis=0) for k in range(40)])
+
+        np.testing.assert_allclose(means, 0, atol=1e-12)
+
+    def test_clustered_covariance(self):
+        """Test CR1 covariance against an explicit cluster loop"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 2))
+        u = rng.normal(size=200)
+        clusters = rng.integers(0, 10, 200)
+
+        bread = np.linalg.inv(X.T @ X)
+        meat = sum(np.outer(X[clusters == g].T @ u[clusters == g],
+                            X[clusters == g].T @ u[clusters == g]) for g in range(10))
+        expected = (10 / 9) * (199 / 198) * bread @ meat @ bread
+
+        np.testing.assert_allclose(clustered_covariance(X, u, clusters), expected)
+
+    def test_absorbed_dof(self):
+        """Test CR1 degrees of freedom of nested and non-nested effects"""
+        codes, _ = factorize_effects([self.dept, self.year])
+        self.assertEqual(absorbed_dof(codes, codes[0]), 4)
+        self.assertEqual(absorbed_dof(codes, None), 40 + 4)
+        self.assertEqual(absorbed_dof(codes[:1], codes[0]), 0)
+
+        # Two-way fit clustered by département: the 4 free year levels count
+        fit = absorb_and_fit(np.log(self.X), np.log(self.y), [self.dept, self.year])
+        demeaned = demean(np.column_stack([np.log(self.X), np.log(self.y)]), codes)
+        X_dm, y_dm = demeaned[:, :2], demeaned[:, 2]
+        u = y_dm - X_dm @ fit['coef']
+        bread = np.linalg.inv(X_dm.T @ X_dm)
+        meat = sum(np.outer(X_dm[self.dept == g].T @ u[self.dept == g],
+                            X_dm[self.dept == g].T @ u[self.dept == g]) for g in range(40))
+        expected = (40 / 39) * ((self.n - 1) / (self.n - 2 - 4)) * bread @ meat @ bread
+
+        np.testing.assert_allclose(fit['coef_cov'], expected, rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Frontier Model
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from scipy.optimize import approx_fprime
+from utils.frontier import FrontierModel, frontier_loglik, fit_frontier_by_group
+
+class TestFrontierModel(unittest.TestCase):
+    """Test FrontierModel class"""
+
+    def setUp(self):
+        """Set up frontier data with half-normal inefficiency"""
+        rng = np.random.default_rng(42)
+        self.n = 3000
+        self.X = rng.uniform(0.2, 1.0, (self.n, 2))
+        self.u = np.abs(rng.normal(0, 0.3, self.n))
+        log_F = (0.1 + 0.6 * np.log(self.X[:, 0]) + 0.9 * np.log(self.X[:, 1])
+                 - self.u + rng.normal(0, 0.1, self.n))
+        self.y = np.exp(log_F)
+
+    def test_gradient(self):
+        """Test analytic gradients against finite differences"""
+        Z = np.column_stack([np.ones(self.n), np.log(self.X)])
+        log_y = np.log(self.y)
+        theta = np.array([0.05, 0.5, 0.8, np.log(0.15), np.log(0.25)])
+
+        for distribution in ['half-normal', 'exponential']:
+            grad = frontier_loglik(theta, Z, log_y, distribution)[1]
+            numeric = approx_fprime(theta, lambda t: frontier_loglik(t, Z, log_y, distribution)[0], 1e-6)
+            np.testing.assert_allclose(grad, numeric, rtol=1e-4, atol=1e-3)
+
+    def test_recovers_parameters(self):
+        """Test frontier elasticities and inefficiency scale"""
+        model = FrontierModel().fit(self.X, self.y)
+        elast = model.get_elasticities()
+
+        self.assertTrue(model.converged_)
+        self.assertAlmostEqual(elast['elasticities'][0], 0.6, delta=0.03)
+        self.assertAlmostEqual(elast['elasticities'][1], 0.9, delta=0.03)
+        self.assertAlmostEqual(elast['sigma_u'], 0.3, delta=0.03)
+
+    def test_efficiency_scores(self):
+        """Test efficiency scores track the true inefficiency"""
+        model = FrontierModel().fit(self.X, self.y)
+        scores = model.efficiency(self.X, self.y)
+
+        self.assertTrue(np.all((scores > 0) & (scores <= 1)))
+        self.assertGreater(np.corrcoef(scores, np.exp(-self.u))[0, 1], 0.8)
+        self.assertTrue(np.all(model.predict(self.X) < model.predict_frontier(self.X)))
+
+    def test_grouped(self):
+        """Test per-group fits"""
+        groups = np.repeat(['A', 'B', 'C'], self.n // 3)
+        names = np.array([f'F{k+1}' for k in range(self.X.shape[1])])
+        table, scores = fit_frontier_by_group(self.X, self.y, groups, distribution='exponential',
+                                              feature_names=names)
+
+        self.assertEqual(len(table), 3)
+        self.assertFalse(np.isnan(scores).any())
+
+    def test_not_fitted(self):
+        """Test predictions require a fitted model"""
+        model = FrontierModel()
+        for method in (model.predict, model.predict_frontier):
+            with self.assertRaises(ValueError):
+                method(self.X)
+
+    def test_invalid_distribution(self):
+        """Test unknown inefficiency distribution"""
+        with self.assertRaises(ValueError):
+            FrontierModel(distribution='gamma')
+
+if __name__ == '__main__':
+    unittest.main()
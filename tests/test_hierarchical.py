@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Hierarchical Model
+Saviesa Framework
+"""
+
+import unittest
+import warnings
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import MultiplicativeModel
+from utils.hierarchical import HierarchicalMultiplicativeModel
+
+class TestHierarchicalMultiplicativeModel(unittest.TestCase):
+    """Test HierarchicalMultiplicativeModel class"""
+
+    def setUp(self):
+        """Set up nested test data with known variance components"""
+        rng = np.random.default_rng(42)
+        self.n = 4000
+        self.academie = rng.choice(['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'], self.n)
+        self.departement = rng.integers(0, 6, self.n)
+        self.X = rng.uniform(0.2, 1.0, (self.n, 2))
+
+        acad_codes = np.searchsorted(np.unique(self.academie), self.academie)
+        a = rng.normal(0, 0.2, 8)
+        b = rng.normal(0, 0.1, (8, 6))
+        log_F = (-0.3 + 0.8 * np.log(self.X[:, 0]) + 1.2 * np.log(self.X[:, 1])
+                 + a[acad_codes] + b[acad_codes, self.departement]
+                 + rng.normal(0, 0.05, self.n))
+        self.y = np.exp(log_F)
+
+    def test_fit_predict(self):
+        """Test model fitting and prediction"""
+        model = HierarchicalMultiplicativeModel()
+        model.fit(self.X, self.y, self.academie, self.departement)
+        y_pred = model.predict(self.X, self.academie, self.departement)
+
+        self.assertEqual(len(y_pred), self.n)
+        self.assertTrue(model.is_fitted)
+
+    def test_elasticities(self):
+        """Test recovery of fixed elasticities and residual variance"""
+        model = HierarchicalMultiplicativeModel()
+        model.fit(self.X, self.y, self.academie, self.departement)
+        elast = model.get_elasticities()
+
+        self.assertAlmostEqual(elast['elasticities'][0], 0.8, delta=0.05)
+        self.assertAlmostEqual(elast['elasticities'][1], 1.2, delta=0.05)
+        self.assertAlmostEqual(model.variance_components()['sigma2'], 0.05**2, delta=5e-4)
+
+    def test_convergence(self):
+        """Test convergence flags and the warning when EM stops at max_iter"""
+        model = HierarchicalMultiplicativeModel()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            model.fit(self.X, self.y, self.academie, self.departement)
+        self.assertTrue(model.converged_)
+        self.assertLessEqual(model.n_iter_, model.max_iter)
+
+        short = HierarchicalMultiplicativeModel(max_iter=2)
+        with self.assertWarns(RuntimeWarning):
+            short.fit(self.X, self.y, self.academie, self.departement)
+        self.assertFalse(short.converged_)
+        self.assertEqual(short.n_iter_, 2)
+
+    def test_coef_at_final_parameters(self):
+        """Test that β is the GLS estimate at the reported variance components"""
+        model = HierarchicalMultiplicativeModel(max_iter=3)
+        with self.assertWarns(RuntimeWarning):
+            model.fit(self.X, self.y, self.academie, self.departement)
+
+        # Dense GLS with V = σ² I + R Σ_a Rᵀ (same académie) + R Σ_b Rᵀ (same département)
+        Z, random_idx = model._design(self.X)
+        R = Z[:, random_idx]
+        log_y = np.log(self.y + model.epsilon)
+        same_acad = self.academie[:, None] == self.academie[None, :]
+        same_dept = same_acad & (self.departement[:, None] == self.departement[None, :])
+        V = (model.sigma2_ * np.eye(self.n)
+             + same_acad * (R @ model.Sigma_academie_ @ R.T)
+             + same_dept * (R @ model.Sigma_departement_ @ R.T))
+        VZ = np.linalg.solve(V, Z)
+        np.testing.assert_allclose(model.coef_, np.linalg.solve(Z.T @ VZ, VZ.T @ log_y), rtol=1e-6)
+        np.testing.assert_allclose(model.coef_cov_, np.linalg.inv(Z.T @ VZ), rtol=1e-6)
+
+    def test_group_effects_improve_fit(self):
+        """Test that group effects beat the pooled multiplicative model"""
+        model = HierarchicalMultiplicativeModel(random_slopes=False)
+        model.fit(self.X, self.y, self.academie, self.departement)
+        pooled = MultiplicativeModel().fit(self.X, self.y)
+
+        y_pred = model.predict(self.X, self.academie, self.departement)
+        ss_hier = np.sum((self.y - y_pred)**2)
+        ss_pooled = np.sum((self.y - pooled.predict(self.X))**2)
+        self.assertLess(ss_hier, ss_pooled)
+
+    def test_group_elasticities(self):
+        """Test per-group coefficient table"""
+        model = HierarchicalMultiplicativeModel()
+        model.fit(self.X, self.y, self.academie, self.departement)
+
+        self.assertEqual(len(model.group_elasticities('academie')), 8)
+        self.assertEqual(len(model.group_elasticities('departement')), 48)
+
+    def test_unseen_group(self):
+        """Test population-level fallback for unseen groups"""
+        model = HierarchicalMultiplicativeModel()
+        model.fit(self.X, self.y, self.academie, self.departement)
+
+        np.testing.assert_allclose(model.predict(self.X[:5], ['Z'] * 5),
+                                   model.predict(self.X[:5]))
+
+if __name__ == '__main__':
+    unittest.main()
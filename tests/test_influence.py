@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Influence Diagnostics
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.influence import influence_measures
+from utils.models import AdditiveModel, InteractionModel, MultiplicativeModel
+
+class TestInfluenceMeasures(unittest.TestCase):
+    """Test influence_measures against explicit deletion refits"""
+
+    def setUp(self):
+        """Set up a small regression with one gross outlier"""
+        rng = np.random.default_rng(42)
+        self.n = 120
+        self.X = rng.normal(size=(self.n, 2))
+        self.y = 1.0 + self.X @ np.array([0.5, -0.3]) + rng.normal(0, 0.2, self.n)
+        self.y[5] += 3.0
+        self.Z = np.column_stack([np.ones(self.n), self.X])
+        self.beta = np.linalg.lstsq(self.Z, self.y, rcond=None)[0]
+        self.measures = influence_measures(self.X, self.y, self.beta[1:], self.beta[0],
+                                           chunk_size=25)
+
+    def test_leverage(self):
+        """Test leverage equals the hat-matrix diagonal"""
+        hat = self.Z @ np.linalg.inv(self.Z.T @ self.Z) @ self.Z.T
+        np.testing.assert_allclose(self.measures['leverage'], np.diag(hat), atol=1e-12)
+        self.assertAlmostEqual(self.measures['leverage'].sum(), 3.0)
+
+    def test_deletion_statistics(self):
+        """Test DFBETAS, Cook's distance and rstudent against refits without row i"""
+        gram_inv = np.linalg.inv(self.Z.T @ self.Z)
+        s2 = np.sum((self.y - self.Z @ self.beta)**2) / (self.n - 3)
+        for i in [0, 5, 77]:
+            keep = np.arange(self.n) != i
+            beta_i = np.linalg.lstsq(self.Z[keep], self.y[keep], rcond=None)[0]
+            s_i = np.sqrt(np.sum((self.y[keep] - self.Z[keep] @ beta_i)**2) / (self.n - 4))
+
+            dfbetas = (self.beta - beta_i) / (s_i * np.sqrt(np.diag(gram_inv)))
+            np.testing.assert_allclose(self.measures['dfbetas'][i], dfbetas, atol=1e-10)
+
+            cooks = np.sum((self.Z @ (self.beta - beta_i))**2) / (3 * s2)
+            self.assertAlmostEqual(self.measures['cooks_d'][i], cooks, places=10)
+
+            h = self.measures['leverage'][i]
+            e = self.y[i] - self.Z[i] @ self.beta
+            self.assertAlmostEqual(self.measures['rstudent'][i], e / (s_i * np.sqrt(1 - h)), places=10)
+
+    def test_outlier_stands_out(self):
+        """Test the planted outlier has the largest Cook's distance"""
+        self.assertEqual(np.argmax(self.measures['cooks_d']), 5)
+
+class TestModelInfluence(unittest.TestCase):
+    """Test influence method on the models"""
+
+    def setUp(self):
+        """Set up positive factor data"""
+        rng = np.random.default_rng(0)
+        self.n = 100
+        self.X = rng.uniform(0.2, 1.0, (self.n, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4]) + rng.normal(0, 0.1, self.n))
+
+    def test_frames(self):
+        """Test frame layout for each model"""
+        mult = MultiplicativeModel().fit(self.X, self.y).influence(
+            self.X, self.y, feature_names=np.array(['O', 'L', 'M']))
+        self.assertEqual(list(mult.columns[-4:]),
+                         ['dfbetas_intercept', 'dfbetas_O', 'dfbetas_L', 'dfbetas_M'])
+        self.assertEqual(AdditiveModel().fit(self.X, self.y).influence(self.X, self.y).shape,
+                         (self.n, 9))
+        self.assertEqual(InteractionModel().fit(self.X, self.y).influence(self.X, self.y).shape,
+                         (self.n, 12))
+
+    def test_requires_ols_fit(self):
+        """Test errors for unfitted and non-OLS models"""
+        with self.assertRaises(ValueError):
+            AdditiveModel().influence(self.X, self.y)
+        with self.assertRaises(ValueError):
+            MultiplicativeModel(robust='huber').fit(self.X, self.y).influence(self.X, self.y)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,8 +18,12 @@ from utils.metrics import (
     calculate_mae,
     calculate_aic,
     calculate_bic,
-    diagnostic_divergence_rate
+    diagnostic_divergence_rate,
+    pointwise_loglik,
+    vuong_test,
+    j_test
 )
+from utils.models import AdditiveModel, MultiplicativeModel
 
 class TestMetrics(unittest.TestCase):
     """Test metric calculation functions"""
@@ -121,5 +125,75 @@ class TestPerfectPrediction(unittest.TestCase):
         rmse = calculate_rmse(y_true, y_pred)
         self.assertAlmostEqual(rmse, 0.0, places=10)
 
+class TestNonNestedTests(unittest.TestCase):
+    """Test Vuong and J tests between additive and multiplicative models"""
+    
+    def setUp(self):
+        """Set up multiplicative data and both fitted models"""
+        rng = np.random.default_rng(0)
+        self.n = 2000
+        self.X = rng.uniform(0.2, 1.0, (self.n, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4])
+                        + rng.normal(0, 0.1, self.n))
+        self.y_add = AdditiveModel().fit(self.X, self.y).predict(self.X)
+        self.y_mult = MultiplicativeModel().fit(self.X, self.y).predict(self.X)
+        self.groups = rng.integers(0, 10, self.n)
+        self.weights = rng.multinomial(self.n, np.full(self.n, 1 / self.n), size=20)
+    
+    def test_pointwise_loglik(self):
+        """Test contributions sum to the Gaussian log-likelihood"""
+        ll = pointwise_loglik(self.y, self.y_add)
+        rss = np.sum((self.y - self.y_add)**2)
+        expected = -self.n / 2 * (np.log(2 * np.pi * rss / self.n) + 1)
+        self.assertAlmostEqual(ll.sum(), expected, places=6)
+    
+    def test_vuong_prefers_true_model(self):
+        """Test Vuong test picks the multiplicative model on multiplicative data"""
+        ll_add = pointwise_loglik(self.y, self.y_add)
+        ll_mult = pointwise_loglik(self.y, self.y_mult, log_scale=True)
+        result = vuong_test(ll_mult, ll_add, 4, 4)
+        self.assertEqual(int(result['preferred']), 1)
+        self.assertLess(result['p_value'], 0.01)
+        
+        swapped = vuong_test(ll_add, ll_mult, 4, 4)
+        self.assertAlmostEqual(swapped['statistic'], -result['statistic'])
+    
+    def test_vuong_batched(self):
+        """Test bootstrap and grouped statistics against explicit resampling"""
+        ll_add = pointwise_loglik(self.y, self.y_add)
+        ll_mult = pointwise_loglik(self.y, self.y_mult, log_scale=True)
+        result = vuong_test(ll_mult, ll_add, weights=self.weights, groups=self.groups,
+                            correction=None)
+        self.assertEqual(result['statistic'].shape, (20, 10))
+        
+        b, label = 3, 7
+        g = list(result['groups']).index(label)
+        rows = np.repeat(np.arange(self.n), self.weights[b])
+        rows = rows[self.groups[rows] == label]
+        d = ll_mult[rows] - ll_add[rows]
+        expected = d.sum() / np.sqrt(len(d) * d.var())
+        self.assertAlmostEqual(result['statistic'][b, g], expected, places=10)
+    
+    def test_j_test(self):
+        """Test J test rejects the additive model but not the multiplicative one"""
+        additive = j_test(self.y, self.X, self.y_mult)
+        multiplicative = j_test(np.log(self.y), np.log(self.X), np.log(self.y_add))
+        self.assertLess(additive['p_value'], 0.01)
+        self.assertGreater(multiplicative['p_value'], 0.01)
+    
+    def test_j_test_grouped(self):
+        """Test grouped J statistic against a direct regression"""
+        result = j_test(self.y, self.X, self.y_mult, groups=self.groups)
+        label = 4
+        g = list(result['groups']).index(label)
+        idx = self.groups == label
+        Z = np.column_stack([np.ones(idx.sum()), self.X[idx], self.y_mult[idx]])
+        beta, rss = np.linalg.lstsq(Z, self.y[idx], rcond=None)[:2]
+        se = np.sqrt(rss[0] / (idx.sum() - 5) * np.linalg.inv(Z.T @ Z)[-1, -1])
+        self.assertAlmostEqual(result['statistic'][g], beta[-1] / se, places=6)
+        
+        batched = j_test(self.y, self.X, self.y_mult, weights=self.weights, groups=self.groups)
+        self.assertEqual(batched['statistic'].shape, (20, 10))
+
 if __name__ == '__main__':
     unittest.main()
@@ -12,10 +12,15 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
+import tempfile
+
 from utils.models import (
     AdditiveModel,
     InteractionModel,
     MultiplicativeModel,
+    FitCache,
+    FeatureSet,
+    compare_models,
     identify_limiting_factor
 )
 
@@ -155,5 +160,124 @@ class TestInteractionModel(unittest.TestCase):
         
         self.assertGreater(score, 0.95)  # Should have high R² for interaction data
 
+class TestFeatureSet(unittest.TestCase):
+    """Test FeatureSet class and shared-design fits"""
+    
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(0)
+        self.X = rng.uniform(0.05, 0.95, (300, 3))
+        self.y = self.X.prod(axis=1) + np.abs(rng.normal(0, 0.01, 300))
+        self.features = FeatureSet(self.X, self.y)
+    
+    def test_matches_fit_and_predict(self):
+        """Test shared-design fits equal the regular fit and predict"""
+        for cls in [AdditiveModel, InteractionModel, MultiplicativeModel]:
+            shared = cls().fit_features(self.features)
+            regular = cls().fit(self.X, self.y)
+            np.testing.assert_allclose(shared.model.coef_, regular.model.coef_, rtol=1e-8)
+            np.testing.assert_allclose(shared.predict_features(self.features),
+                                       regular.predict(self.X), rtol=1e-8)
+    
+    def test_blocks_computed_once(self):
+        """Test the interaction Gram serves both nested linear models"""
+        AdditiveModel().fit_features(self.features)
+        gram = self.features.gram('linear')
+        InteractionModel().fit_features(self.features)
+        self.assertIs(self.features.gram('linear'), gram)
+        self.assertEqual(gram[0].shape, (6, 6))
+    
+    def test_fallback(self):
+        """Test models that are not plain OLS fall back to fit"""
+        robust = MultiplicativeModel(robust='huber').fit_features(self.features)
+        self.assertIsNotNone(robust.robust_)
+        other_epsilon = MultiplicativeModel(epsilon=1e-3).fit_features(self.features)
+        np.testing.assert_allclose(other_epsilon.predict_features(self.features),
+                                   MultiplicativeModel(epsilon=1e-3).fit(self.X, self.y).predict(self.X))
+    
+    def test_compare_models(self):
+        """Test compare_models keeps its results"""
+        result = compare_models(self.X, self.y)
+        expected = [cls().fit(self.X, self.y).score(self.X, self.y)
+                    for cls in [AdditiveModel, InteractionModel, MultiplicativeModel]]
+        np.testing.assert_allclose(result['R²'], expected, rtol=1e-8)
+
+class TestFitCache(unittest.TestCase):
+    """Test FitCache class"""
+    
+    def setUp(self):
+        """Set up test data"""
+        rng = np.random.default_rng(42)
+        self.X = rng.uniform(0.2, 0.95, (200, 2))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.5]) + rng.normal(0, 0.05, 200))
+    
+    def test_hits_and_misses(self):
+        """Test repeated fits become lookups with identical results"""
+        reference = compare_models(self.X, self.y)
+        with FitCache() as cache:
+            compare_models(self.X, self.y)
+            result = compare_models(self.X, self.y)
+            stats = cache.stats()
+        
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['hits'], 3)
+        np.testing.assert_array_equal(result['R²'], reference['R²'])
+    
+    def test_key_includes_parameters_and_arguments(self):
+        """Test different parameters, data or fit arguments miss"""
+        groups = np.arange(200) % 4
+        with FitCache() as cache:
+            MultiplicativeModel().fit(self.X, self.y)
+            MultiplicativeModel(epsilon=1e-6).fit(self.X, self.y)
+            MultiplicativeModel().fit(self.X, self.y * 1.01)
+            first = MultiplicativeModel().fit(self.X, self.y, fixed_effects=groups)
+            second = MultiplicativeModel().fit(self.X, self.y, groups)
+        
+        self.assertEqual(cache.stats()['misses'], 4)
+        self.assertEqual(cache.stats()['hits'], 1)
+        np.testing.assert_array_equal(second.predict(self.X, groups),
+                                      first.predict(self.X, groups))
+    
+    def test_restored_state_is_independent(self):
+        """Test restored models do not share mutable state with the cache"""
+        with FitCache():
+            first = AdditiveModel().fit(self.X, self.y)
+            second = AdditiveModel().fit(self.X, self.y)
+        
+        self.assertIsNot(first.model, second.model)
+        self.assertFalse(second.model.coef_.flags.writeable)
+        second.fit(self.X, 2 * self.y)
+        np.testing.assert_allclose(first.get_coefficients()['intercept'],
+                                   AdditiveModel().fit(self.X, self.y).model.intercept_)
+    
+    def test_lru_eviction(self):
+        """Test the memory budget evicts the least recently used entry"""
+        with FitCache(max_bytes=800) as cache:
+            for epsilon in [1e-10, 1e-9, 1e-8, 1e-7]:
+                MultiplicativeModel(epsilon=epsilon).fit(self.X, self.y)
+            stats = cache.stats()
+        
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['bytes'], 800)
+    
+    def test_disk_tier(self):
+        """Test entries written to disk serve a new cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with FitCache(directory=tmp):
+                expected = MultiplicativeModel(robust='huber').fit(self.X, self.y).predict(self.X)
+            with FitCache(directory=tmp) as cache:
+                model = MultiplicativeModel(robust='huber').fit(self.X, self.y)
+            
+            self.assertEqual(cache.stats()['disk_hits'], 1)
+            np.testing.assert_array_equal(model.predict(self.X), expected)
+            cache.clear(disk=True)
+            self.assertEqual(os.listdir(tmp), [])
+    
+    def test_inactive_by_default(self):
+        """Test fits outside a cache context are not recorded"""
+        cache = FitCache()
+        AdditiveModel().fit(self.X, self.y)
+        self.assertEqual(cache.stats()['misses'], 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Peer Benchmarking
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.peers import PeerIndex
+
+class TestPeerIndex(unittest.TestCase):
+    """Test PeerIndex class"""
+
+    def setUp(self):
+        """Set up establishments with groups"""
+        rng = np.random.default_rng(42)
+        self.n = 600
+        self.X = rng.uniform(0.1, 1.0, (self.n, 3))
+        self.y = self.X.prod(axis=1) * np.exp(rng.normal(0, 0.2, self.n))
+        self.groups = pd.DataFrame({
+            'academie': rng.choice(['Aix', 'Lille', 'Lyon'], self.n),
+            'secteur': rng.choice(['public', 'prive'], self.n)
+        })
+        self.ids = np.array([f'E{i:04d}' for i in range(self.n)])
+        self.index = PeerIndex(self.X, self.y, ids=self.ids, groups=self.groups)
+
+    def brute_force(self, row, k, same=(), better=False, max_distance=np.inf):
+        """Reference distances by exhaustive search"""
+        points = self.index.points
+        d = np.sqrt(np.sum((points - points[row])**2, axis=1))
+        mask = np.arange(self.n) != row
+        for name in same:
+            labels = self.groups[name].fillna('missing').values
+            mask &= labels == labels[row]
+        if better:
+            mask &= self.y > self.y[row]
+        mask &= d <= max_distance
+        return np.sort(d[mask])[:k]
+
+    def check(self, k, same=(), better=False, max_distance=np.inf):
+        distances, indices = self.index.query(k=k, same=list(same), better=better,
+                                              max_distance=max_distance)
+        for row in range(self.n):
+            expected = self.brute_force(row, k, same, better, max_distance)
+            found = indices[row] >= 0
+            np.testing.assert_allclose(distances[row][found], expected)
+            self.assertTrue(np.all(np.isinf(distances[row][~found])))
+
+    def test_nearest(self):
+        """Test plain k-nearest peers match brute force"""
+        self.check(k=5)
+
+    def test_better(self):
+        """Test better-performing peers match brute force"""
+        self.check(k=5, better=True)
+        _, indices = self.index.query(k=5, better=True)
+        rows, ranks = np.nonzero(indices >= 0)
+        self.assertTrue(np.all(self.y[indices[rows, ranks]] > self.y[rows]))
+
+    def test_same_group(self):
+        """Test peers restricted to the same académie and secteur"""
+        self.check(k=4, same=['academie', 'secteur'], better=True)
+        _, indices = self.index.query(k=4, same='academie')
+        rows, ranks = np.nonzero(indices >= 0)
+        academie = self.groups['academie'].values
+        np.testing.assert_array_equal(academie[indices[rows, ranks]], academie[rows])
+
+    def test_missing_group_labels(self):
+        """Test missing labels in a non-leading column do not merge groups"""
+        secteur = self.groups['secteur'].to_numpy(dtype=object)
+        secteur[::7] = np.nan
+        self.groups['secteur'] = secteur
+        self.index = PeerIndex(self.X, self.y, ids=self.ids, groups=self.groups)
+        _, indices = self.index.query(k=4, same=['academie', 'secteur'])
+        rows, ranks = np.nonzero(indices >= 0)
+        peers = indices[rows, ranks]
+        academie = self.groups['academie'].to_numpy()
+        labels = self.groups['secteur'].fillna('missing').to_numpy()
+        np.testing.assert_array_equal(academie[peers], academie[rows])
+        np.testing.assert_array_equal(labels[peers], labels[rows])
+        self.check(k=4, same=['academie', 'secteur'], better=True)
+
+    def test_max_distance_and_padding(self):
+        """Test peers beyond max_distance are dropped and rows padded"""
+        self.check(k=5, better=True, max_distance=0.3)
+        best = np.argmax(self.y)
+        distances, indices = self.index.query(rows=[best], k=3, better=True)
+        np.testing.assert_array_equal(indices, [[-1, -1, -1]])
+        self.assertTrue(np.all(np.isinf(distances)))
+
+    def test_peer_frame(self):
+        """Test long peer table"""
+        frame = self.index.peer_frame(rows=[0, 1], k=3, better=True)
+        self.assertEqual(list(frame.columns),
+                         ['id', 'rank', 'peer_id', 'distance', 'F', 'peer_F', 'gap'])
+        self.assertTrue(set(frame['id']) <= {'E0000', 'E0001'})
+        self.assertTrue(np.all(frame['gap'] > 0))
+
+    def test_save_load(self):
+        """Test saved index gives identical peers"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'peers.sav')
+            self.index.save(path)
+            loaded = PeerIndex.load(path)
+            for same in ([], ['academie']):
+                expected = self.index.query(k=5, same=same, better=True)
+                result = loaded.query(k=5, same=same, better=True)
+                np.testing.assert_array_equal(result[1], expected[1])
+            np.testing.assert_array_equal(loaded.ids, self.ids)
+
+    def test_invalid(self):
+        """Test validation errors"""
+        with self.assertRaises(ValueError):
+            PeerIndex(self.X, scale='minmax')
+        with self.assertRaises(ValueError):
+            PeerIndex(self.X).query(better=True)
+        with self.assertRaises(ValueError):
+            self.index.query(same=['region'])
+        with self.assertRaises(ValueError):
+            self.index.query(k=0)
+
+if __name__ == '__main__':
+    unittest.main()
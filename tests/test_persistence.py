@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Model Persistence
+Saviesa Framework
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import AdditiveModel, InteractionModel, MultiplicativeModel
+from utils.hierarchical import HierarchicalMultiplicativeModel
+from utils.persistence import (
+    MAGIC,
+    data_fingerprint,
+    load_model,
+    load_table,
+    save_table
+)
+
+class TestModelPersistence(unittest.TestCase):
+    """Test save and load of fitted models"""
+
+    def setUp(self):
+        """Set up sample data and a temporary directory"""
+        rng = np.random.default_rng(42)
+        self.X = rng.uniform(0.2, 0.95, (300, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4])
+                        + rng.normal(0, 0.05, 300))
+        self.groups = np.array(['A', 'B', 'C'])[rng.integers(0, 3, 300)]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'model.sav')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test predictions and statistics survive save and load"""
+        models = [AdditiveModel().fit(self.X, self.y),
+                  InteractionModel().fit(self.X, self.y),
+                  MultiplicativeModel(censoring=(None, 0.9)).fit(self.X, np.minimum(self.y, 0.9)),
+                  MultiplicativeModel(robust='huber').fit(self.X, self.y)]
+        for model in models:
+            model.save(self.path)
+            for mmap in [True, False]:
+                loaded = type(model).load(self.path, mmap=mmap)
+                self.assertIs(type(loaded), type(model))
+                np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+
+        loaded = MultiplicativeModel.load(self.path)
+        np.testing.assert_array_equal(loaded.get_elasticities()['std_errors'],
+                                      models[-1].get_elasticities()['std_errors'])
+        self.assertEqual(loaded.robust, 'huber')
+
+    def test_fixed_effects_and_hierarchical(self):
+        """Test models carrying group labels"""
+        model = MultiplicativeModel().fit(self.X, self.y, fixed_effects=self.groups)
+        model.save(self.path)
+        loaded = MultiplicativeModel.load(self.path)
+        np.testing.assert_array_equal(loaded.predict(self.X, fixed_effects=self.groups),
+                                      model.predict(self.X, fixed_effects=self.groups))
+
+        dept = np.char.add(self.groups, (np.arange(300) % 2).astype(str))
+        model = HierarchicalMultiplicativeModel().fit(self.X, self.y, self.groups, dept)
+        model.save(self.path)
+        loaded = load_model(self.path)
+        np.testing.assert_array_equal(loaded.predict(self.X, self.groups, dept),
+                                      model.predict(self.X, self.groups, dept))
+
+    def test_metadata_and_mmap(self):
+        """Test metadata, fingerprint and read-only mapped arrays"""
+        model = MultiplicativeModel().fit(self.X, self.y)
+        size = model.save(self.path, feature_names=['O', 'L', 'M'], X=self.X, y=self.y)
+        self.assertEqual(size, os.path.getsize(self.path))
+        self.assertLess(size, 1024)
+
+        loaded = MultiplicativeModel.load(self.path)
+        self.assertListEqual(loaded.metadata_['feature_names'], ['O', 'L', 'M'])
+        self.assertEqual(loaded.metadata_['fingerprint'], data_fingerprint(self.X, self.y))
+        self.assertFalse(loaded.model.coef_.flags.writeable)
+
+    def test_save_over_mapped_file(self):
+        """Test saving a memory-mapped model back to the file it was loaded from"""
+        model = MultiplicativeModel().fit(self.X, self.y)
+        model.save(self.path, feature_names=['O', 'L', 'M'])
+        loaded = MultiplicativeModel.load(self.path)
+        loaded.save(self.path, feature_names=['O', 'L', 'M'])
+        np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+        reloaded = MultiplicativeModel.load(self.path)
+        np.testing.assert_array_equal(reloaded.predict(self.X), model.predict(self.X))
+        self.assertEqual(os.listdir(self.tmp.name), ['model.sav'])
+
+    @unittest.skipIf(os.name == 'nt', "POSIX permissions")
+    def test_file_mode(self):
+        """Test new files follow the umask and overwrites keep the old mode"""
+        model = MultiplicativeModel().fit(self.X, self.y)
+        umask = os.umask(0o022)
+        try:
+            model.save(self.path)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+        os.chmod(self.path, 0o640)
+        model.save(self.path)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+    def test_errors(self):
+        """Test invalid saves and loads"""
+        with self.assertRaises(ValueError):
+            MultiplicativeModel().save(self.path)
+
+        AdditiveModel().fit(self.X, self.y).save(self.path)
+        with self.assertRaises(ValueError):
+            MultiplicativeModel.load(self.path)
+        with self.assertRaises(ValueError):
+            load_table(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'\x80\x04not a model')
+        with self.assertRaises(ValueError):
+            load_model(self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC + (99).to_bytes(4, 'little') + (2).to_bytes(4, 'little') + b'{}')
+        with self.assertRaises(ValueError):
+            load_model(self.path)
+
+class TestTables(unittest.TestCase):
+    """Test save_table and load_table"""
+
+    def test_round_trip(self):
+        """Test a grouped-model table loads as one array"""
+        rng = np.random.default_rng(0)
+        table = pd.DataFrame({'group': [f'g{i}' for i in range(2000)],
+                              'n': rng.integers(20, 200, 2000),
+                              'intercept': rng.normal(size=2000),
+                              'elasticity_L': rng.normal(size=2000),
+                              'converged': rng.random(2000) > 0.1})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.sav')
+            save_table(table, path)
+            loaded = load_table(path)
+            raw = load_table(path, as_frame=False)
+
+            pd.testing.assert_frame_equal(loaded, table, check_dtype=False)
+            self.assertEqual(raw['values'].shape, (2000, 4))
+            self.assertListEqual(raw['columns'], ['n', 'intercept', 'elasticity_L', 'converged'])
+            np.testing.assert_array_equal(raw['values'][:, 1], table['intercept'])
+            del loaded, raw
+
+class TestFingerprint(unittest.TestCase):
+    """Test data_fingerprint function"""
+
+    def test_sensitivity(self):
+        """Test the digest depends on content, dtype and shape"""
+        a = np.arange(6.0)
+        self.assertEqual(data_fingerprint(a), data_fingerprint(a.copy()))
+        self.assertNotEqual(data_fingerprint(a), data_fingerprint(a.reshape(2, 3)))
+        self.assertNotEqual(data_fingerprint(a), data_fingerprint(a.astype(np.float32)))
+        self.assertNotEqual(data_fingerprint(a), data_fingerprint(a + 1e-12))
+        self.assertEqual(data_fingerprint(a[::2]), data_fingerprint(np.array([0.0, 2.0, 4.0])))
+
+if __name__ == '__main__':
+    unittest.main()
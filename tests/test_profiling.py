@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Profiling Module
+Saviesa Framework
+"""
+
+import unittest
+import json
+import tempfile
+import threading
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import MultiplicativeModel
+from utils.metrics import calculate_r2
+from utils.profiling import Profiler, instrument, section, is_enabled
+
+class TestProfiler(unittest.TestCase):
+    """Test instrumentation of hot paths"""
+
+    def setUp(self):
+        """Set up test data"""
+        np.random.seed(42)
+        self.X = np.random.rand(50, 2) + 0.1
+        self.y = self.X[:, 0] * self.X[:, 1]
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded without an active profiler"""
+        profiler = Profiler()
+        MultiplicativeModel().fit(self.X, self.y)
+
+        self.assertFalse(is_enabled())
+        self.assertEqual(profiler.stats, {})
+
+    def test_records_calls_and_shapes(self):
+        """Test call counts and argument shapes"""
+        with Profiler() as profiler:
+            model = MultiplicativeModel().fit(self.X, self.y)
+            y_pred = model.predict(self.X)
+            model.predict(self.X)
+            calculate_r2(self.y, y_pred)
+
+        stats = profiler.stats
+        self.assertEqual(stats['MultiplicativeModel.fit']['calls'], 1)
+        self.assertEqual(stats['MultiplicativeModel.predict']['calls'], 2)
+        self.assertEqual(stats['MultiplicativeModel.log_transform']['calls'], 3)
+        self.assertEqual(stats['calculate_r2']['calls'], 1)
+        self.assertIn(((50, 2), (50,)), stats['MultiplicativeModel.fit']['shapes'])
+        self.assertFalse(is_enabled())
+
+    def test_nested_memory(self):
+        """Test that an outer call's peak includes inner allocations"""
+        @instrument(name='inner')
+        def inner():
+            return np.ones(1_000_000)
+
+        @instrument(name='outer')
+        def outer():
+            inner()
+            return None
+
+        with Profiler() as profiler:
+            outer()
+
+        self.assertGreaterEqual(profiler.stats['inner']['bytes_allocated'], 8_000_000)
+        self.assertGreaterEqual(profiler.stats['outer']['bytes_allocated'], 8_000_000)
+
+    def test_chrome_trace(self):
+        """Test Chrome trace output"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            with Profiler(output=path, trace_format='chrome'):
+                with section('block'):
+                    np.ones(10)
+
+            with open(path) as f:
+                trace = json.load(f)
+
+        self.assertEqual(trace['traceEvents'][0]['name'], 'block')
+        self.assertEqual(trace['traceEvents'][0]['ph'], 'X')
+
+    def test_threads(self):
+        """Test nested calls from several threads keep separate stacks"""
+        depths = []
+
+        @instrument(name='leaf')
+        def leaf():
+            depths.append(len(profiler._stack))
+            return np.ones(1000)
+
+        @instrument(name='branch')
+        def branch(barrier):
+            barrier.wait()  # all four branch calls are in progress
+            depths.append(len(profiler._stack))
+            for _ in range(200):
+                leaf()
+
+        barrier = threading.Barrier(4)
+        with Profiler() as profiler:
+            threads = [threading.Thread(target=branch, args=(barrier,)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(profiler.stats['branch']['calls'], 4)
+        self.assertEqual(profiler.stats['leaf']['calls'], 800)
+        self.assertEqual(sorted(set(depths)), [1, 2])
+
+    def test_bounded_events(self):
+        """Test that json profilers keep no events and chrome ones are capped"""
+        with Profiler() as profiler:
+            for _ in range(10):
+                calculate_r2(self.y, self.y)
+        self.assertEqual(len(profiler.events), 0)
+        self.assertEqual(profiler.stats['calculate_r2']['calls'], 10)
+
+        with Profiler(trace_format='chrome', max_events=4) as profiler:
+            for _ in range(10):
+                calculate_r2(self.y, self.y)
+        self.assertEqual(len(profiler.events), 4)
+        self.assertEqual(profiler.dropped_events, 6)
+
+    def test_invalid_format(self):
+        """Test unknown trace format"""
+        with self.assertRaises(ValueError):
+            Profiler(trace_format='xml')
+
+if __name__ == '__main__':
+    unittest.main()
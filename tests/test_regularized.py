@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Regularized Multiplicative Model
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from sklearn.linear_model import Ridge, ElasticNet
+from utils.regularized import ridge_path, elastic_net_path, RegularizedMultiplicativeModel
+from utils.models import MultiplicativeModel
+
+class TestPaths(unittest.TestCase):
+    """Test ridge and elastic-net path functions"""
+
+    def setUp(self):
+        """Set up many correlated proxies driven by three latent factors"""
+        rng = np.random.default_rng(42)
+        self.n, self.p = 200, 20
+        latent = rng.normal(size=(self.n, 3))
+        self.X = latent @ rng.normal(size=(3, self.p)) + 0.1 * rng.normal(size=(self.n, self.p))
+        self.y = self.X[:, :3] @ np.array([0.5, 0.3, 0.2]) + rng.normal(0, 0.5, self.n)
+        self.Xs = (self.X - self.X.mean(axis=0)) / self.X.std(axis=0)
+
+    def test_ridge_matches_sklearn(self):
+        """Test path coefficients against sklearn Ridge on standardized data"""
+        alphas = [0.001, 0.1, 10.0]
+        path = ridge_path(self.X, self.y, alphas=alphas)
+        for k, alpha in enumerate(alphas):
+            reference = Ridge(alpha=self.n * alpha).fit(self.Xs, self.y)
+            np.testing.assert_allclose(path['coefs'][k] * self.X.std(axis=0),
+                                       reference.coef_, atol=1e-10)
+            fitted = self.X @ path['coefs'][k] + path['intercepts'][k]
+            np.testing.assert_allclose(fitted, reference.predict(self.Xs), atol=1e-10)
+
+    def test_ridge_loo(self):
+        """Test closed-form leave-one-out error against explicit refits"""
+        alpha = 0.05
+        path = ridge_path(self.X, self.y, alphas=[alpha])
+        errors = []
+        for i in range(self.n):
+            keep = np.arange(self.n) != i
+            model = Ridge(alpha=self.n * alpha).fit(self.Xs[keep], self.y[keep])
+            errors.append((self.y[i] - model.predict(self.Xs[i:i+1])[0])**2)
+        self.assertAlmostEqual(path['loo'][0], np.mean(errors), places=10)
+
+    def test_elastic_net_matches_sklearn(self):
+        """Test elastic-net and lasso paths against sklearn ElasticNet"""
+        for l1_ratio in [0.5, 1.0]:
+            path = elastic_net_path(self.X, self.y, l1_ratio=l1_ratio, n_alphas=20)
+            for k in [5, 19]:
+                reference = ElasticNet(alpha=path['alphas'][k], l1_ratio=l1_ratio,
+                                       tol=1e-12, max_iter=100000).fit(self.Xs, self.y)
+                np.testing.assert_allclose(path['coefs'][k] * self.X.std(axis=0),
+                                           reference.coef_, atol=1e-8)
+            self.assertTrue(np.all(path['coefs'][0] == 0))
+
+    def test_invalid_l1_ratio(self):
+        """Test error on l1_ratio outside (0, 1]"""
+        with self.assertRaises(ValueError):
+            elastic_net_path(self.X, self.y, l1_ratio=0.0)
+
+class TestRegularizedMultiplicativeModel(unittest.TestCase):
+    """Test RegularizedMultiplicativeModel class"""
+
+    def setUp(self):
+        """Set up multiplicative data with redundant proxies"""
+        rng = np.random.default_rng(0)
+        self.n = 300
+        base = rng.uniform(0.2, 1.0, (self.n, 3))
+        noise = np.exp(rng.normal(0, 0.02, (self.n, 9)))
+        self.X = np.column_stack([base, np.repeat(base, 3, axis=1) * noise])
+        self.y = np.exp(0.1 + np.log(base) @ np.array([0.3, 0.2, 0.4]) + rng.normal(0, 0.1, self.n))
+
+    def test_ridge_stabilizes(self):
+        """Test ridge elasticities sum like the true ones with smaller spread than OLS"""
+        for criterion in ['gcv', 'loo']:
+            model = RegularizedMultiplicativeModel(criterion=criterion).fit(self.X, self.y)
+            elast = model.get_elasticities()
+            ols = MultiplicativeModel().fit(self.X, self.y).get_elasticities()
+            self.assertAlmostEqual(elast['elasticities'].sum(), 0.9, delta=0.1)
+            self.assertLess(np.abs(elast['elasticities']).max(), np.abs(ols['elasticities']).max())
+            self.assertGreater(elast['alpha'], 0)
+
+    def test_elastic_net(self):
+        """Test elastic-net fit, prediction and path frame"""
+        model = RegularizedMultiplicativeModel(penalty='elasticnet', n_alphas=20).fit(self.X, self.y)
+        self.assertEqual(model.predict(self.X).shape, (self.n,))
+        frame = model.path_frame()
+        self.assertEqual(len(frame), 20)
+        self.assertIn('elasticity_X12', frame.columns)
+        self.assertNotIn('loo', frame.columns)
+        names = np.array([f'X{k+1}' for k in range(self.X.shape[1])])
+        self.assertListEqual(list(model.path_frame(names).columns), list(frame.columns))
+
+    def test_fixed_alpha(self):
+        """Test fitting at a given penalty"""
+        model = RegularizedMultiplicativeModel(alpha=0.01).fit(self.X, self.y)
+        self.assertEqual(model.alpha_, 0.01)
+
+    def test_invalid_options(self):
+        """Test option validation and unfitted errors"""
+        with self.assertRaises(ValueError):
+            RegularizedMultiplicativeModel(penalty='lasso2')
+        with self.assertRaises(ValueError):
+            RegularizedMultiplicativeModel(penalty='elasticnet', criterion='loo')
+        with self.assertRaises(ValueError):
+            RegularizedMultiplicativeModel().get_elasticities()
+
+if __name__ == '__main__':
+    unittest.main()
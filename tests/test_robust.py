@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Robust Regression
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.robust import robust_fit, robust_fit_by_group, robust_bootstrap, robust_weights
+from utils.models import AdditiveModel, MultiplicativeModel
+
+class TestRobustFit(unittest.TestCase):
+    """Test robust IRLS fitting functions"""
+
+    def setUp(self):
+        """Set up log-linear data with gross negative outliers"""
+        rng = np.random.default_rng(42)
+        self.n = 2000
+        self.X = rng.normal(0, 1, (self.n, 2))
+        e = rng.normal(0, 0.1, self.n)
+        self.outliers = rng.random(self.n) < 0.1
+        e[self.outliers] -= 2.0
+        self.y = 0.5 + self.X @ np.array([0.3, 0.7]) + e
+        self.groups = rng.integers(0, 8, self.n)
+
+    def test_weights(self):
+        """Test Huber and Tukey weight functions"""
+        u = np.array([0.0, 1.0, 3.0, 10.0])
+        np.testing.assert_allclose(robust_weights(u, 'huber'), [1, 1, 1.345 / 3, 0.1345])
+        tukey = robust_weights(u, 'tukey')
+        self.assertEqual(tukey[0], 1.0)
+        self.assertEqual(tukey[-1], 0.0)
+
+    def test_resists_outliers(self):
+        """Test robust fits recover the clean intercept that OLS misses"""
+        for loss in ['huber', 'tukey']:
+            result = robust_fit(self.X, self.y, loss=loss)
+            self.assertAlmostEqual(result['intercept'], 0.5, delta=0.05 if loss == 'huber' else 0.02)
+            np.testing.assert_allclose(result['coef'], [0.3, 0.7], atol=0.02)
+        tukey = robust_fit(self.X, self.y, loss='tukey')
+        self.assertLess(tukey['weights'][self.outliers].max(), 1e-6)
+
+    def test_batched_weights_match_single_fits(self):
+        """Test that a batch of weight vectors equals separate fits"""
+        rng = np.random.default_rng(0)
+        weights = rng.integers(0, 3, (3, self.n)).astype(float)
+        batched = robust_fit(self.X, self.y, weights=weights)
+        for b in range(3):
+            keep = np.repeat(np.arange(self.n), weights[b].astype(int))
+            single = robust_fit(self.X[keep], self.y[keep])
+            np.testing.assert_allclose(batched['coef'][b], single['coef'], atol=1e-6)
+
+    def test_by_group_matches_single_fits(self):
+        """Test grouped IRLS against one fit per group"""
+        result = robust_fit_by_group(self.X, self.y, self.groups, loss='tukey')
+        for g, label in enumerate(result['levels']):
+            idx = self.groups == label
+            single = robust_fit(self.X[idx], self.y[idx], loss='tukey')
+            np.testing.assert_allclose(result['coef'][g], single['coef'], atol=1e-6)
+            np.testing.assert_allclose(result['std_errors'][g], single['std_errors'], rtol=1e-6)
+
+    def test_bootstrap(self):
+        """Test bootstrap spread agrees with sandwich standard errors"""
+        draws = robust_bootstrap(self.X, self.y, n_boot=200, seed=1)
+        self.assertEqual(draws.shape, (200, 3))
+        se = robust_fit(self.X, self.y)['std_errors']
+        np.testing.assert_allclose(draws[:, 1:].std(axis=0), se, rtol=0.3)
+
+    def test_invalid_loss(self):
+        """Test error on unknown loss"""
+        with self.assertRaises(ValueError):
+            robust_fit(self.X, self.y, loss='cauchy')
+        with self.assertRaises(ValueError):
+            MultiplicativeModel(robust='cauchy')
+
+class TestRobustModels(unittest.TestCase):
+    """Test robust option of the additive and multiplicative models"""
+
+    def test_multiplicative(self):
+        """Test robust multiplicative model ignores outlying territories"""
+        rng = np.random.default_rng(1)
+        n = 500
+        X = rng.uniform(0.2, 1.0, (n, 3))
+        log_F = 0.1 + np.log(X) @ np.array([0.3, 0.2, 0.4]) + rng.normal(0, 0.05, n)
+        log_F[:25] -= 1.5
+        y = np.exp(log_F)
+
+        model = MultiplicativeModel(robust='huber').fit(X, y)
+        elast = model.get_elasticities()
+        self.assertAlmostEqual(elast['intercept'], 0.1, delta=0.03)
+        self.assertEqual(len(elast['std_errors']), 3)
+        self.assertEqual(model.predict(X).shape, (n,))
+
+    def test_additive_rejects_combinations(self):
+        """Test that robust fitting refuses censoring and fixed effects"""
+        X = np.random.rand(50, 2)
+        y = X.sum(axis=1)
+        with self.assertRaises(ValueError):
+            AdditiveModel(censoring=(0, 1), robust='huber').fit(X, y)
+        with self.assertRaises(ValueError):
+            AdditiveModel(robust='huber').fit(X, y, fixed_effects=np.arange(50) % 2)
+        self.assertIn('std_errors', AdditiveModel(robust='tukey').fit(X, y).get_coefficients())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Rolling Elasticities
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import MultiplicativeModel
+from utils.rolling import rolling_elasticities, RollingOLS
+
+class TestRollingElasticities(unittest.TestCase):
+    """Test windowed elasticity estimates"""
+
+    def setUp(self):
+        """Set up a panel with drifting elasticity"""
+        rng = np.random.default_rng(42)
+        self.n = 6000
+        self.periods = rng.integers(2015, 2025, self.n)
+        self.X = rng.uniform(0.2, 1.0, (self.n, 2))
+        beta_L = 0.5 + 0.05 * (self.periods - 2015)
+        self.y = np.exp(beta_L * np.log(self.X[:, 0]) + np.log(self.X[:, 1])
+                        + rng.normal(0, 0.05, self.n))
+
+    def test_matches_refit(self):
+        """Test each rolling window against a direct refit"""
+        ts = rolling_elasticities(self.X, self.y, self.periods, window=3,
+                                  feature_names=np.array(['L', 'M']))
+
+        for end in [2017, 2021, 2024]:
+            mask = (self.periods > end - 3) & (self.periods <= end)
+            elast = MultiplicativeModel().fit(self.X[mask], self.y[mask]).get_elasticities()
+            self.assertAlmostEqual(ts.loc[end, 'elasticity_L'], elast['elasticities'][0], places=8)
+            self.assertAlmostEqual(ts.loc[end, 'intercept'], elast['intercept'], places=8)
+            self.assertEqual(ts.loc[end, 'n'], mask.sum())
+
+    def test_expanding_window(self):
+        """Test that the last expanding window uses all rows"""
+        ts = rolling_elasticities(self.X, self.y, self.periods)
+
+        self.assertEqual(ts['n'].iloc[-1], self.n)
+        self.assertTrue(np.all(np.diff(ts['n'].values) > 0))
+
+    def test_drift_detected(self):
+        """Test that the L elasticity increases over time"""
+        ts = rolling_elasticities(self.X, self.y, self.periods, window=1,
+                                  feature_names=['L', 'M'])
+
+        self.assertAlmostEqual(ts.loc[2015, 'elasticity_L'], 0.5, delta=0.03)
+        self.assertAlmostEqual(ts.loc[2024, 'elasticity_L'], 0.95, delta=0.03)
+
+class TestRollingOLS(unittest.TestCase):
+    """Test streaming Cholesky updates and downdates"""
+
+    def test_update_downdate(self):
+        """Test that add/remove matches a fit on the remaining rows"""
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0.2, 1.0, (200, 2))
+        y = X[:, 0]**0.7 * X[:, 1] * np.exp(rng.normal(0, 0.05, 200))
+
+        ols = RollingOLS(n_features=2)
+        for i in range(200):
+            ols.add(X[i], y[i])
+        for i in range(80):
+            ols.remove(X[i], y[i])
+
+        elast = MultiplicativeModel().fit(X[80:], y[80:]).get_elasticities()
+        np.testing.assert_allclose(ols.get_elasticities()['elasticities'],
+                                   elast['elasticities'], rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
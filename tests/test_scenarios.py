@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for What-If Scenarios
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import AdditiveModel, MultiplicativeModel
+from utils.scenarios import ScenarioEngine
+
+class TestScenarioEngine(unittest.TestCase):
+    """Test ScenarioEngine class"""
+
+    def setUp(self):
+        """Set up a fitted multiplicative model"""
+        rng = np.random.default_rng(42)
+        self.n = 200
+        self.X = rng.uniform(0.2, 0.95, (self.n, 3))
+        self.y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4])
+                        + rng.normal(0, 0.05, self.n))
+        self.model = MultiplicativeModel().fit(self.X, self.y)
+        self.codes = np.array([f'C{i:03d}' for i in range(self.n)])
+        self.engine = ScenarioEngine(self.model, self.X, factor_names=np.array(['O', 'L', 'M']),
+                                     index=self.codes)
+
+    def test_matches_predict(self):
+        """Test precomputed predictions match the model"""
+        np.testing.assert_allclose(self.engine.predict(), self.model.predict(self.X))
+
+    def test_what_if(self):
+        """Test a what-if change on a subset of rows"""
+        mask = np.arange(self.n) < 20
+        frame = self.engine.what_if({'L': 0.10}, rows=mask)
+        X_new = self.X.copy()
+        X_new[mask, 1] *= 1.10
+
+        self.assertEqual(len(frame), 20)
+        self.assertListEqual(list(frame.index), list(self.codes[:20]))
+        np.testing.assert_allclose(frame['F_after'], self.model.predict(X_new)[mask])
+        # what_if leaves the state untouched
+        np.testing.assert_allclose(self.engine.predict(), self.model.predict(self.X))
+
+    def test_apply_and_reset(self):
+        """Test applying absolute levels by label, then resetting"""
+        frame = self.engine.apply({'O': 0.9, 'M': 0.9}, rows=['C005', 'C007'], relative=False)
+        X_new = self.X.copy()
+        X_new[[5, 7], 0] = 0.9
+        X_new[[5, 7], 2] = 0.9
+
+        np.testing.assert_allclose(self.engine.predict(), self.model.predict(X_new))
+        np.testing.assert_array_equal(frame['limiting_after'],
+                                      np.array(['O', 'L', 'M'])[np.argmin(X_new[[5, 7]], axis=1)])
+        self.engine.reset()
+        np.testing.assert_allclose(self.engine.predict(), self.model.predict(self.X))
+
+    def test_evaluate_batch(self):
+        """Test batched scenarios against one predict call per scenario"""
+        scenarios = np.array([[0.0, 0.1, 0.0], [0.05, 0.0, -0.1], [0.2, 0.2, 0.2]])
+        expected = np.array([self.model.predict(self.X * (1 + s)) for s in scenarios])
+
+        np.testing.assert_allclose(self.engine.evaluate(scenarios), expected, rtol=1e-8)
+        np.testing.assert_allclose(self.engine.evaluate(scenarios, aggregate='sum'),
+                                   expected.sum(axis=1), rtol=1e-8)
+
+        per_row = np.broadcast_to(scenarios[:, None, :], (3, self.n, 3))
+        np.testing.assert_allclose(self.engine.evaluate(per_row, aggregate='mean', batch_size=2),
+                                   expected.mean(axis=1), rtol=1e-8)
+
+    def test_censoring_bounds(self):
+        """Test batched aggregates respect censoring bounds"""
+        y = np.minimum(self.y, 0.9)
+        model = MultiplicativeModel(censoring=(None, 0.9)).fit(self.X, y)
+        engine = ScenarioEngine(model, self.X)
+        scenarios = np.array([[0.3, 0.3, 0.3]])
+        np.testing.assert_allclose(engine.evaluate(scenarios, aggregate='sum'),
+                                   [model.predict(self.X * 1.3).sum()], rtol=1e-8)
+
+    def test_validation(self):
+        """Test input validation"""
+        with self.assertRaises(ValueError):
+            ScenarioEngine(AdditiveModel().fit(self.X, self.y), self.X)
+        with self.assertRaises(ValueError):
+            ScenarioEngine(MultiplicativeModel(), self.X)
+        with self.assertRaises(ValueError):
+            self.engine.what_if({'Q': 0.1})
+        with self.assertRaises(ValueError):
+            self.engine.what_if({'L': -1.0})
+        with self.assertRaises(ValueError):
+            self.engine.what_if({'L': 0.1}, rows=['unknown'])
+        with self.assertRaises(ValueError):
+            self.engine.evaluate(np.zeros((2, 3)), aggregate='max')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Scoring Service
+Saviesa Framework
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import InteractionModel, MultiplicativeModel
+from utils.hierarchical import HierarchicalMultiplicativeModel
+from utils.serving import LatencyTracker, MicroBatcher, ScoringServer, load_test, request
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test LatencyTracker class"""
+
+    def test_percentiles(self):
+        """Test percentiles are reported in milliseconds"""
+        tracker = LatencyTracker(window=1000)
+        for ms in range(1, 101):
+            tracker.record(ms / 1000)
+        summary = tracker.summary()
+        self.assertEqual(summary['total'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['max_ms'], 100.0)
+
+    def test_empty(self):
+        """Test summary without samples"""
+        self.assertIsNone(LatencyTracker().summary()['p99_ms'])
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+    """Test MicroBatcher class"""
+
+    async def test_coalesces_requests(self):
+        """Test concurrent submits share one call and get their own rows back"""
+        calls = []
+
+        def fn(X):
+            calls.append(len(X))
+            return {'double': 2 * X[:, 0]}
+
+        batcher = MicroBatcher(fn, max_batch=100, max_delay=0.05).start()
+        results = await asyncio.gather(*[batcher.submit(np.full((2, 1), float(i)))
+                                         for i in range(10)])
+        await batcher.stop()
+
+        self.assertEqual(calls, [20])
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result['double'], [2.0 * i, 2.0 * i])
+
+    async def test_errors_propagate(self):
+        """Test a failing batch raises in every caller"""
+        def fn(X):
+            raise ValueError("bad batch")
+
+        batcher = MicroBatcher(fn, max_delay=0.01).start()
+        with self.assertRaises(ValueError):
+            await batcher.submit(np.zeros((1, 2)))
+        await batcher.stop()
+
+class TestScoringServer(unittest.IsolatedAsyncioTestCase):
+    """Test ScoringServer class"""
+
+    async def asyncSetUp(self):
+        rng = np.random.default_rng(42)
+        self.X = rng.uniform(0.2, 0.95, (100, 3))
+        y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4]))
+        self.model = MultiplicativeModel().fit(self.X, y)
+        self.server = ScoringServer(max_batch=64, max_delay=0.005)
+        self.server.add_model('m', self.model, np.array(['O', 'L', 'M']))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_predict(self):
+        """Test predictions and limiting factors over TCP"""
+        await self.server.start(port=0)
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        status, body = await request(reader, writer, 'POST', '/predict',
+                                     {'model': 'm', 'X': self.X[:5].tolist()})
+        writer.close()
+
+        self.assertEqual(status, 200)
+        np.testing.assert_allclose(body['prediction'], self.model.predict(self.X[:5]))
+        self.assertListEqual(body['limiting_factor'],
+                             list(np.array(['O', 'L', 'M'])[np.argmin(self.X[:5], axis=1)]))
+
+    async def test_errors(self):
+        """Test error statuses"""
+        await self.server.start(port=0)
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        cases = [('POST', '/predict', {'model': 'other', 'X': [[1, 1, 1]]}, 404),
+                 ('POST', '/predict', {'model': 'm', 'X': [[1, 1]]}, 400),
+                 ('POST', '/predict', [1, 2], 400),
+                 ('POST', '/predict', 3, 400),
+                 ('GET', '/predict', None, 405),
+                 ('GET', '/unknown', None, 404),
+                 ('GET', '/health', None, 200)]
+        for method, target, payload, expected in cases:
+            status, _ = await request(reader, writer, method, target, payload)
+            self.assertEqual(status, expected)
+        writer.close()
+
+    async def test_bad_framing(self):
+        """Test invalid Content-Length (400) and oversized bodies (413)"""
+        self.server.max_body = 1000
+        await self.server.start(port=0)
+        for length, expected in [('abc', 400), ('-1', 400), ('5000', 413)]:
+            reader, writer = await asyncio.open_connection(*self.server.address)
+            writer.write((f"POST /predict HTTP/1.1\r\nContent-Length: {length}\r\n\r\n"
+                          ).encode('latin-1'))
+            await writer.drain()
+            start = await reader.readline()
+            self.assertEqual(int(start.split()[1]), expected)
+            await reader.read()  # the server closes the connection
+            writer.close()
+
+    async def test_close_shuts_down_executor(self):
+        """Test that closing the server stops the batching worker threads"""
+        await self.server.start(port=0)
+        executor = self.server.batchers['m'].executor
+        await self.server.close()
+
+        self.assertIsNone(self.server.batchers['m'].executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+    async def test_load_test_unix_socket(self):
+        """Test the load-test harness batches concurrent requests"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'saviesa.sock')
+            await self.server.start(path=path)
+            result = await load_test(self.X, 'm', path=path, concurrency=16,
+                                     n_requests=200, seed=0)
+
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['latency']['count'], 200)
+        batches = self.server.stats()['batches']['m']
+        self.assertLess(batches['n_batches'], 200)
+        self.assertEqual(self.server.stats()['latency']['POST /predict']['total'], 200)
+
+    async def test_model_classes(self):
+        """Test serving models that do not wrap a LinearRegression"""
+        y = np.exp(0.1 + np.log(self.X) @ np.array([0.3, 0.2, 0.4]))
+        groups = np.repeat(['A', 'B'], 50)
+        self.server.add_model('i', InteractionModel().fit(self.X, y))
+        self.server.add_model('h', HierarchicalMultiplicativeModel(random_slopes=False)
+                              .fit(self.X, y, groups, groups))
+        self.assertEqual(self.server.models['i'][1], 3)
+        self.assertEqual(self.server.models['h'][1], 3)
+
+        await self.server.start(port=0)
+        reader, writer = await asyncio.open_connection(*self.server.address)
+        for name in ('i', 'h'):
+            status, body = await request(reader, writer, 'POST', '/predict',
+                                         {'model': name, 'X': self.X[:3].tolist()})
+            self.assertEqual(status, 200)
+            np.testing.assert_allclose(body['prediction'],
+                                       self.server.models[name][0].predict(self.X[:3]))
+        writer.close()
+
+        with self.assertRaises(ValueError):
+            self.server.add_model('x', object())
+
+    def test_unfitted_model(self):
+        """Test registering an unfitted model"""
+        with self.assertRaises(ValueError):
+            ScoringServer().add_model('x', MultiplicativeModel())
+
+if __name__ == '__main__':
+    unittest.main()
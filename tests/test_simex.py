@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for SIMEX Correction
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.simex import simex_elasticities
+from utils.models import MultiplicativeModel
+
+class TestSimex(unittest.TestCase):
+    """Test SIMEX measurement-error correction"""
+
+    def setUp(self):
+        """Set up multiplicative data whose first and third factors are noisy"""
+        rng = np.random.default_rng(42)
+        self.n = 2000
+        log_X = rng.normal(-0.5, 0.3, (self.n, 3))
+        self.y = np.exp(0.1 + log_X @ np.array([0.3, 0.2, 0.4]) + rng.normal(0, 0.1, self.n))
+        self.sd = np.array([0.15, 0.0, 0.1])
+        self.X = np.exp(log_X + rng.normal(size=(self.n, 3)) * self.sd)
+
+    def test_reduces_attenuation(self):
+        """Test that SIMEX moves attenuated elasticities toward the truth"""
+        result = simex_elasticities(self.X, self.y, self.sd, n_replicates=100, seed=0, n_jobs=1)
+        truth = np.array([0.3, 0.2, 0.4])
+        naive_error = np.abs(result['naive_elasticities'] - truth)
+        simex_error = np.abs(result['elasticities'] - truth)
+
+        self.assertLess(simex_error[0], naive_error[0] / 2)
+        self.assertLess(simex_error[2], naive_error[2] / 2)
+        self.assertTrue(np.all(result['std_errors'] > 0))
+        self.assertEqual(result['path'].shape, (5, 4))
+
+    def test_reproducible_across_workers(self):
+        """Test that results do not depend on the number of processes"""
+        serial = simex_elasticities(self.X, self.y, self.sd, n_replicates=20, seed=3, n_jobs=1,
+                                    max_elements=50_000)
+        parallel = simex_elasticities(self.X, self.y, self.sd, n_replicates=20, seed=3, n_jobs=2,
+                                      max_elements=50_000)
+        np.testing.assert_allclose(serial['elasticities'], parallel['elasticities'])
+
+    def test_invalid_options(self):
+        """Test validation of lambdas and extrapolation"""
+        with self.assertRaises(ValueError):
+            simex_elasticities(self.X, self.y, 0.1, lambdas=[0.0, 1.0])
+        with self.assertRaises(ValueError):
+            simex_elasticities(self.X, self.y, 0.1, extrapolation='rational')
+
+    def test_model_integration(self):
+        """Test corrected elasticities through MultiplicativeModel"""
+        model = MultiplicativeModel().fit(self.X, self.y)
+        naive = model.get_elasticities()['elasticities'].copy()
+        model.correct_measurement_error(self.X, self.y, self.sd, n_replicates=50, seed=0, n_jobs=1)
+        elast = model.get_elasticities()
+
+        np.testing.assert_allclose(elast['naive_elasticities'], naive)
+        self.assertGreater(elast['elasticities'][0], naive[0])
+
+        model.fit(self.X, self.y)
+        self.assertNotIn('naive_elasticities', model.get_elasticities())
+
+        with self.assertRaises(ValueError):
+            MultiplicativeModel(robust='huber').fit(self.X, self.y).correct_measurement_error(
+                self.X, self.y, self.sd)
+
+if __name__ == '__main__':
+    unittest.main()
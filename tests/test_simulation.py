@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Simulation Module
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import AdditiveModel, InteractionModel, MultiplicativeModel
+from utils.simulation import (
+    simulate_replicates,
+    fit_ols_batched,
+    evaluate_replicates,
+    power_study
+)
+
+class TestBatchedFits(unittest.TestCase):
+    """Test batched fits against the sklearn-based models"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.X, self.y = simulate_replicates(80, 4, noise=0.05, seed=0)
+
+    def test_shapes(self):
+        """Test replicate array shapes"""
+        self.assertEqual(self.X.shape, (4, 80, 3))
+        self.assertEqual(self.y.shape, (4, 80))
+        self.assertGreaterEqual(self.y.min(), 0.1)
+
+    def test_matches_additive_model(self):
+        """Test batched OLS against AdditiveModel"""
+        intercept, coef = fit_ols_batched(self.X, self.y)
+        for r in range(4):
+            coefs = AdditiveModel().fit(self.X[r], self.y[r]).get_coefficients()
+            np.testing.assert_allclose(coef[r], coefs['coefficients'], rtol=1e-8)
+            self.assertAlmostEqual(intercept[r], coefs['intercept'], places=8)
+
+    def test_matches_model_scores(self):
+        """Test per-replicate R² against the model classes"""
+        res = evaluate_replicates(self.X, self.y)
+        for r in range(4):
+            X, y = self.X[r], self.y[r]
+            self.assertAlmostEqual(res['r2_add'][r], AdditiveModel().fit(X, y).score(X, y))
+            self.assertAlmostEqual(res['r2_int'][r], InteractionModel().fit(X, y).score(X, y))
+            self.assertAlmostEqual(res['r2_mult'][r], MultiplicativeModel().fit(X, y).score(X, y))
+
+class TestPowerStudy(unittest.TestCase):
+    """Test power study tabulation"""
+
+    def test_grid(self):
+        """Test one row per grid cell"""
+        table = power_study([50, 200], [0.01, 0.1], n_replicates=30,
+                            max_elements=1000)
+
+        self.assertEqual(len(table), 4)
+        self.assertTrue(((table['win_rate_mult_vs_add'] >= 0) &
+                         (table['win_rate_mult_vs_add'] <= 1)).all())
+
+    def test_reproducible(self):
+        """Test that a seed gives identical tables"""
+        t1 = power_study([60], [0.05], n_replicates=20, seed=1)
+        t2 = power_study([60], [0.05], n_replicates=20, seed=1)
+
+        np.testing.assert_array_equal(t1.values, t2.values)
+
+if __name__ == '__main__':
+    unittest.main()
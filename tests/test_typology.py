@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Constraint Typologies
+Saviesa Framework
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+import pathlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from utils.models import identify_limiting_factor
+from utils.typology import ConstraintTypology, constraint_profile, iter_chunks
+
+class TestConstraintProfile(unittest.TestCase):
+    """Test constraint_profile function"""
+
+    def test_gaps(self):
+        """Test levels followed by gaps to the limiting factor"""
+        profile = constraint_profile(np.array([[0.8, 0.5, 0.9]]))
+        np.testing.assert_allclose(profile, [[0.8, 0.5, 0.9, 0.3, 0.0, 0.4]])
+
+    def test_shares(self):
+        """Test shares sum to one"""
+        profile = constraint_profile(np.array([[0.2, 0.2, 0.6]]), gaps=False, shares=True)
+        np.testing.assert_allclose(profile, [[0.2, 0.2, 0.6]])
+
+class TestConstraintTypology(unittest.TestCase):
+    """Test ConstraintTypology class"""
+
+    def setUp(self):
+        """Set up rows drawn around four constraint profiles"""
+        rng = np.random.default_rng(42)
+        self.centers = np.array([[0.3, 0.8, 0.8], [0.8, 0.3, 0.8],
+                                 [0.8, 0.8, 0.3], [0.6, 0.6, 0.6]])
+        self.truth = rng.integers(0, 4, 20000)
+        self.X = np.clip(self.centers[self.truth] + rng.normal(0, 0.03, (20000, 3)), 0.01, 1)
+        self.typology = ConstraintTypology(n_clusters=4, factor_names=['O', 'L', 'M'],
+                                           batch_size=1024)
+
+    def test_recovers_profiles(self):
+        """Test clusters match the generating profiles"""
+        self.typology.fit(self.X, chunksize=5000)
+        labels, _ = self.typology.assign(self.X)
+        table = pd.crosstab(labels, self.truth).values
+        self.assertGreater(table.max(axis=0).sum() / len(self.X), 0.99)
+        centroids = self.typology.centroids()
+        self.assertEqual(list(centroids.columns), ['O', 'L', 'M', 'gap_O', 'gap_L', 'gap_M'])
+
+    def test_summary(self):
+        """Test per-cluster sizes and limiting-factor distributions"""
+        self.typology.fit(self.X)
+        labels, summary = self.typology.assign(self.X, chunksize=3000)
+        np.testing.assert_array_equal(summary['n'], np.bincount(labels, minlength=4))
+        limiting = identify_limiting_factor(self.X, ['O', 'L', 'M'])
+        for cluster in range(4):
+            share = 100 * np.mean(limiting[labels == cluster] == 'L')
+            self.assertAlmostEqual(summary.loc[cluster, 'pct_limiting_L'], share)
+        mean_O = summary['mean_O'].values
+        np.testing.assert_allclose(mean_O, [self.X[labels == c, 0].mean() for c in range(4)])
+
+    def test_predict_matches_brute_force(self):
+        """Test fast assignment against explicit distances"""
+        self.typology.fit(self.X)
+        profile = constraint_profile(self.X)
+        d2 = np.sum((profile[:, None] - self.typology.cluster_centers_[None])**2, axis=2)
+        np.testing.assert_array_equal(self.typology.predict(self.X, block_size=777),
+                                      np.argmin(d2, axis=1))
+
+    def test_sources(self):
+        """Test CSV and .npy sources give the same labels as the array"""
+        self.typology.fit(self.X)
+        expected = self.typology.predict(self.X)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'factors.csv')
+            npy_path = os.path.join(tmp, 'factors.npy')
+            pd.DataFrame(self.X, columns=['O', 'L', 'M']).assign(dep='11').to_csv(
+                csv_path, index=False)
+            np.save(npy_path, self.X)
+            chunks = list(iter_chunks(csv_path, columns=['O', 'L', 'M'], chunksize=6000))
+            self.assertEqual([len(c) for c in chunks], [6000, 6000, 6000, 2000])
+            labels, _ = self.typology.assign(csv_path, columns=['O', 'L', 'M'], chunksize=6000)
+            np.testing.assert_array_equal(labels, expected)
+            labels, _ = self.typology.assign(npy_path, chunksize=6000)
+            np.testing.assert_array_equal(labels, expected)
+            labels, _ = self.typology.assign(pathlib.Path(csv_path), columns=['O', 'L', 'M'],
+                                             chunksize=6000)
+            np.testing.assert_array_equal(labels, expected)
+            labels, _ = self.typology.assign(pathlib.Path(npy_path), chunksize=6000)
+            np.testing.assert_array_equal(labels, expected)
+
+    def test_invalid(self):
+        """Test validation errors"""
+        with self.assertRaises(ValueError):
+            self.typology.predict(self.X)
+        with self.assertRaises(ValueError):
+            ConstraintTypology(n_clusters=0)
+        with self.assertRaises(ValueError):
+            list(iter_chunks('factors.csv'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Visualization Module
+Saviesa Framework
+"""
+
+import unittest
+from unittest import mock
+import subprocess
+import tempfile
+import numpy as np
+import sys
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import matplotlib.pyplot as plt
+from utils import visualization
+from utils.visualization import render_figures, figure_hash, plot_scatter, plot_residuals
+
+class TestRenderFigures(unittest.TestCase):
+    """Test batch figure rendering"""
+
+    def setUp(self):
+        """Set up test data"""
+        np.random.seed(42)
+        self.tmp = tempfile.TemporaryDirectory()
+        y = np.random.rand(200)
+        self.specs = [
+            {'plot': 'scatter', 'y_true': y, 'y_pred': y + 0.05,
+             'save_path': os.path.join(self.tmp.name, 'scatter.png')},
+            {'plot': 'residuals', 'y_true': y, 'y_pred': y + 0.05, 'mode': 'density',
+             'save_path': os.path.join(self.tmp.name, 'residuals.png')}
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_render_then_skip(self):
+        """Test that unchanged figures are skipped on the second run"""
+        first = render_figures(self.specs, n_jobs=1)
+        second = render_figures(self.specs, n_jobs=1)
+
+        self.assertEqual([r['status'] for r in first], ['rendered', 'rendered'])
+        self.assertEqual([r['status'] for r in second], ['skipped', 'skipped'])
+        self.assertTrue(os.path.exists(self.specs[0]['save_path']))
+
+    def test_changed_inputs_rerender(self):
+        """Test that a changed input invalidates the figure"""
+        render_figures(self.specs, n_jobs=1)
+        self.specs[0]['title'] = 'New title'
+        results = render_figures(self.specs, n_jobs=1)
+
+        self.assertEqual([r['status'] for r in results], ['rendered', 'skipped'])
+
+    def test_hash_ignores_save_path(self):
+        """Test that the inputs hash depends on data, not output path"""
+        other = dict(self.specs[0], save_path='elsewhere.png')
+        self.assertEqual(figure_hash(self.specs[0]), figure_hash(other))
+
+    def test_hash_stable_across_processes(self):
+        """Test that object-dtype labels hash by value, not by pointer"""
+        script = (
+            "import sys, numpy as np, pandas as pd; sys.path.insert(0, sys.argv[1]); "
+            "from utils.visualization import figure_hash; "
+            "counts = pd.Series(['O', 'L', 'M', 'L']).value_counts(); "
+            "print(figure_hash({'plot': 'distribution', 'data': counts.values, "
+            "'labels': counts.index.to_numpy(dtype=object)}))"
+        )
+        scripts_dir = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+        digests = [subprocess.run([sys.executable, '-c', script, scripts_dir], check=True,
+                                  capture_output=True, text=True).stdout.strip()
+                   for _ in range(2)]
+        self.assertEqual(digests[0], digests[1])
+        self.assertEqual(len(digests[0]), 32)
+
+    def test_serial_uses_agg(self):
+        """Test in-process rendering uses Agg and restores the caller's backend"""
+        backends = []
+
+        def render(spec, digest):
+            backends.append(plt.get_backend().lower())
+            return {'save_path': spec['save_path'], 'status': 'rendered', 'error': None}
+
+        plt.switch_backend('svg')
+        try:
+            with mock.patch.object(visualization, '_render_one', side_effect=render):
+                render_figures(self.specs, n_jobs=1)
+            self.assertEqual(backends, ['agg', 'agg'])
+            self.assertEqual(plt.get_backend().lower(), 'svg')
+        finally:
+            plt.switch_backend('Agg')
+
+    def test_unknown_plot(self):
+        """Test unknown plot type"""
+        with self.assertRaises(ValueError):
+            render_figures([{'plot': 'pie', 'save_path': 'x.png'}])
+
+class TestDensityMode(unittest.TestCase):
+    """Test the binned density rendering of large scatter plots"""
+
+    def setUp(self):
+        """Set up a dense cloud with a few far outliers"""
+        rng = np.random.default_rng(0)
+        self.x = np.concatenate([rng.normal(0, 1, 20000), [8.0, -8.0, 9.0]])
+        self.y = np.concatenate([rng.normal(0, 1, 20000), [8.0, 8.0, -9.0]])
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_auto_switch(self):
+        """Test density above DENSITY_THRESHOLD, scatter below or when forced"""
+        n = visualization.DENSITY_THRESHOLD + 1
+        y = np.linspace(0, 1, n)
+        for plot in (plot_scatter, plot_residuals):
+            with mock.patch.object(visualization, '_plot_density') as density:
+                plot(y, y, show=False)
+                plot(y, y, show=False, mode='scatter')
+                plot(y[:100], y[:100], show=False)
+                plot(y[:100], y[:100], show=False, mode='density')
+            self.assertEqual(density.call_count, 2)
+        with self.assertRaises(ValueError):
+            plot_scatter(y[:100], y[:100], show=False, mode='hexbin')
+
+    def test_sparse_overlay(self):
+        """Test that outliers are overlaid and the overlay is capped"""
+        fig, ax = plt.subplots()
+        visualization._plot_density(ax, self.x, self.y, bins=50, overlay_size=2000)
+        points = ax.collections[-1].get_offsets()
+        for outlier in [(8.0, 8.0), (-8.0, 8.0), (9.0, -9.0)]:
+            self.assertTrue(np.any(np.all(points == outlier, axis=1)))
+        self.assertLess(len(points), 2000)
+
+        fig, ax = plt.subplots()
+        visualization._plot_density(ax, self.x, self.y, bins=50, overlay_size=2)
+        self.assertEqual(len(ax.collections[-1].get_offsets()), 2)
+
+        fig, ax = plt.subplots()
+        visualization._plot_density(ax, self.x, self.y, bins=50, overlay_size=0)
+        self.assertEqual(len(ax.collections), 0)
+
+    def test_bins_forms(self):
+        """Test bin counts per axis and explicit bin edges"""
+        edges = np.linspace(-10, 10, 41)
+        for bins in (50, [30, 40], edges, [edges, edges[::2]]):
+            fig, ax = plt.subplots()
+            im = visualization._plot_density(ax, self.x, self.y, bins=bins)
+            self.assertEqual(im.get_array().ndim, 2)
+            self.assertGreater(len(ax.collections[-1].get_offsets()), 0)
+
+if __name__ == '__main__':
+    unittest.main()